@@ -0,0 +1,117 @@
+"""
+Benchmark: micro batching for LLM-style operations.
+
+Runs a fixed number of concurrent clients against an LLM stub with a
+simulated per call and per token cost and a backend that serves a
+limited number of calls at a time, once without batching and then
+with several (max_batch_size, max_wait_ms) settings. Every request goes
+through the orchestrator and the KL Kernel.
+
+Usage (from the project root):
+
+    python benchmarks/bench_llm_batching.py
+    python benchmarks/bench_llm_batching.py --clients 32 --requests 50
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from kl_kernel_logic import ExecutionPolicy
+
+from kl_exec_poc import OperationRegistry, OperationMetadata, Orchestrator
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.adapters.batching import MicroBatcher, make_batched_task
+from kl_exec_poc.adapters.llm_stub import LLMStub, LLMStubConfig
+
+PROMPT = "Summarise THIS short Prompt for the benchmark run"
+
+
+def _build_orchestrator(task: Callable[..., Any]) -> Orchestrator:
+    registry = OperationRegistry()
+    registry.register(
+        "text.llm_stub",
+        OperationMetadata(psi=KLBridge.build_transform_psi("bench.llm_stub"), task=task),
+    )
+    return Orchestrator(registry=registry)
+
+
+def _run(orchestrator: Orchestrator, clients: int, requests: int) -> Dict[str, float]:
+    policy = ExecutionPolicy(allow_network=False, allow_filesystem=False, timeout_seconds=5)
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def client(idx: int) -> None:
+        local: List[float] = []
+        for n in range(requests):
+            start = time.perf_counter()
+            orchestrator.execute_operation(
+                key="text.llm_stub",
+                user_id=f"bench-{idx}",
+                request_id=f"bench-{idx}-{n}",
+                policy=policy,
+                prompt=PROMPT,
+            )
+            local.append((time.perf_counter() - start) * 1000.0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--call-latency-ms", type=float, default=2.0)
+    parser.add_argument("--token-latency-ms", type=float, default=0.02)
+    parser.add_argument("--backend-concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    stub = LLMStub(
+        LLMStubConfig(
+            mode="lower",
+            call_latency_ms=args.call_latency_ms,
+            token_latency_ms=args.token_latency_ms,
+            max_concurrency=args.backend_concurrency,
+        )
+    )
+
+    def single(prompt: str) -> str:
+        return stub.generate(prompt=prompt)["output"]
+
+    def batch(prompts: List[str]) -> List[str]:
+        return [item["output"] for item in stub.generate_batch(prompts=prompts)]
+
+    settings: List[Tuple[str, Callable[..., Any]]] = [("unbatched", single)]
+    for size, wait_ms in ((4, 1.0), (8, 2.0), (16, 2.0), (16, 5.0)):
+        batcher = MicroBatcher(batch, max_batch_size=size, max_wait_ms=wait_ms)
+        settings.append((f"batch={size:<2} wait={wait_ms}ms", make_batched_task(batcher, "prompt")))
+
+    print(f"clients={args.clients} requests/client={args.requests}")
+    print(f"{'setting':<24}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, task in settings:
+        stats = _run(_build_orchestrator(task), args.clients, args.requests)
+        print(
+            f"{label:<24}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: bulk text simplification versus one execution per document.
+
+Compares documents per second for:
+- looping over the `text.simplify` operation (one Kernel call per document)
+- one `text.simplify_bulk` execution over all documents
+- a streaming `text.simplify_bulk` execution emitting chunks
+
+Usage (from the project root):
+
+    python benchmarks/bench_text_bulk.py
+    python benchmarks/bench_text_bulk.py --docs 500000 --chunk-size 5000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from kl_kernel_logic import ExecutionPolicy
+from kl_kernel_logic.examples.text_simplify import simplify_text
+
+from kl_exec_poc import OperationRegistry, OperationMetadata, Orchestrator
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.ops.text import simplify_bulk, simplify_bulk_chunks
+
+WORDS = ["Alpha", "beta", "GAMMA", "delta", "Epsilon", "zeta", "ETA", "theta"]
+
+
+def _corpus(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        "  " + "  \t".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))) + " \n"
+        for _ in range(count)
+    ]
+
+
+def _timed(label: str, count: int, fn: Callable[[], List[str]]) -> List[str]:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{count / elapsed:>14,.0f} docs/s{elapsed:>10.3f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    docs = _corpus(args.docs)
+    registry = OperationRegistry()
+    registry.register(
+        "text.simplify",
+        OperationMetadata(psi=KLBridge.build_transform_psi("bench.text"), task=simplify_text),
+    )
+    registry.register(
+        "text.simplify_bulk",
+        OperationMetadata(
+            psi=KLBridge.build_transform_psi("bench.text.bulk"),
+            task=simplify_bulk,
+            stream_task=simplify_bulk_chunks,
+        ),
+    )
+    orchestrator = Orchestrator(registry=registry)
+    policy = ExecutionPolicy(allow_network=False, allow_filesystem=False, timeout_seconds=None)
+
+    def per_document() -> List[str]:
+        return [
+            orchestrator.execute_operation(
+                key="text.simplify",
+                user_id="bench",
+                request_id=f"doc-{i}",
+                policy=policy,
+                text=doc,
+            )["execution"]["result"]
+            for i, doc in enumerate(docs)
+        ]
+
+    def bulk() -> List[str]:
+        return orchestrator.execute_operation(
+            key="text.simplify_bulk",
+            user_id="bench",
+            request_id="bulk",
+            policy=policy,
+            documents=docs,
+        )["execution"]["result"]
+
+    def streamed() -> List[str]:
+        stream = orchestrator.execute_operation_stream(
+            key="text.simplify_bulk",
+            user_id="bench",
+            request_id="bulk-stream",
+            policy=policy,
+            documents=docs,
+            chunk_size=args.chunk_size,
+        )
+        for _ in stream:
+            pass
+        return stream.bundle["execution"]["result"]
+
+    print(f"documents={args.docs:,} chunk_size={args.chunk_size:,}")
+    baseline = _timed("per document text.simplify", args.docs, per_document)
+    assert _timed("bulk (single execution)", args.docs, bulk) == baseline
+    assert _timed("bulk (streamed chunks)", args.docs, streamed) == baseline
+
+
+if __name__ == "__main__":
+    main()
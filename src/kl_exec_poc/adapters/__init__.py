@@ -3,13 +3,21 @@ Adapters that connect the PoC orchestrator to external systems.
 
 Currently this includes:
 - a bridge into the KL Kernel Logic foundations
+- a no-op stand-in for that bridge, for load tests
 - a simple LLM stub for controlled experiments
+- a pool of reusable adapter clients and a micro batcher
 """
 
 from .kl_bridge import KLBridge
+from .null_bridge import NullBridge
 from .llm_stub import LLMStub
+from .client_pool import ClientPool
+from .batching import MicroBatcher
 
 __all__ = [
     "KLBridge",
+    "NullBridge",
     "LLMStub",
+    "ClientPool",
+    "MicroBatcher",
 ]
@@ -0,0 +1,180 @@
+"""
+Micro batching for batch capable operations.
+
+Concurrent callers submit single items. A background thread collects
+them for up to `max_batch_size` items or `max_wait_ms` milliseconds,
+issues one batched call and hands each caller its own result.
+
+From the KL perspective nothing changes: every request still runs
+through the Kernel with its own context. Only the call into the
+backend is shared.
+
+`close` stops the background thread after the queued items have been
+served. Registries built from config close their batchers in
+`OperationRegistry.close`.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Sequence, Tuple
+
+
+# Queue marker that tells the worker thread to exit.
+_STOP = object()
+
+
+class _Pending:
+    """
+    Slot for the result of a single submitted item.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class MicroBatcher:
+    """
+    Collects single item calls into batched calls.
+
+    `batch_fn` receives a list of items and must return a sequence of
+    results in the same order. The worker thread starts on the first
+    submit and runs until `close`.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Any:
+        """
+        Submit a single item and block until its result is available.
+        """
+        pending = _Pending()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Micro batcher is closed")
+            self._ensure_worker()
+            self._queue.put((item, pending))
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Serve the queued items, then stop the worker thread.
+
+        Later calls to `submit` raise RuntimeError.
+        """
+        with self._lock:
+            if self._closed:
+                worker = None
+            else:
+                self._closed = True
+                worker = self._worker
+                if worker is not None:
+                    self._queue.put(_STOP)
+        if worker is not None:
+            worker.join(timeout)
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _ensure_worker(self) -> None:
+        # Called with the lock held.
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run,
+                name="kl-micro-batcher",
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _collect(self) -> Tuple[List[Tuple[Any, _Pending]], bool]:
+        """
+        Block for the first item, then gather more until the batch is
+        full or the latency window has passed.
+
+        Returns the batch and whether the stop marker was reached.
+        """
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = list(self.batch_fn(items))
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"Batch function returned {len(results)} results for {len(items)} items"
+                    )
+            except BaseException as exc:  # noqa: BLE001 - forwarded to callers
+                for _, pending in batch:
+                    pending.error = exc
+                    pending.done.set()
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, pending), result in zip(batch, results):
+                pending.result = result
+                pending.done.set()
+
+
+def make_batched_task(batcher: MicroBatcher, param: str) -> Callable[..., Any]:
+    """
+    Build a single item KL task that routes its `param` argument
+    through the micro batcher.
+    """
+
+    def batched_task(**kwargs: Any) -> Any:
+        if set(kwargs) != {param}:
+            raise TypeError(f"Batched task expects exactly one argument: {param}")
+        return batcher.submit(kwargs[param])
+
+    batched_task.__name__ = f"batched_{param}"
+    return batched_task
@@ -0,0 +1,175 @@
+"""
+Pool of reusable adapter clients.
+
+Expensive clients (model backends, connections) should be created once
+per configuration and shared across requests and threads. The pool keys
+instances by their (hashable) config, warms them up on creation and
+drops instances that have been idle for too long.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, Optional, TypeVar
+
+C = TypeVar("C", bound=Hashable)
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry(Generic[T]):
+    client: T
+    last_used: float
+    in_use: int = 0
+
+
+class ClientPool(Generic[C, T]):
+    """
+    Thread safe pool with one shared client instance per config.
+
+    - `factory(config)` creates a client
+    - clients with a `warmup()` method are warmed up right after creation
+    - clients idle for longer than `idle_timeout_seconds` are evicted
+      (clients that are currently leased are never evicted)
+
+    Creation and warm-up run outside the pool lock: other configs stay
+    available while a client is created, and concurrent requests for the
+    same config wait for the one creation in progress. If creation
+    fails, the error is raised to that caller and waiters try again.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[C], T],
+        idle_timeout_seconds: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.factory = factory
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[C, _Entry[T]] = {}
+        self._creating: Dict[C, threading.Event] = {}
+        self._last_sweep = clock()
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def warmup(self, config: C) -> T:
+        """
+        Create (and warm up) the client for `config` ahead of traffic.
+        """
+        return self._get_or_create(config, lease=False).client
+
+    @contextmanager
+    def lease(self, config: C) -> Iterator[T]:
+        """
+        Borrow the shared client for `config` for the duration of a call.
+        """
+        entry = self._get_or_create(config, lease=True)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = self._clock()
+
+    def evict_idle(self) -> int:
+        """
+        Drop clients that are not leased and have been idle for longer
+        than the idle timeout. Returns the number of evicted clients.
+        """
+        with self._lock:
+            return self._evict_idle()
+
+    def clear(self) -> None:
+        """
+        Drop all pooled clients.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _get_or_create(self, config: C, lease: bool) -> _Entry[T]:
+        """
+        Return the entry for `config`, creating the client if needed.
+
+        With `lease`, the entry is marked in use under the same lock
+        acquisition that found or inserted it, so it cannot be evicted
+        in between.
+        """
+        while True:
+            with self._lock:
+                if lease:
+                    self._maybe_sweep()
+                entry = self._entries.get(config)
+                if entry is not None:
+                    if lease:
+                        entry.in_use += 1
+                    return entry
+                pending = self._creating.get(config)
+                creator = pending is None
+                if pending is None:
+                    pending = self._creating[config] = threading.Event()
+            if not creator:
+                pending.wait()
+                continue
+
+            try:
+                client = self.factory(config)
+                warmup = getattr(client, "warmup", None)
+                if callable(warmup):
+                    warmup()
+            except BaseException:
+                with self._lock:
+                    del self._creating[config]
+                pending.set()
+                raise
+
+            with self._lock:
+                entry = _Entry(client=client, last_used=self._clock(), in_use=1 if lease else 0)
+                self._entries[config] = entry
+                self.created += 1
+                del self._creating[config]
+            pending.set()
+            return entry
+
+    def _maybe_sweep(self) -> None:
+        if self.idle_timeout_seconds is None:
+            return
+        now = self._clock()
+        if now - self._last_sweep >= self.idle_timeout_seconds:
+            self._last_sweep = now
+            self._evict_idle()
+
+    def _evict_idle(self) -> int:
+        if self.idle_timeout_seconds is None:
+            return 0
+        now = self._clock()
+        idle = [
+            config
+            for config, entry in self._entries.items()
+            if entry.in_use == 0 and now - entry.last_used > self.idle_timeout_seconds
+        ]
+        for config in idle:
+            del self._entries[config]
+        self.evicted += len(idle)
+        return len(idle)
+
+
+@dataclass
+class AdapterTasks:
+    """
+    KL tasks bound to a pooled adapter client.
+
+    `batch_task` and `stream_task` are optional capabilities. `batch_param`
+    names the task argument that is collected when batching.
+    """
+
+    task: Callable[..., Any]
+    batch_task: Optional[Callable[..., Any]] = None
+    batch_param: Optional[str] = None
+    stream_task: Optional[Callable[..., Iterator[Any]]] = None
@@ -13,10 +13,10 @@ from kl_kernel_logic import (
     PsiDefinition,
     ExecutionContext,
     ExecutionPolicy,
-    OperationType,
-    EffectClass,
 )
 
+from ..interning import intern_policy, intern_psi
+
 
 class KLBridge:
     """
@@ -51,8 +51,10 @@ class KLBridge:
     ) -> ExecutionPolicy:
         """
         Build a simple ExecutionPolicy with the most relevant flags.
+
+        Equal settings return the same interned, immutable policy.
         """
-        return ExecutionPolicy(
+        return intern_policy(
             allow_network=allow_network,
             allow_filesystem=allow_filesystem,
             timeout_seconds=timeout_seconds,
@@ -83,10 +85,6 @@ class KLBridge:
 
         This uses NON_STATE_CHANGING as a default effect class, which
         matches most read only or pure transformation operations.
+        Equal definitions return the same interned, immutable Psi.
         """
-        return PsiDefinition(
-            operation_type=OperationType.TRANSFORM,
-            logical_binding=logical_binding,
-            effect_class=EffectClass.NON_STATE_CHANGING,
-            constraints=constraints,
-        )
+        return intern_psi(logical_binding=logical_binding, constraints=constraints)
@@ -6,20 +6,50 @@ simulates an external text generation system so that the PoC can exercise
 LLM style operations without depending on a real model.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Any
+import re
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Iterator, List, Mapping
 
+from .client_pool import AdapterTasks, ClientPool
 
-@dataclass
+
+# A token is a run of non whitespace plus the whitespace that follows it.
+# Leading whitespace is attached to the first token, so joining all chunks
+# reproduces the full output exactly.
+_TOKEN_RE = re.compile(r"\s*\S+\s*")
+
+
+LLM_STUB_MODES = ("lower", "upper", "echo")
+
+
+@dataclass(frozen=True)
 class LLMStubConfig:
     """
     Configuration for the LLM stub.
 
     The mode flag gives a simple way to change the behaviour
     without touching the call sites.
+
+    The latency fields simulate the cost profile of a real backend:
+    a fixed overhead per call plus a cost per prompt token. Batched
+    calls pay the per call overhead once. `max_concurrency` limits how
+    many simulated calls the backend serves at the same time
+    (0 means unlimited).
+
+    Streaming emits `stream_chunk_tokens` tokens per chunk and waits
+    `stream_delay_ms` between chunks.
+
+    The config is frozen so that it can key pooled client instances.
     """
 
     mode: str = "lower"  # possible values: "lower", "upper", "echo"
+    call_latency_ms: float = 0.0
+    token_latency_ms: float = 0.0
+    max_concurrency: int = 0
+    stream_chunk_tokens: int = 1
+    stream_delay_ms: float = 0.0
 
 
 class LLMStub:
@@ -32,28 +62,94 @@ class LLMStub:
 
     def __init__(self, config: LLMStubConfig | None = None) -> None:
         self.config = config or LLMStubConfig()
+        self._slots: threading.BoundedSemaphore | None = None
+        if self.config.max_concurrency > 0:
+            self._slots = threading.BoundedSemaphore(self.config.max_concurrency)
 
     def generate(self, prompt: str, **kwargs: Any) -> Dict[str, str]:
         """
         Apply a trivial transformation based on the configured mode.
         """
-        if self.config.mode == "upper":
-            text = prompt.upper()
-        elif self.config.mode == "echo":
-            text = prompt
-        else:
-            text = prompt.lower()
-
+        self._simulate_cost([prompt])
         return {
             "prompt": prompt,
-            "output": text,
+            "output": self._transform(prompt),
         }
 
+    def generate_batch(self, prompts: List[str], **kwargs: Any) -> List[Dict[str, str]]:
+        """
+        Apply the transformation to several prompts in a single call.
+
+        Results are returned in the same order as the prompts.
+        """
+        self._simulate_cost(prompts)
+        return [
+            {
+                "prompt": prompt,
+                "output": self._transform(prompt),
+            }
+            for prompt in prompts
+        ]
+
+    def generate_stream(self, prompt: str, **kwargs: Any) -> Iterator[str]:
+        """
+        Yield the output in chunks of whole tokens.
+
+        The first chunk is available after the per call overhead, later
+        chunks follow after `stream_delay_ms`. Joining all chunks gives
+        the same text as `generate`.
+        """
+        self._simulate_cost([prompt])
+        text = self._transform(prompt)
+
+        tokens = _TOKEN_RE.findall(text) or ([text] if text else [])
+        size = max(1, self.config.stream_chunk_tokens)
+        delay = self.config.stream_delay_ms / 1000.0
+
+        for start in range(0, len(tokens), size):
+            if start and delay > 0:
+                time.sleep(delay)
+            yield "".join(tokens[start:start + size])
+
+    def warmup(self) -> None:
+        """
+        Exercise the transformation path once before serving traffic.
+
+        The simulated call cost is skipped, warmup only pays the
+        first call overhead of the local code path.
+        """
+        self._transform("warmup")
+        _TOKEN_RE.findall("warmup")
+
+    def _transform(self, prompt: str) -> str:
+        if self.config.mode == "upper":
+            return prompt.upper()
+        if self.config.mode == "echo":
+            return prompt
+        return prompt.lower()
+
+    def _simulate_cost(self, prompts: List[str]) -> None:
+        """
+        Sleep for one call overhead plus the token cost of all prompts.
+        """
+        cfg = self.config
+        if cfg.call_latency_ms <= 0 and cfg.token_latency_ms <= 0:
+            return
+        tokens = sum(len(prompt.split()) for prompt in prompts)
+        delay_ms = cfg.call_latency_ms + cfg.token_latency_ms * tokens
+        if self._slots is None:
+            time.sleep(delay_ms / 1000.0)
+            return
+        with self._slots:
+            time.sleep(delay_ms / 1000.0)
+
+
+# Module level pool and helpers for KL tasks
 
-# Module level instance and helper for KL tasks
 
+LLM_STUB_POOL: ClientPool[LLMStubConfig, LLMStub] = ClientPool(factory=LLMStub)
 
-_default_stub = LLMStub()
+_DEFAULT_CONFIG = LLMStubConfig()
 
 
 def llm_stub_generate(prompt: str) -> str:
@@ -63,5 +159,81 @@ def llm_stub_generate(prompt: str) -> str:
     Returns only the generated text, so that from the KL perspective
     this behaves like a simple text transform operation.
     """
-    result = _default_stub.generate(prompt=prompt)
+    with LLM_STUB_POOL.lease(_DEFAULT_CONFIG) as stub:
+        result = stub.generate(prompt=prompt)
     return result["output"]
+
+
+def llm_stub_generate_batch(prompts: List[str]) -> List[str]:
+    """
+    Batched counterpart of `llm_stub_generate`.
+
+    Used by the micro batcher to serve several queued requests at once.
+    """
+    with LLM_STUB_POOL.lease(_DEFAULT_CONFIG) as stub:
+        results = stub.generate_batch(prompts=prompts)
+    return [item["output"] for item in results]
+
+
+def llm_stub_generate_stream(prompt: str) -> Iterator[str]:
+    """
+    Streaming counterpart of `llm_stub_generate`.
+
+    Yields partial output chunks, joining them gives the full result.
+    """
+    with LLM_STUB_POOL.lease(_DEFAULT_CONFIG) as stub:
+        yield from stub.generate_stream(prompt=prompt)
+
+
+def parse_llm_stub_config(raw: Mapping[str, Any]) -> LLMStubConfig:
+    """
+    Build an LLMStubConfig from the "adapter" block of an operation.
+    """
+    known = {f.name for f in fields(LLMStubConfig)}
+    unknown = set(raw) - known
+    if unknown:
+        raise ValueError(f"Unknown llm_stub adapter settings: {sorted(unknown)}")
+
+    config = LLMStubConfig(**dict(raw))
+    if config.mode not in LLM_STUB_MODES:
+        raise ValueError(f"Unknown llm_stub mode: {config.mode}")
+    if config.max_concurrency < 0:
+        raise ValueError("llm_stub max_concurrency must not be negative")
+    return config
+
+
+def build_llm_stub_tasks(
+    raw: Mapping[str, Any],
+    pool: ClientPool[LLMStubConfig, LLMStub] | None = None,
+) -> AdapterTasks:
+    """
+    Build KL tasks bound to the pooled stub for one adapter config.
+
+    Operations that declare the same settings share one client instance.
+    The client is created and warmed up here, so that it is ready before
+    the first request arrives.
+    """
+    config = parse_llm_stub_config(raw)
+    if pool is None:
+        pool = LLM_STUB_POOL
+    pool.warmup(config)
+
+    def generate(prompt: str) -> str:
+        with pool.lease(config) as stub:
+            return stub.generate(prompt=prompt)["output"]
+
+    def generate_batch(prompts: List[str]) -> List[str]:
+        with pool.lease(config) as stub:
+            results = stub.generate_batch(prompts=prompts)
+        return [item["output"] for item in results]
+
+    def generate_stream(prompt: str) -> Iterator[str]:
+        with pool.lease(config) as stub:
+            yield from stub.generate_stream(prompt=prompt)
+
+    return AdapterTasks(
+        task=generate,
+        batch_task=generate_batch,
+        batch_param="prompt",
+        stream_task=generate_stream,
+    )
@@ -0,0 +1,54 @@
+"""
+No-op stand-in for the KL bridge.
+
+`NullBridge` has the interface of `KLBridge` but does not call the KL
+Kernel. It returns a bundle of the same shape (psi, result and a
+start / end trace with ISO 8601 UTC timestamps), so the orchestrator
+and everything behind it run unchanged. Load tests against it measure
+the fabric overhead alone, and the difference to a run against
+`KLBridge` is the Kernel cost.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from kl_kernel_logic import ExecutionContext, PsiDefinition
+
+from .kl_bridge import KLBridge
+
+
+class NullBridge(KLBridge):
+    """
+    KLBridge replacement without the Kernel.
+
+    With `run_task=True` (default) the task is still called, so results
+    stay correct. With `run_task=False` the result is None and only the
+    orchestration path is exercised.
+    """
+
+    def __init__(self, run_task: bool = True) -> None:
+        self.run_task = run_task
+
+    def execute(
+        self,
+        psi: PsiDefinition,
+        ctx: ExecutionContext,
+        task: Callable[..., Any],
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Call the task directly and package a minimal bundle.
+        """
+        started = datetime.now(timezone.utc).isoformat()
+        result = task(**kwargs) if self.run_task else None
+        finished = datetime.now(timezone.utc).isoformat()
+        return {
+            "psi": psi.describe(),
+            "execution": {
+                "result": result,
+                "trace": [
+                    {"stage": "start", "user_id": ctx.user_id, "request_id": ctx.request_id, "timestamp": started},
+                    {"stage": "end", "user_id": ctx.user_id, "request_id": ctx.request_id, "timestamp": finished},
+                ],
+            },
+        }
@@ -0,0 +1,208 @@
+"""
+Adaptive backend selection.
+
+An operation can declare several interchangeable implementations
+(backends), each an operation kind, for example the reference and the
+chunked smoothing kernels. `BackendSelector` keeps an exponentially
+weighted moving average (EWMA) of the task latency per (input size
+bucket, backend) and sends each request to the backend that is
+currently fastest for its size:
+
+- every backend is tried `min_samples` times per bucket first
+- afterwards, a fraction `epsilon` of requests explores a random other
+  backend, so the statistics follow changes in load
+- the EWMA weights the newest observation with `alpha`
+- a backend whose task raises is excluded from its size bucket, unless
+  every backend has failed there (the error itself still propagates)
+
+Size buckets are powers of two of the length of the `field` argument
+(bucket b holds lengths in [2**(b-1), 2**b)). Without a field, or for
+arguments without a length, all requests share bucket 0.
+
+Backends must return equal results. The choice is recorded in the trace
+as a "backend" stage.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class OperationBackend:
+    """
+    One implementation of an operation: the kind name and its task.
+    """
+
+    kind: str
+    task: Callable[..., Any]
+    vectorized: bool = False
+
+
+@dataclass
+class _Stat:
+    ewma_ms: float = 0.0
+    samples: int = 0
+    failures: int = 0
+
+
+@dataclass(frozen=True)
+class BackendChoice:
+    """
+    A selection made by `BackendSelector.choose`.
+
+    `reason` is "warmup" (too few samples), "explore" or "fastest".
+    """
+
+    backend: OperationBackend
+    bucket: int
+    reason: str
+    estimates: Dict[str, Optional[float]]
+
+
+class BackendSelector:
+    """
+    Thread safe, per operation latency statistics and backend choice.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[OperationBackend],
+        field: Optional[str] = None,
+        epsilon: float = 0.05,
+        alpha: float = 0.2,
+        min_samples: int = 3,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not backends:
+            raise ValueError("At least one backend is required")
+        if len({backend.kind for backend in backends}) != len(backends):
+            raise ValueError("Backend kinds must be unique")
+        if not 0.0 <= epsilon <= 1.0:
+            raise ValueError(f"epsilon must be between 0 and 1, got {epsilon}")
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        if min_samples < 1:
+            raise ValueError("min_samples must be at least 1")
+
+        self.backends = list(backends)
+        self.field = field
+        self.epsilon = epsilon
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[int, str], _Stat] = {}
+
+    def bucket(self, kwargs: Mapping[str, Any]) -> int:
+        """
+        Size bucket of a request: bit length of the `field` length.
+        """
+        if self.field is None:
+            return 0
+        value = kwargs.get(self.field)
+        if value is None or not hasattr(value, "__len__"):
+            return 0
+        return len(value).bit_length()
+
+    def choose(self, kwargs: Mapping[str, Any]) -> BackendChoice:
+        """
+        Pick the backend for a request.
+        """
+        bucket = self.bucket(kwargs)
+        with self._lock:
+            stats = [self._stats.get((bucket, backend.kind)) for backend in self.backends]
+            estimates = {
+                backend.kind: (round(stat.ewma_ms, 4) if stat is not None and stat.samples else None)
+                for backend, stat in zip(self.backends, stats)
+            }
+            candidates = [i for i, stat in enumerate(stats) if stat is None or not stat.failures]
+            if not candidates:
+                candidates = list(range(len(self.backends)))
+            samples = {i: stats[i].samples if stats[i] is not None else 0 for i in candidates}
+
+            least = min(candidates, key=samples.__getitem__)
+            if samples[least] < self.min_samples:
+                return BackendChoice(self.backends[least], bucket, "warmup", estimates)
+
+            latencies = {i: stats[i].ewma_ms for i in candidates}
+            fastest = min(candidates, key=latencies.__getitem__)
+            if len(candidates) > 1 and self._random.random() < self.epsilon:
+                others = [i for i in candidates if i != fastest]
+                index = others[self._random.randrange(len(others))]
+                return BackendChoice(self.backends[index], bucket, "explore", estimates)
+            return BackendChoice(self.backends[fastest], bucket, "fastest", estimates)
+
+    def observe(self, bucket: int, kind: str, latency_ms: float) -> None:
+        """
+        Add a latency observation for a backend in a size bucket.
+        """
+        with self._lock:
+            stat = self._stats.get((bucket, kind))
+            if stat is None:
+                stat = self._stats[(bucket, kind)] = _Stat(ewma_ms=latency_ms)
+            elif not stat.samples:
+                stat.ewma_ms = latency_ms
+            else:
+                stat.ewma_ms += self.alpha * (latency_ms - stat.ewma_ms)
+            stat.samples += 1
+
+    def observe_failure(self, bucket: int, kind: str) -> None:
+        """
+        Record that a backend raised in a size bucket.
+        """
+        with self._lock:
+            self._stats.setdefault((bucket, kind), _Stat()).failures += 1
+
+    def timed_task(self, choice: BackendChoice) -> Callable[..., Any]:
+        """
+        The chosen task, wrapped to report its latency or its failure.
+        """
+        task = choice.backend.task
+        kind = choice.backend.kind
+        bucket = choice.bucket
+
+        def timed(**kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = task(**kwargs)
+            except Exception:
+                self.observe_failure(bucket, kind)
+                raise
+            self.observe(bucket, kind, (time.perf_counter() - started) * 1000.0)
+            return result
+
+        return timed
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Current statistics, sorted by bucket and backend kind.
+        """
+        with self._lock:
+            return [
+                {
+                    "bucket": bucket,
+                    "backend": kind,
+                    "ewma_ms": stat.ewma_ms,
+                    "samples": stat.samples,
+                    "failures": stat.failures,
+                }
+                for (bucket, kind), stat in sorted(self._stats.items())
+            ]
+
+
+def backend_trace_entry(choice: BackendChoice, user_id: str, request_id: str) -> Dict[str, Any]:
+    """
+    Trace stage recording a backend decision.
+    """
+    return {
+        "stage": "backend",
+        "user_id": user_id,
+        "request_id": request_id,
+        "backend": choice.backend.kind,
+        "bucket": choice.bucket,
+        "reason": choice.reason,
+        "estimates_ms": choice.estimates,
+    }
@@ -0,0 +1,184 @@
+"""
+Binary numeric files for the KL Execution PoC.
+
+Input files are memory mapped and exposed as a float memoryview, so
+large series reach the smoothing task without text parsing and without
+extra copies. Supported formats:
+
+- raw little endian float64 or float32 (no header)
+- NumPy `.npy` files with a 1D little endian float64 / float32 array
+
+Results can be written back in the same formats. The writer returns a
+small descriptor (path, length, dtype, SHA-256) that replaces the full
+series in the bundle.
+"""
+
+import ast
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+NPY_MAGIC = b"\x93NUMPY"
+
+# dtype name -> (array typecode, .npy descr)
+DTYPES: Dict[str, Tuple[str, str]] = {
+    "float64": ("d", "<f8"),
+    "float32": ("f", "<f4"),
+}
+
+_DESCR_TO_DTYPE = {descr: name for name, (_, descr) in DTYPES.items()}
+
+
+class ValuesFile:
+    """
+    Read only, memory mapped view over a binary series file.
+
+    Use as a context manager. `values` is only valid inside the block.
+    """
+
+    def __init__(self, path: str | Path, dtype: str = "float64") -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._mmap: mmap.mmap | None = None
+        self._raw: memoryview | None = None
+        try:
+            self.values, self.dtype = self._open(dtype)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, dtype: str) -> Tuple[Any, str]:
+        offset = 0
+        if self.path.suffix == ".npy":
+            dtype, offset, length = _read_npy_header(self._file)
+        elif dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype} (expected one of {sorted(DTYPES)})")
+
+        typecode = DTYPES[dtype][0]
+        itemsize = array(typecode).itemsize
+        size = self.path.stat().st_size - offset
+        if size % itemsize:
+            raise ValueError(f"File size of {self.path} is not a multiple of {itemsize} bytes")
+        if self.path.suffix == ".npy" and size != length * itemsize:
+            raise ValueError(f"Truncated .npy file: {self.path}")
+
+        if size == 0:
+            return array(typecode), dtype
+
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._raw = memoryview(self._mmap)[offset:offset + size]
+
+        if sys.byteorder != "little":
+            # Big endian hosts cannot reinterpret the mapped bytes directly.
+            swapped = array(typecode, self._raw.tobytes())
+            swapped.byteswap()
+            return swapped, dtype
+        return self._raw.cast(typecode), dtype
+
+    def close(self) -> None:
+        """
+        Release the views and unmap the file.
+        """
+        values = getattr(self, "values", None)
+        if isinstance(values, memoryview):
+            values.release()
+        if self._raw is not None:
+            self._raw.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A task kept a view alive, the map is closed once it is collected.
+                pass
+        self._file.close()
+
+    def __enter__(self) -> "ValuesFile":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_values_file(path: str | Path, dtype: str = "float64") -> ValuesFile:
+    """
+    Memory map a raw or `.npy` series file.
+
+    `dtype` applies to raw files only, `.npy` files carry their own.
+    """
+    return ValuesFile(path, dtype=dtype)
+
+
+def write_values_file(path: str | Path, values: Any) -> Dict[str, Any]:
+    """
+    Write a float series as raw little endian data or as `.npy`
+    (chosen by the file suffix) and return its descriptor.
+    """
+    view = memoryview(values)
+    typecode = view.format.lstrip("<=")
+    dtype = next((name for name, (code, _) in DTYPES.items() if code == typecode), None)
+    if dtype is None:
+        raise TypeError(f"Unsupported buffer format for binary output: {view.format!r}")
+
+    data: Any = view.cast("B")
+    if sys.byteorder != "little":
+        swapped = array(typecode, data.tobytes())
+        swapped.byteswap()
+        data = memoryview(swapped).cast("B")
+
+    out_path = Path(path)
+    digest = hashlib.sha256()
+    with out_path.open("wb") as fh:
+        if out_path.suffix == ".npy":
+            header = _npy_header(DTYPES[dtype][1], len(view))
+            fh.write(header)
+            digest.update(header)
+        fh.write(data)
+        digest.update(data)
+
+    return {
+        "path": str(out_path),
+        "length": len(view),
+        "dtype": dtype,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _read_npy_header(fh: Any) -> Tuple[str, int, int]:
+    """
+    Parse a `.npy` header. Returns (dtype, data offset, length).
+    """
+    prefix = fh.read(8)
+    if len(prefix) != 8 or prefix[:6] != NPY_MAGIC:
+        raise ValueError("Not a .npy file")
+    major = prefix[6]
+    if major == 1:
+        (header_len,) = struct.unpack("<H", fh.read(2))
+        offset = 10 + header_len
+    elif major in (2, 3):
+        (header_len,) = struct.unpack("<I", fh.read(4))
+        offset = 12 + header_len
+    else:
+        raise ValueError(f"Unsupported .npy version: {major}")
+
+    header = ast.literal_eval(fh.read(header_len).decode("latin1"))
+    descr = header.get("descr")
+    if descr not in _DESCR_TO_DTYPE:
+        raise ValueError(f"Unsupported .npy dtype: {descr} (expected <f8 or <f4)")
+    shape = tuple(header.get("shape", ()))
+    if len(shape) != 1:
+        raise ValueError(f"Expected a 1D .npy array, got shape {shape}")
+    return _DESCR_TO_DTYPE[descr], offset, int(shape[0])
+
+
+def _npy_header(descr: str, length: int) -> bytes:
+    """
+    Build a version 1.0 `.npy` header, padded to a 64 byte boundary.
+    """
+    text = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({length},), }}"
+    total = len(NPY_MAGIC) + 2 + 2 + len(text) + 1
+    text += " " * (-total % 64) + "\n"
+    return NPY_MAGIC + bytes([1, 0]) + struct.pack("<H", len(text)) + text.encode("latin1")
@@ -5,22 +5,71 @@ Usage examples (from the project root):
 
     python -m kl_exec_poc run --op text.simplify --input "  Hello   WORLD  "
     python -m kl_exec_poc run --op signals.smooth --values 1 2 3 4
+    python -m kl_exec_poc run --op signals.smooth --values-file series.f64 --output-file out.npy
+    python -m kl_exec_poc run --op text.llm_stub --input "Some text" --stream
+    python -m kl_exec_poc batch --requests requests.jsonl --journal run.journal
+    python -m kl_exec_poc replay --journal run.journal --config new_operations.json
+    python -m kl_exec_poc verify --journal run.journal --index run.digests --workers 8
+    python -m kl_exec_poc traces query --db traces.db --op signals.smooth --user u1 --last 1h --min-duration-ms 200
+    python -m kl_exec_poc loadtest --mix config/loadtest_mix.json --rates 100 500 2000 --duration 10 --target null
 
 The CLI:
 - loads operation and policy config from JSON
 - builds a registry and policy map
 - executes the selected operation through the orchestrator
 - prints the KL bundle as JSON to stdout
+
+With --stream, stdout is newline delimited JSON instead: one
+{"event": "chunk", "data": ...} line per partial chunk as soon as it
+is produced, followed by a single {"event": "bundle", "bundle": ...} line.
+It cannot be combined with --output-file.
+
+--values-file memory maps a raw little endian float64 / float32 file or a
+.npy file. With --output-file the numeric result is written as binary and
+the bundle only carries its path, length, dtype and SHA-256 checksum.
+
+`batch` executes one request per line of a JSONL file:
+
+    {"op": "text.simplify", "request_id": "r1", "kwargs": {"text": "..."}}
+    {"op": "signals.smooth", "request_id": "r2", "values_file": "series.npy"}
+
+and records every request and bundle in a durable journal. Rerunning the
+same command after a crash skips completed requests. `replay` re-runs a
+journal against a (possibly different) config and reports results that
+no longer match. `verify` does the same at scale: it compares content
+digests of psi, result and trace (timestamps excluded) in parallel
+workers instead of full results.
+
+`run` and `batch` accept --trace-db to write every trace to an indexed
+SQLite trace store, which `traces query` filters by operation, user,
+request, stage, time range and duration.
+
+`loadtest` sends a synthetic (--mix) or recorded (--recorded) request
+mix at open loop arrival rates to an in-process orchestrator, to the
+same orchestrator without the Kernel (--target null), or to a warm
+worker pool (--target pool), and prints a JSON capacity report.
 """
 
 import argparse
 import json
+import sys
+import time
+from array import array
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, List, Sequence, Tuple
+
+from kl_kernel_logic import ExecutionPolicy
 
+from .binary_io import DTYPES, open_values_file, write_values_file
 from .config import load_config, build_registry_and_policies
-from .adapters import KLBridge
+from .adapters import KLBridge, NullBridge
+from .journal import JournaledBatchRunner, read_batch_requests, replay_journal, verify_journal
+from .loadtest import OrchestratorTarget, PoolTarget, RecordedWorkload, SyntheticWorkload, run_load_test
 from .orchestrator import Orchestrator
+from .registry import OperationRegistry
+from .trace_store import TraceStore
+from .worker_pool import WorkerPool
 
 
 def _default_config_path() -> Path:
@@ -62,6 +111,248 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Numeric values for smoothing operations (for example 'signals.smooth').",
     )
     run_parser.add_argument(
+        "--values-file",
+        type=str,
+        default=None,
+        help="Binary input for smoothing operations: raw little endian floats or a .npy file.",
+    )
+    run_parser.add_argument(
+        "--values-dtype",
+        choices=sorted(DTYPES),
+        default="float64",
+        help="Element type of a raw --values-file (ignored for .npy). Defaults to float64.",
+    )
+    run_parser.add_argument(
+        "--output-file",
+        type=str,
+        default=None,
+        help="Write a numeric result to this file (.npy or raw) instead of the bundle.",
+    )
+    run_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream partial output as JSON lines (streaming capable operations only).",
+    )
+    run_parser.add_argument(
+        "--trace-db",
+        type=str,
+        default=None,
+        help="Optional SQLite trace store. The execution trace is appended to it.",
+    )
+    run_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Optional path to a JSON config file. Defaults to config/operations.json.",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Run a JSONL file of requests with a durable journal.",
+    )
+    batch_parser.add_argument(
+        "--requests",
+        required=True,
+        help="JSONL file with one request per line ({op, request_id, user_id, kwargs, values_file}).",
+    )
+    batch_parser.add_argument(
+        "--journal",
+        required=True,
+        help="Journal path. Completed requests recorded here are skipped on rerun.",
+    )
+    batch_parser.add_argument(
+        "--group-size",
+        type=int,
+        default=64,
+        help="Journal records per group commit (fsync). Defaults to 64.",
+    )
+    batch_parser.add_argument(
+        "--group-interval-ms",
+        type=float,
+        default=10.0,
+        help="Maximum delay before pending journal records are committed. Defaults to 10 ms.",
+    )
+    batch_parser.add_argument(
+        "--index",
+        type=str,
+        default=None,
+        help="Optional digest index path. Bundle digests are appended for use by 'verify'.",
+    )
+    batch_parser.add_argument(
+        "--trace-db",
+        type=str,
+        default=None,
+        help="Optional SQLite trace store. Every execution trace is appended to it.",
+    )
+    batch_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Optional path to a JSON config file. Defaults to config/operations.json.",
+    )
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Re-run a journal and report results that differ from the recorded ones.",
+    )
+    replay_parser.add_argument(
+        "--journal",
+        required=True,
+        help="Journal written by the batch command.",
+    )
+    replay_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Optional path to a JSON config file. Defaults to config/operations.json.",
+    )
+
+    verify_parser = subparsers.add_parser(
+        "verify",
+        help="Re-execute a journal in parallel and compare bundle digests.",
+    )
+    verify_parser.add_argument(
+        "--journal",
+        required=True,
+        help="Journal written by the batch command.",
+    )
+    verify_parser.add_argument(
+        "--index",
+        type=str,
+        default=None,
+        help="Digest index written by 'batch --index'. Computed from the journal if omitted.",
+    )
+    verify_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of parallel workers. Defaults to 4.",
+    )
+    verify_parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Use worker processes instead of threads (for CPU bound operations).",
+    )
+    verify_parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Optional path to a JSON config file. Defaults to config/operations.json.",
+    )
+
+    traces_parser = subparsers.add_parser(
+        "traces",
+        help="Inspect a trace store written with --trace-db.",
+    )
+    traces_subparsers = traces_parser.add_subparsers(dest="traces_command", required=True)
+    query_parser = traces_subparsers.add_parser(
+        "query",
+        help="List matching executions, newest first.",
+    )
+    query_parser.add_argument("--db", required=True, help="Trace store path.")
+    query_parser.add_argument("--op", default=None, help="Operation key.")
+    query_parser.add_argument("--user", default=None, help="User id.")
+    query_parser.add_argument("--request", default=None, help="Request id.")
+    query_parser.add_argument(
+        "--stage",
+        default=None,
+        help="Only executions whose trace contains this stage (for example 'route').",
+    )
+    query_parser.add_argument(
+        "--last",
+        default=None,
+        help="Relative time window, for example '30s', '15m', '1h' or '2d'.",
+    )
+    query_parser.add_argument("--since", type=float, default=None, help="Start time (epoch seconds).")
+    query_parser.add_argument("--until", type=float, default=None, help="End time (epoch seconds).")
+    query_parser.add_argument(
+        "--min-duration-ms",
+        type=float,
+        default=None,
+        help="Only executions that took at least this long.",
+    )
+    query_parser.add_argument(
+        "--limit",
+        type=int,
+        default=100,
+        help="Maximum number of executions to return. Defaults to 100.",
+    )
+
+    loadtest_parser = subparsers.add_parser(
+        "loadtest",
+        help="Run an open loop load test and print a JSON capacity report.",
+    )
+    workload_group = loadtest_parser.add_mutually_exclusive_group(required=True)
+    workload_group.add_argument(
+        "--mix",
+        default=None,
+        help="JSON file with a synthetic request mix (operations, sizes, users).",
+    )
+    workload_group.add_argument(
+        "--recorded",
+        default=None,
+        help="Journal or batch requests file to replay.",
+    )
+    loadtest_parser.add_argument(
+        "--target",
+        choices=("orchestrator", "null", "pool"),
+        default="orchestrator",
+        help="In-process orchestrator, orchestrator without the Kernel, or worker pool.",
+    )
+    loadtest_parser.add_argument(
+        "--run-tasks",
+        action="store_true",
+        help="Call the operation tasks with the null target. By default it skips them.",
+    )
+    loadtest_parser.add_argument(
+        "--rates",
+        nargs="+",
+        type=float,
+        required=True,
+        help="Arrival rates in requests per second, one stage each.",
+    )
+    loadtest_parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Seconds per stage. Defaults to 10.",
+    )
+    loadtest_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Threads for the orchestrator and null targets. Defaults to 8.",
+    )
+    loadtest_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Worker processes for the pool target. Defaults to 2.",
+    )
+    loadtest_parser.add_argument(
+        "--slo-p99-ms",
+        type=float,
+        default=None,
+        help="Also count a stage as saturated when its p99 latency exceeds this.",
+    )
+    loadtest_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=10_000,
+        help="Drop arrivals beyond this many outstanding requests. Defaults to 10000.",
+    )
+    loadtest_parser.add_argument(
+        "--all-stages",
+        action="store_true",
+        help="Keep running the remaining rates after the first saturated stage.",
+    )
+    loadtest_parser.add_argument("--seed", type=int, default=0, help="Seed for arrivals. Defaults to 0.")
+    loadtest_parser.add_argument(
+        "--output",
+        default=None,
+        help="Write the report to this file instead of stdout.",
+    )
+    loadtest_parser.add_argument(
         "--config",
         type=str,
         default=None,
@@ -83,63 +374,342 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     if args.command == "run":
         return _handle_run(args, parser)
+    if args.command == "batch":
+        return _handle_batch(args, parser)
+    if args.command == "replay":
+        return _handle_replay(args, parser)
+    if args.command == "verify":
+        return _handle_verify(args, parser)
+    if args.command == "traces":
+        return _handle_traces(args, parser)
+    if args.command == "loadtest":
+        return _handle_loadtest(args, parser)
 
     parser.error(f"Unknown command: {args.command}")
     return 1
 
 
-def _handle_run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
-    # Resolve config path
+def _resolve_config_path(args: argparse.Namespace, parser: argparse.ArgumentParser) -> Path:
     cfg_path = Path(args.config) if args.config is not None else _default_config_path()
 
     if not cfg_path.exists():
         parser.error(f"Config file not found: {cfg_path}")
+    return cfg_path
 
+
+def _load_registry(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+) -> Tuple[OperationRegistry, Dict[str, ExecutionPolicy]]:
     # Load config and build registry + policies
-    configs = load_config(cfg_path)
-    registry, policy_map = build_registry_and_policies(configs)
+    configs = load_config(_resolve_config_path(args, parser))
+    return build_registry_and_policies(configs)
+
+
+def _handle_run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    registry, policy_map = _load_registry(args, parser)
 
     if args.op not in policy_map:
         parser.error(f"Unknown operation key: {args.op}")
 
     policy = policy_map[args.op]
 
-    bridge = KLBridge()
-    orchestrator = Orchestrator(registry=registry, bridge=bridge)
+    try:
+        with ExitStack() as stack:
+            trace_store = _open_trace_store(args, stack)
+            bridge = KLBridge()
+            orchestrator = Orchestrator(registry=registry, bridge=bridge, trace_store=trace_store)
+            return _dispatch_run(args, parser, orchestrator, registry, policy, stack)
+    finally:
+        registry.close()
+
+
+def _open_trace_store(args: argparse.Namespace, stack: ExitStack) -> TraceStore | None:
+    """
+    Open the --trace-db store, if any. It is flushed and closed with `stack`.
+    """
+    if args.trace_db is None:
+        return None
+    return stack.enter_context(TraceStore(args.trace_db))
+
+
+def _handle_batch(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    registry, policy_map = _load_registry(args, parser)
+
+    requests_path = Path(args.requests)
+    if not requests_path.exists():
+        parser.error(f"Requests file not found: {requests_path}")
+
+    with ExitStack() as stack:
+        trace_store = _open_trace_store(args, stack)
+        orchestrator = Orchestrator(registry=registry, bridge=KLBridge(), trace_store=trace_store)
+        runner = JournaledBatchRunner(
+            orchestrator,
+            policy_map,
+            args.journal,
+            group_size=args.group_size,
+            group_interval_ms=args.group_interval_ms,
+            index_path=args.index,
+        )
+
+        try:
+            for result in runner.run(read_batch_requests(requests_path)):
+                event: Dict[str, Any] = {"request_id": result.request.request_id}
+                if result.error is not None:
+                    event["error"] = result.error
+                else:
+                    event["bundle"] = result.bundle
+                if result.replayed:
+                    event["replayed"] = True
+                _print_event(event)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    print(
+        json.dumps(
+            {
+                "executed": runner.executed,
+                "replayed": runner.replayed,
+                "skipped": runner.skipped,
+                "failed": runner.failed,
+            }
+        ),
+        file=sys.stderr,
+    )
+    return 1 if runner.failed else 0
+
+
+def _handle_replay(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    registry, policy_map = _load_registry(args, parser)
+
+    journal_path = Path(args.journal)
+    if not journal_path.exists():
+        parser.error(f"Journal not found: {journal_path}")
+
+    orchestrator = Orchestrator(registry=registry, bridge=KLBridge())
+    report = replay_journal(journal_path, orchestrator, policy_map)
+    _print_json(report)
+    return 1 if report["mismatches"] or report["errors"] else 0
+
+
+def _handle_verify(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    cfg_path = _resolve_config_path(args, parser)
+
+    journal_path = Path(args.journal)
+    if not journal_path.exists():
+        parser.error(f"Journal not found: {journal_path}")
+    if args.index is not None and not Path(args.index).exists():
+        parser.error(f"Digest index not found: {args.index}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    report = verify_journal(
+        journal_path,
+        cfg_path,
+        index_path=args.index,
+        workers=args.workers,
+        processes=args.processes,
+    )
+    _print_json(report)
+    return 1 if report["mismatched"] or report["failed"] else 0
+
+
+# Suffix of a --last window -> seconds.
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _handle_traces(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    db_path = Path(args.db)
+    if not db_path.exists():
+        parser.error(f"Trace store not found: {db_path}")
+
+    since = args.since
+    if args.last is not None:
+        unit = args.last[-1:]
+        try:
+            window = float(args.last[:-1]) * _WINDOW_UNITS[unit]
+        except (KeyError, ValueError):
+            parser.error(f"Invalid --last window: {args.last} (expected e.g. 30s, 15m, 1h, 2d)")
+        since = time.time() - window
+
+    with TraceStore(db_path) as store:
+        rows = store.query(
+            key=args.op,
+            user_id=args.user,
+            request_id=args.request,
+            stage=args.stage,
+            since=since,
+            until=args.until,
+            min_duration_ms=args.min_duration_ms,
+            limit=args.limit,
+        )
+    for row in rows:
+        _print_event(row)
+    return 0
+
+
+def _handle_loadtest(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    cfg_path = _resolve_config_path(args, parser)
+    if any(rate <= 0 for rate in args.rates) or args.duration <= 0:
+        parser.error("--rates and --duration must be positive")
+    if args.concurrency < 1 or args.workers < 1:
+        parser.error("--concurrency and --workers must be at least 1")
+
+    source = Path(args.mix if args.mix is not None else args.recorded)
+    if not source.exists():
+        parser.error(f"Workload file not found: {source}")
+    try:
+        if args.mix is not None:
+            workload: Any = SyntheticWorkload.from_dict(json.loads(source.read_text(encoding="utf-8")))
+        else:
+            workload = RecordedWorkload.from_file(source)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.target == "pool":
+        target: Any = PoolTarget(WorkerPool(cfg_path, workers=args.workers).start())
+    else:
+        registry, policy_map = build_registry_and_policies(load_config(cfg_path))
+        bridge = NullBridge(run_task=args.run_tasks) if args.target == "null" else KLBridge()
+        target = OrchestratorTarget(
+            Orchestrator(registry=registry, bridge=bridge),
+            policy_map,
+            concurrency=args.concurrency,
+        )
+
+    try:
+        report = run_load_test(
+            target,
+            workload,
+            args.rates,
+            duration_s=args.duration,
+            slo_p99_ms=args.slo_p99_ms,
+            max_in_flight=args.max_in_flight,
+            stop_at_saturation=not args.all_stages,
+            seed=args.seed,
+        )
+    finally:
+        target.close()
+
+    report = {"target": args.target, "workload": str(source), **report}
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    else:
+        _print_json(report)
+    return 0
+
+
+def _dispatch_run(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    orchestrator: Orchestrator,
+    registry: OperationRegistry,
+    policy: ExecutionPolicy,
+    stack: ExitStack,
+) -> int:
+    """
+    Build the operation kwargs, execute and print the result.
+
+    Memory mapped input files are registered on `stack` and stay open
+    until the bundle has been printed.
+    """
+    if args.values is not None and args.values_file is not None:
+        parser.error("Use either --values or --values-file, not both.")
+    if args.stream and args.output_file is not None:
+        parser.error("Use either --stream or --output-file, not both.")
+    if args.output_file is not None and args.op != "signals.smooth":
+        parser.error("--output-file is only supported for numeric operations.")
 
     # Dispatch based on operation key
+    op_kwargs: Dict[str, Any]
     if args.op == "text.simplify":
         if not args.input:
             parser.error("text.simplify requires --input <text>.")
-        result = orchestrator.execute_operation(
-            key=args.op,
-            user_id="cli-user",
-            request_id="cli-text-001",
-            policy=policy,
-            text=args.input,
-        )
+        request_id = "cli-text-001"
+        op_kwargs = {"text": args.input}
+    elif args.op == "text.llm_stub":
+        if not args.input:
+            parser.error("text.llm_stub requires --input <text>.")
+        request_id = "cli-llm-001"
+        op_kwargs = {"prompt": args.input}
     elif args.op == "signals.smooth":
-        if not args.values:
-            parser.error("signals.smooth requires --values <v1> <v2> ...")
-        result = orchestrator.execute_operation(
+        request_id = "cli-smooth-001"
+        if args.values_file is not None:
+            values_file = stack.enter_context(
+                open_values_file(args.values_file, dtype=args.values_dtype)
+            )
+            op_kwargs = {"values": values_file.values}
+        elif args.values:
+            op_kwargs = {"values": list(args.values)}
+        else:
+            parser.error("signals.smooth requires --values <v1> <v2> ... or --values-file <path>")
+    else:
+        parser.error(f"Operation not supported by CLI dispatch: {args.op}")
+        return 1
+
+    if args.stream:
+        if registry.get(args.op).stream_task is None:
+            parser.error(f"Operation does not support streaming: {args.op}")
+        stream = orchestrator.execute_operation_stream(
             key=args.op,
             user_id="cli-user",
-            request_id="cli-smooth-001",
+            request_id=request_id,
             policy=policy,
-            values=list(args.values),
+            **op_kwargs,
         )
-    else:
-        parser.error(f"Operation not supported by CLI dispatch: {args.op}")
-        return 1
+        for chunk in stream:
+            _print_event({"event": "chunk", "data": chunk})
+        _print_event({"event": "bundle", "bundle": stream.bundle})
+        return 0
+
+    result = orchestrator.execute_operation(
+        key=args.op,
+        user_id="cli-user",
+        request_id=request_id,
+        policy=policy,
+        **op_kwargs,
+    )
+
+    if args.output_file is not None:
+        _write_result_file(result, args.output_file)
 
     # Print KL bundle as JSON
     _print_json(result)
     return 0
 
 
+def _write_result_file(bundle: Dict[str, Any], path: str) -> None:
+    """
+    Write the numeric result to a binary file and replace it in the
+    bundle with the file descriptor (path, length, dtype, sha256).
+    """
+    execution = bundle["execution"]
+    result = execution["result"]
+    if not isinstance(result, (array, memoryview)) and not hasattr(result, "__array_interface__"):
+        result = array("d", result)
+    execution["result"] = write_values_file(path, result)
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Serialise compact numeric results (array, memoryview, NumPy) as lists.
+    """
+    if isinstance(value, (array, memoryview)) or hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def _print_json(bundle: Dict[str, Any]) -> None:
     """
     Print the KL bundle as formatted JSON.
     """
-    text = json.dumps(bundle, indent=2)
+    text = json.dumps(bundle, indent=2, default=_json_default)
     print(text)
+
+
+def _print_event(event: Dict[str, Any]) -> None:
+    """
+    Print a single streaming event as one JSON line and flush, so that
+    consumers see partial output immediately.
+    """
+    print(json.dumps(event, default=_json_default), flush=True)
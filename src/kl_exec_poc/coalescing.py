@@ -0,0 +1,131 @@
+"""
+Request coalescing for the KL Execution PoC.
+
+Identical in-flight calls to a deterministic operation are collapsed
+into a single task invocation. The first caller (the leader) computes
+the result, concurrent duplicates wait for it and receive a deep copy,
+so callers can modify their results independently. If the call fails,
+each duplicate raises its own copy of the error, chained to the
+original.
+
+Only the task call is shared. Every caller still runs through the
+Kernel with its own ExecutionContext, so each bundle carries its own
+user_id / request_id trace entries.
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Convert a kwargs value into a hashable form.
+
+    Every value is tagged with its type, so values that compare equal
+    across types (`1`, `1.0` and `True`) get different keys.
+
+    Raises TypeError for values that cannot be represented.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        items = ((_freeze(k), _freeze(v)) for k, v in value.items())
+        return ("dict", tuple(sorted(items, key=repr)))
+    hash(value)
+    return (type(value).__name__, value)
+
+
+def build_flight_key(key: str, kwargs: Mapping[str, Any]) -> Optional[Hashable]:
+    """
+    Build the coalescing key for an operation call.
+
+    Returns None if the kwargs contain values that cannot be hashed,
+    in which case the call is executed without coalescing.
+    """
+    try:
+        return (key, tuple(sorted((name, _freeze(v)) for name, v in kwargs.items())))
+    except TypeError:
+        return None
+
+
+class _Call:
+    """
+    A single in-flight computation shared by the leader and its followers.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread safe single flight group.
+
+    `do(key, fn)` calls `fn` once per key at a time. Callers that arrive
+    while a call for the same key is running block until it finishes and
+    receive a deep copy of its result, or a copy of its exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """
+        Number of calls that were served by another caller's computation.
+        """
+        with self._lock:
+            return self._coalesced
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` for `key`, or wait for an identical in-flight call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _copy_error(call.error) from call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    A new exception of the same type and arguments for a follower.
+
+    Raising the leader's instance in several threads would mix their
+    tracebacks. Exceptions that cannot be copied become a RuntimeError.
+    """
+    try:
+        fresh = copy.copy(error)
+    except Exception:  # noqa: BLE001 - custom constructors, fall back below
+        fresh = None
+    if fresh is None or fresh is error:
+        return RuntimeError(f"Coalesced call failed: {error!r}")
+    return fresh
@@ -7,12 +7,15 @@ Provides:
 - helpers to build a registry and policy map from config
 """
 
-from .schemas import OperationPolicyConfig, OperationConfig
+from .schemas import OperationPolicyConfig, OperationConfig, BatchingConfig, RouteConfig, BackendsConfig
 from .loader import load_config, build_registry_and_policies
 
 __all__ = [
     "OperationPolicyConfig",
     "OperationConfig",
+    "BatchingConfig",
+    "RouteConfig",
+    "BackendsConfig",
     "load_config",
     "build_registry_and_policies",
 ]
@@ -10,26 +10,18 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-from kl_kernel_logic import (
-    PsiDefinition,
-    OperationType,
-    EffectClass,
-    ExecutionPolicy,
-)
-from kl_kernel_logic.examples.text_simplify import simplify_text
-from kl_kernel_logic.examples_foundations import smooth_measurements
+from kl_kernel_logic import ExecutionPolicy
 
+from ..accounting import ACCOUNTING_LEVELS
+from ..adaptive import BackendSelector, OperationBackend
+from ..constraints import ArgumentConstraint, OperationRoute
+from ..interning import intern_policy, intern_psi
+from ..kinds import KindSpec, resolve_kind
 from ..registry import OperationRegistry, OperationMetadata
-from .schemas import OperationConfig, OperationPolicyConfig
-from ..adapters.llm_stub import llm_stub_generate
-
-
-# Mapping from config "kind" to concrete task callables.
-OPERATION_KIND_MAP: Dict[str, Any] = {
-    "text_simplify": simplify_text,
-    "signals_smooth": smooth_measurements,
-    "llm_stub": llm_stub_generate,
-}
+from .schemas import BackendsConfig, OperationConfig, OperationPolicyConfig, BatchingConfig, RouteConfig
+from ..tracing import TracePolicy
+from ..adapters.batching import MicroBatcher, make_batched_task
+from ..adapters.client_pool import AdapterTasks
 
 
 def load_config(path: str | Path) -> List[OperationConfig]:
@@ -49,10 +41,50 @@ def load_config(path: str | Path) -> List[OperationConfig]:
             "allow_network": false,
             "allow_filesystem": false,
             "timeout_seconds": 5
+          },
+          "batching": {
+            "max_batch_size": 16,
+            "max_wait_ms": 5
+          },
+          "adapter": {
+            "mode": "upper",
+            "max_concurrency": 4
+          },
+          "limits": {
+            "values": {"type": "series", "max_length": 10000}
+          },
+          "routes": [
+            {"field": "values", "min_length": 10001, "kind": "signals_smooth_chunked"}
+          ],
+          "tracing": {
+            "sample_rate": 0.1,
+            "keep_if_slower_than_ms": 200
+          },
+          "warmup": {"values": [1.0, 2.0, 3.0]},
+          "accounting": "basic",
+          "backends": {
+            "kinds": ["signals_smooth", "signals_smooth_chunked"],
+            "field": "values",
+            "epsilon": 0.05
           }
         }
       ]
     }
+
+    "kind" (also in routes) names a built-in kind, a "module:attr"
+    reference or an entry point, see `kl_exec_poc.kinds`.
+    The "batching" block is optional and only valid for batch capable kinds.
+    The "adapter" block is optional and only valid for kinds backed by a
+    pooled adapter client (currently "llm_stub").
+    "limits" and "routes" are optional, see `kl_exec_poc.constraints`.
+    "tracing" is optional, see `kl_exec_poc.tracing.TracePolicy`.
+    "warmup" is optional: task arguments for one warm-up execution, see
+    `kl_exec_poc.worker_pool`.
+    "accounting" is optional ("off", "basic" or "memory", default "off"),
+    see `kl_exec_poc.accounting`.
+    "backends" is optional: alternative kinds chosen by observed latency,
+    see `kl_exec_poc.adaptive`. It cannot be combined with "batching" or
+    "adapter".
     """
     cfg_path = Path(path)
     raw_text = cfg_path.read_text(encoding="utf-8")
@@ -67,18 +99,101 @@ def load_config(path: str | Path) -> List[OperationConfig]:
             timeout_seconds=policy_raw.get("timeout_seconds"),
         )
 
+        batching: BatchingConfig | None = None
+        batching_raw = raw.get("batching")
+        if batching_raw is not None:
+            batching = BatchingConfig(
+                max_batch_size=int(batching_raw.get("max_batch_size", 16)),
+                max_wait_ms=float(batching_raw.get("max_wait_ms", 5.0)),
+            )
+
         cfg = OperationConfig(
             key=str(raw["key"]),
             kind=str(raw["kind"]),
             logical_binding=str(raw["logical_binding"]),
             constraints=raw.get("constraints"),
             policy=policy,
+            batching=batching,
+            adapter=raw.get("adapter"),
+            limits=_parse_limits(raw.get("limits", {}), key=str(raw["key"])),
+            routes=[
+                RouteConfig(
+                    field=str(route["field"]),
+                    min_length=int(route["min_length"]),
+                    kind=str(route["kind"]),
+                )
+                for route in raw.get("routes", [])
+            ],
+            tracing=_parse_tracing(raw.get("tracing"), key=str(raw["key"])),
+            warmup=_parse_warmup(raw.get("warmup"), key=str(raw["key"])),
+            accounting=_parse_accounting(raw.get("accounting", "off"), key=str(raw["key"])),
+            backends=_parse_backends(raw.get("backends"), key=str(raw["key"])),
         )
         configs.append(cfg)
 
     return configs
 
 
+def _parse_limits(raw: Dict[str, Any], key: str) -> Dict[str, ArgumentConstraint]:
+    """
+    Parse the "limits" block: argument name -> constraint settings.
+    """
+    limits: Dict[str, ArgumentConstraint] = {}
+    for name, spec in raw.items():
+        try:
+            limits[str(name)] = ArgumentConstraint(**spec)
+        except TypeError as exc:
+            raise ValueError(f"Invalid limits for argument {name} of {key}: {exc}") from exc
+    return limits
+
+
+def _parse_tracing(raw: Dict[str, Any] | None, key: str) -> TracePolicy | None:
+    """
+    Parse the "tracing" block into a TracePolicy.
+    """
+    if raw is None:
+        return None
+    try:
+        return TracePolicy(**raw)
+    except TypeError as exc:
+        raise ValueError(f"Invalid tracing settings of {key}: {exc}") from exc
+
+
+def _parse_warmup(raw: Any, key: str) -> Dict[str, Any] | None:
+    """
+    Validate the "warmup" block: a mapping of task arguments.
+    """
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        raise ValueError(f"Invalid warmup input of {key}: expected an object of task arguments")
+    return dict(raw)
+
+
+def _parse_accounting(raw: Any, key: str) -> str:
+    """
+    Validate the "accounting" level.
+    """
+    if raw not in ACCOUNTING_LEVELS:
+        raise ValueError(f"Invalid accounting level of {key}: {raw!r} (expected one of {ACCOUNTING_LEVELS})")
+    return str(raw)
+
+
+def _parse_backends(raw: Dict[str, Any] | None, key: str) -> BackendsConfig | None:
+    """
+    Parse the "backends" block into a BackendsConfig.
+    """
+    if raw is None:
+        return None
+    try:
+        backends = BackendsConfig(**raw)
+    except TypeError as exc:
+        raise ValueError(f"Invalid backends settings of {key}: {exc}") from exc
+    if not isinstance(backends.kinds, list) or not backends.kinds:
+        raise ValueError(f"Invalid backends settings of {key}: expected a non empty list of kinds")
+    return backends
+
+
 def build_registry_and_policies(
     configs: List[OperationConfig],
 ) -> Tuple[OperationRegistry, Dict[str, ExecutionPolicy]]:
@@ -88,30 +203,143 @@ def build_registry_and_policies(
 
     The registry maps operation keys to PsiDefinition and task callables.
     The policy map provides a default ExecutionPolicy per operation key.
+
+    Psi definitions and policies are interned: operations with equal
+    settings share one immutable object (see `kl_exec_poc.interning`).
     """
     registry = OperationRegistry()
     policies: Dict[str, ExecutionPolicy] = {}
 
     for cfg in configs:
         try:
-            task = OPERATION_KIND_MAP[cfg.kind]
+            kind = resolve_kind(cfg.kind)
         except KeyError as exc:
             raise KeyError(f"Unknown operation kind in config: {cfg.kind}") from exc
 
-        psi = PsiDefinition(
-            operation_type=OperationType.TRANSFORM,
+        task = kind.task
+        stream_task = kind.stream_task
+        async_task = kind.async_task
+        batch_spec = (kind.batch_param, kind.batch_task) if kind.batch_task is not None else None
+
+        if cfg.adapter is not None:
+            tasks = _build_adapter_tasks(cfg, kind, cfg.adapter)
+            task = tasks.task
+            stream_task = tasks.stream_task
+            async_task = None
+            batch_spec = None
+            if tasks.batch_task is not None and tasks.batch_param is not None:
+                batch_spec = (tasks.batch_param, tasks.batch_task)
+
+        batcher = None
+        if cfg.batching is not None:
+            task, batcher = _build_batched_task(cfg, cfg.batching, batch_spec)
+            async_task = None
+
+        psi = intern_psi(
             logical_binding=cfg.logical_binding,
-            effect_class=EffectClass.NON_STATE_CHANGING,
             constraints=cfg.constraints,
         )
 
-        meta = OperationMetadata(psi=psi, task=task)
+        meta = OperationMetadata(
+            psi=psi,
+            task=task,
+            stream_task=stream_task,
+            async_task=async_task,
+            vectorized=kind.vectorized,
+            constraints=dict(cfg.limits),
+            routes=[_build_route(cfg, route) for route in cfg.routes],
+            tracing=cfg.tracing,
+            accounting=cfg.accounting,
+            backends=_build_backends(cfg, cfg.backends) if cfg.backends is not None else None,
+            batcher=batcher,
+        )
         registry.register(cfg.key, meta)
 
-        policies[cfg.key] = ExecutionPolicy(
+        policies[cfg.key] = intern_policy(
             allow_network=cfg.policy.allow_network,
             allow_filesystem=cfg.policy.allow_filesystem,
             timeout_seconds=cfg.policy.timeout_seconds,
         )
 
     return registry, policies
+
+
+def _build_route(cfg: OperationConfig, route: RouteConfig) -> OperationRoute:
+    """
+    Resolve the task of a routing rule from its operation kind.
+    """
+    try:
+        kind = resolve_kind(route.kind)
+    except KeyError as exc:
+        raise KeyError(f"Unknown operation kind in route of {cfg.key}: {route.kind}") from exc
+    return OperationRoute(
+        field=route.field,
+        min_length=route.min_length,
+        kind=route.kind,
+        task=kind.task,
+        vectorized=kind.vectorized,
+    )
+
+
+def _build_backends(cfg: OperationConfig, backends: BackendsConfig) -> BackendSelector:
+    """
+    Resolve the backend kinds of an operation into a selector.
+    """
+    if cfg.batching is not None or cfg.adapter is not None:
+        raise ValueError(f"Backends cannot be combined with batching or adapter settings (key {cfg.key})")
+
+    resolved: List[OperationBackend] = []
+    for name in backends.kinds:
+        try:
+            kind = resolve_kind(name)
+        except KeyError as exc:
+            raise KeyError(f"Unknown operation kind in backends of {cfg.key}: {name}") from exc
+        resolved.append(OperationBackend(kind=name, task=kind.task, vectorized=kind.vectorized))
+
+    try:
+        return BackendSelector(
+            resolved,
+            field=backends.field,
+            epsilon=backends.epsilon,
+            alpha=backends.alpha,
+            min_samples=backends.min_samples,
+        )
+    except ValueError as exc:
+        raise ValueError(f"Invalid backends settings of {cfg.key}: {exc}") from exc
+
+
+def _build_adapter_tasks(cfg: OperationConfig, kind: KindSpec, adapter: Dict[str, Any]) -> AdapterTasks:
+    """
+    Bind the tasks of an adapter backed kind to its pooled client.
+    """
+    if kind.adapter_builder is None:
+        raise ValueError(
+            f"Operation kind does not accept adapter settings: {cfg.kind} (key {cfg.key})"
+        )
+    return kind.adapter_builder(adapter)
+
+
+def _build_batched_task(
+    cfg: OperationConfig,
+    batching: BatchingConfig,
+    batch_spec: Tuple[str, Any] | None,
+) -> Tuple[Any, MicroBatcher]:
+    """
+    Put a micro batcher in front of a batch capable operation kind.
+
+    Each operation gets its own batcher, so batch size and latency
+    window are configured per operation key. Returns the batched task
+    and the batcher, which the registry closes.
+    """
+    if batch_spec is None:
+        raise ValueError(
+            f"Operation kind does not support batching: {cfg.kind} (key {cfg.key})"
+        )
+    param, batch_fn = batch_spec
+
+    batcher = MicroBatcher(
+        batch_fn=batch_fn,
+        max_batch_size=batching.max_batch_size,
+        max_wait_ms=batching.max_wait_ms,
+    )
+    return make_batched_task(batcher, param), batcher
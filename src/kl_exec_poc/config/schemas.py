@@ -5,8 +5,11 @@ These are simple data structures that can be populated from
 static files (for example JSON) and then mapped to KL primitives.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..constraints import ArgumentConstraint
+from ..tracing import TracePolicy
 
 
 @dataclass
@@ -23,11 +26,69 @@ class OperationPolicyConfig:
     timeout_seconds: Optional[int] = None
 
 
+@dataclass
+class BatchingConfig:
+    """
+    Micro batching settings for a batch capable operation.
+
+    Requests are collected for up to `max_batch_size` items or
+    `max_wait_ms` milliseconds before one batched call is issued.
+    """
+
+    max_batch_size: int = 16
+    max_wait_ms: float = 5.0
+
+
+@dataclass
+class RouteConfig:
+    """
+    Size based routing rule for an operation.
+
+    Inputs whose argument `field` has at least `min_length` items are
+    executed by the task of operation kind `kind` instead.
+    """
+
+    field: str
+    min_length: int
+    kind: str
+
+
+@dataclass
+class BackendsConfig:
+    """
+    Interchangeable implementations of an operation.
+
+    `kinds` are the candidate operation kinds. Requests are bucketed by
+    the length of the argument `field` and sent to the backend with the
+    lowest observed latency, exploring others with probability `epsilon`.
+    """
+
+    kinds: List[str]
+    field: Optional[str] = None
+    epsilon: float = 0.05
+    alpha: float = 0.2
+    min_samples: int = 3
+
+
 @dataclass
 class OperationConfig:
     """
     Logical description of an operation entry in the registry,
     including a simple policy configuration.
+
+    `adapter` holds kind specific client settings (for example the
+    LLM stub mode). Operations with equal settings share a pooled client.
+
+    `limits` holds machine readable constraints per task argument,
+    `routes` the size based routing rules and `tracing` the trace
+    sampling and retention settings.
+
+    `warmup` holds task arguments that warm worker processes execute
+    once before they accept traffic.
+
+    `accounting` is the resource accounting level ("off", "basic" or
+    "memory"). `backends` lists alternative implementations that are
+    selected by observed latency.
     """
 
     key: str
@@ -35,3 +96,11 @@ class OperationConfig:
     logical_binding: str
     constraints: Optional[str]
     policy: OperationPolicyConfig
+    batching: Optional[BatchingConfig] = None
+    adapter: Optional[Dict[str, Any]] = None
+    limits: Dict[str, ArgumentConstraint] = field(default_factory=dict)
+    routes: List[RouteConfig] = field(default_factory=list)
+    tracing: Optional[TracePolicy] = None
+    warmup: Optional[Dict[str, Any]] = None
+    accounting: str = "off"
+    backends: Optional[BackendsConfig] = None
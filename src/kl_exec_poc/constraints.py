@@ -0,0 +1,151 @@
+"""
+Machine readable input constraints and size based routing.
+
+The `constraints` string on a Psi definition is descriptive only. The
+types here make the important parts of it checkable before dispatch:
+
+- `ArgumentConstraint`: expected type, maximum length and value range
+  for a single task argument
+- `OperationRoute`: send inputs above a size threshold to a scalable
+  variant of the operation instead of the default task
+
+All checks are O(1) except value ranges on series, which are only
+evaluated when configured.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+
+class ConstraintViolation(ValueError):
+    """
+    Raised when operation arguments do not satisfy the configured constraints.
+    """
+
+
+def _is_series(value: Any) -> bool:
+    return isinstance(value, (list, tuple, array, memoryview)) or (
+        type(value).__module__ == "numpy" and hasattr(value, "__array_interface__")
+    )
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Constraint type name -> type check.
+ARGUMENT_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "text": lambda value: isinstance(value, str),
+    "series": _is_series,
+    "number": _is_number,
+}
+
+
+@dataclass(frozen=True)
+class ArgumentConstraint:
+    """
+    Constraints for a single task argument.
+
+    - `type`: one of ARGUMENT_TYPES ("text", "series", "number")
+    - `required`: the argument must be present
+    - `max_length`: upper bound for len(value)
+    - `min_value` / `max_value`: bounds for a number or for every
+      element of a series
+    """
+
+    type: Optional[str] = None
+    required: bool = False
+    max_length: Optional[int] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.type is not None and self.type not in ARGUMENT_TYPES:
+            raise ValueError(
+                f"Unknown argument type: {self.type} (expected one of {sorted(ARGUMENT_TYPES)})"
+            )
+
+
+@dataclass(frozen=True)
+class OperationRoute:
+    """
+    Route inputs whose `field` has at least `min_length` items to `task`.
+
+    `kind` names the operation kind the task was resolved from, so the
+    routing decision can be recorded in the trace. `vectorized` is the
+    capability of that kind (see `kl_exec_poc.kinds`).
+    """
+
+    field: str
+    min_length: int
+    kind: str
+    task: Callable[..., Any]
+    vectorized: bool = False
+
+
+def select_route(
+    routes: Sequence[OperationRoute],
+    kwargs: Mapping[str, Any],
+) -> Optional[OperationRoute]:
+    """
+    Return the first route whose size threshold is reached, if any.
+    """
+    for route in routes:
+        value = kwargs.get(route.field)
+        if value is None or not hasattr(value, "__len__"):
+            continue
+        if len(value) >= route.min_length:
+            return route
+    return None
+
+
+def check_arguments(
+    constraints: Mapping[str, ArgumentConstraint],
+    kwargs: Mapping[str, Any],
+    skip_length: Optional[str] = None,
+) -> None:
+    """
+    Validate task arguments against their constraints.
+
+    `skip_length` names an argument whose length limit does not apply,
+    because the request was routed to a variant built for large inputs.
+    """
+    for name, constraint in constraints.items():
+        if name not in kwargs:
+            if constraint.required:
+                raise ConstraintViolation(f"Missing required argument: {name}")
+            continue
+
+        value = kwargs[name]
+        if constraint.type is not None and not ARGUMENT_TYPES[constraint.type](value):
+            raise ConstraintViolation(
+                f"Argument {name} must be of type {constraint.type}, got {type(value).__name__}"
+            )
+
+        if constraint.max_length is not None and name != skip_length and hasattr(value, "__len__"):
+            length = len(value)
+            if length > constraint.max_length:
+                raise ConstraintViolation(
+                    f"Argument {name} has length {length}, limit is {constraint.max_length}"
+                )
+
+        if constraint.min_value is not None or constraint.max_value is not None:
+            _check_range(name, constraint, value)
+
+
+def _check_range(name: str, constraint: ArgumentConstraint, value: Any) -> None:
+    if _is_number(value):
+        low = high = value
+    elif _is_series(value) and len(value):
+        if hasattr(value, "min") and hasattr(value, "max"):
+            low, high = value.min(), value.max()
+        else:
+            low, high = min(value), max(value)
+    else:
+        return
+
+    if constraint.min_value is not None and low < constraint.min_value:
+        raise ConstraintViolation(f"Argument {name} has value {low} below {constraint.min_value}")
+    if constraint.max_value is not None and high > constraint.max_value:
+        raise ConstraintViolation(f"Argument {name} has value {high} above {constraint.max_value}")
@@ -0,0 +1,210 @@
+"""
+Canonical content hashes for KL bundles.
+
+`bundle_digest` hashes the psi, the result and the trace of a bundle
+without building a serialised copy: the structure is walked once and
+canonical JSON tokens (sorted keys, compact separators, `repr` floats)
+are fed to SHA-256 as they are produced. Volatile trace fields such as
+timestamps are skipped, so two executions of the same request hash
+equal exactly when they are observably the same.
+
+Compact numeric payloads (array, memoryview, NumPy) hash like the list
+they serialise to, so a bundle read back from a journal and a freshly
+executed one compare equal.
+
+Digests are stored in a compact binary index: a header followed by
+records of (uint16 id length, utf-8 request id, 32 byte digest).
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, Mapping, Tuple
+
+from .interning import SharedDescription
+
+# Trace entry fields that differ between otherwise identical executions.
+VOLATILE_TRACE_FIELDS: FrozenSet[str] = frozenset(
+    {
+        "timestamp",
+        "started_at",
+        "finished_at",
+        "duration",
+        "duration_ms",
+        "elapsed_ms",
+        # Measurements of the "accounting" stage.
+        "wall_ms",
+        "cpu_ms",
+        "alloc_bytes",
+        "peak_bytes",
+    }
+)
+
+# Fields that are volatile only in trace entries of the given stage.
+STAGE_VOLATILE_TRACE_FIELDS: Mapping[str, FrozenSet[str]] = {
+    # Decisions of the "backend" stage depend on measured latencies.
+    "backend": frozenset({"backend", "reason", "estimates_ms"}),
+}
+
+DIGEST_SIZE = 32
+INDEX_MAGIC = b"KLDIGEST1\n"
+
+# Elements per chunk when hashing buffer backed series.
+_SERIES_CHUNK = 4096
+
+
+def bundle_digest(
+    bundle: Mapping[str, Any],
+    volatile: FrozenSet[str] = VOLATILE_TRACE_FIELDS,
+    stage_volatile: Mapping[str, FrozenSet[str]] = STAGE_VOLATILE_TRACE_FIELDS,
+) -> bytes:
+    """
+    Return the SHA-256 digest of psi, result and trace of a bundle.
+
+    Trace fields in `volatile` are skipped in every entry, fields in
+    `stage_volatile[stage]` only in entries of that stage.
+    """
+    execution = bundle.get("execution", {})
+    trace = []
+    for entry in execution.get("trace", []):
+        skip = volatile | stage_volatile.get(entry.get("stage"), frozenset())
+        trace.append({name: value for name, value in entry.items() if name not in skip})
+
+    hasher = hashlib.sha256()
+    _feed(
+        hasher.update,
+        {"psi": bundle.get("psi"), "result": execution.get("result"), "trace": trace},
+    )
+    return hasher.digest()
+
+
+def _feed(update: Any, value: Any) -> None:
+    """
+    Feed the canonical JSON encoding of `value` to `update`.
+    """
+    if isinstance(value, str):
+        update(json.dumps(value).encode("utf-8"))
+    elif value is None or isinstance(value, bool):
+        update(b"null" if value is None else b"true" if value else b"false")
+    elif isinstance(value, (int, float)):
+        update(repr(value).encode("ascii"))
+    elif isinstance(value, SharedDescription) and value.canonical_json is not None:
+        # Interned psi descriptions carry their canonical encoding.
+        update(value.canonical_json)
+    elif isinstance(value, Mapping):
+        update(b"{")
+        for i, name in enumerate(sorted(value, key=str)):
+            if i:
+                update(b",")
+            update(json.dumps(str(name)).encode("utf-8"))
+            update(b":")
+            _feed(update, value[name])
+        update(b"}")
+    elif isinstance(value, (list, tuple)):
+        update(b"[")
+        for i, item in enumerate(value):
+            if i:
+                update(b",")
+            _feed(update, item)
+        update(b"]")
+    elif hasattr(value, "tolist") and hasattr(value, "__len__"):
+        # Buffer backed series: hash in slices instead of one big list.
+        update(b"[")
+        for start in range(0, len(value), _SERIES_CHUNK):
+            items = value[start:start + _SERIES_CHUNK].tolist()
+            if start:
+                update(b",")
+            update(",".join(map(repr, items)).encode("ascii"))
+        update(b"]")
+    elif hasattr(value, "tolist"):
+        _feed(update, value.tolist())
+    else:
+        raise TypeError(f"Cannot hash object of type {type(value).__name__}")
+
+
+class DigestIndexWriter:
+    """
+    Append (request id, digest) records to a digest index file.
+
+    Opening an existing index cuts off a truncated last record first, so
+    new records start at a record boundary.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("ab")
+        size = self._file.seek(0, os.SEEK_END)
+        end = _complete_index_size(self.path) if size else 0
+        if end < size:
+            self._file.truncate(end)
+        if end == 0:
+            self._file.write(INDEX_MAGIC)
+
+    def append(self, request_id: str, digest: bytes) -> None:
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"Expected a {DIGEST_SIZE} byte digest, got {len(digest)}")
+        raw_id = request_id.encode("utf-8")
+        self._file.write(struct.pack("<H", len(raw_id)) + raw_id + digest)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "DigestIndexWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _complete_index_size(path: Path) -> int:
+    """
+    Size of an index up to the end of its last complete record.
+
+    Returns 0 for a file with a truncated header. Raises ValueError for
+    a file that is not a digest index.
+    """
+    with path.open("rb") as fh:
+        magic = fh.read(len(INDEX_MAGIC))
+        if magic != INDEX_MAGIC:
+            if INDEX_MAGIC.startswith(magic):
+                return 0
+            raise ValueError(f"Not a digest index: {path}")
+        size = fh.seek(0, os.SEEK_END)
+        end = len(INDEX_MAGIC)
+        while end + 2 <= size:
+            fh.seek(end)
+            (id_len,) = struct.unpack("<H", fh.read(2))
+            record_end = end + 2 + id_len + DIGEST_SIZE
+            if record_end > size:
+                break
+            end = record_end
+        return end
+
+
+def iter_digest_index(path: str | Path) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (request id, digest) records from an index file.
+
+    A truncated last record (crash during a write) is ignored.
+    """
+    with Path(path).open("rb") as fh:
+        if fh.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            raise ValueError(f"Not a digest index: {path}")
+        while True:
+            prefix = fh.read(2)
+            if len(prefix) < 2:
+                return
+            (id_len,) = struct.unpack("<H", prefix)
+            record = fh.read(id_len + DIGEST_SIZE)
+            if len(record) < id_len + DIGEST_SIZE:
+                return
+            yield record[:id_len].decode("utf-8"), record[id_len:]
+
+
+def load_digest_index(path: str | Path) -> Dict[str, bytes]:
+    """
+    Load an index into memory. Later records for the same id win.
+    """
+    return dict(iter_digest_index(path))
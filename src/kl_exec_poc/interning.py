@@ -0,0 +1,208 @@
+"""
+Interned, immutable Psi definitions and execution policies.
+
+Operations that share a policy or a Psi definition share one object:
+`intern_policy` and `intern_psi` return the same instance for equal
+field values. Interned instances are sealed, so assigning an attribute
+raises AttributeError instead of silently changing every operation
+that uses the object. They compare equal to plain instances with the
+same field values.
+
+The serialised forms of an interned Psi are computed once:
+
+- `describe()` returns a shared, read only `SharedDescription` dict, so
+  the Kernel no longer builds a new psi dict for every bundle
+- `SharedDescription.canonical_json` holds the compact, key sorted JSON
+  encoding used by `hashing.bundle_digest`
+"""
+
+import json
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from kl_kernel_logic import EffectClass, ExecutionPolicy, OperationType, PsiDefinition
+
+
+class SharedDescription(dict):
+    """
+    Read only dict shared between bundles.
+
+    It is a real dict subclass, so `json.dumps` and dict consumers keep
+    working. Mutating methods raise TypeError.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.canonical_json: Optional[bytes]
+        try:
+            self.canonical_json = json.dumps(self, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except TypeError:
+            # Not plain JSON, hashing falls back to walking the dict.
+            self.canonical_json = None
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("Shared psi description is read only, copy it with dict(...) first")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (SharedDescription, (dict(self),))
+
+
+class _Sealed:
+    """
+    Mixin that rejects attribute assignment once `_seal` has been called.
+    """
+
+    _sealed = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._sealed:
+            raise AttributeError(f"Interned {type(self).__name__} is immutable (tried to set {name})")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if self._sealed:
+            raise AttributeError(f"Interned {type(self).__name__} is immutable (tried to delete {name})")
+        super().__delattr__(name)
+
+    def _seal(self) -> None:
+        object.__setattr__(self, "_sealed", True)
+
+
+class _ValueEquality:
+    """
+    Mixin that compares and hashes by the `_fields` of `_base`.
+
+    The dataclass `__eq__` of the base class requires the exact same
+    class, so an interned object would never equal a plain one.
+    """
+
+    _base: type = object
+    _fields: Tuple[str, ...] = ()
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, self._base):
+            return NotImplemented
+        return self._values() == tuple(getattr(other, name) for name in self._fields)
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+
+class InternedPolicy(_ValueEquality, _Sealed, ExecutionPolicy):
+    """
+    Sealed ExecutionPolicy returned by `intern_policy`.
+    """
+
+    _base = ExecutionPolicy
+    _fields = ("allow_network", "allow_filesystem", "timeout_seconds")
+
+
+class InternedPsi(_ValueEquality, _Sealed, PsiDefinition):
+    """
+    Sealed PsiDefinition returned by `intern_psi`, with a cached description.
+    """
+
+    _base = PsiDefinition
+    _fields = ("operation_type", "logical_binding", "effect_class", "constraints")
+    _description: Optional[SharedDescription] = None
+
+    def describe(self) -> Dict[str, Any]:
+        description = self._description
+        if description is None:
+            description = SharedDescription(super().describe())
+            object.__setattr__(self, "_description", description)
+        return description
+
+
+_lock = threading.Lock()
+_policies: Dict[Hashable, InternedPolicy] = {}
+_psis: Dict[Hashable, InternedPsi] = {}
+
+
+def intern_policy(
+    allow_network: bool = False,
+    allow_filesystem: bool = False,
+    timeout_seconds: int | None = None,
+) -> ExecutionPolicy:
+    """
+    Return the shared policy object for these settings.
+    """
+    key = (bool(allow_network), bool(allow_filesystem), timeout_seconds)
+    policy = _policies.get(key)
+    if policy is None:
+        with _lock:
+            policy = _policies.get(key)
+            if policy is None:
+                policy = InternedPolicy(
+                    allow_network=key[0],
+                    allow_filesystem=key[1],
+                    timeout_seconds=timeout_seconds,
+                )
+                policy._seal()
+                _policies[key] = policy
+    return policy
+
+
+def intern_psi(
+    logical_binding: str,
+    constraints: str | None = None,
+    operation_type: OperationType = OperationType.TRANSFORM,
+    effect_class: EffectClass = EffectClass.NON_STATE_CHANGING,
+) -> PsiDefinition:
+    """
+    Return the shared Psi definition for these fields.
+
+    The description is computed on creation, so the first request does
+    not pay for it either.
+    """
+    key = (operation_type, logical_binding, effect_class, constraints)
+    psi = _psis.get(key)
+    if psi is None:
+        with _lock:
+            psi = _psis.get(key)
+            if psi is None:
+                psi = InternedPsi(
+                    operation_type=operation_type,
+                    logical_binding=logical_binding,
+                    effect_class=effect_class,
+                    constraints=constraints,
+                )
+                psi.describe()
+                psi._seal()
+                _psis[key] = psi
+    return psi
+
+
+def share_psi_description(bundle: Dict[str, Any], psi: PsiDefinition) -> None:
+    """
+    Point `bundle["psi"]` at the shared description of an interned Psi.
+
+    Kernels that call `psi.describe()` already return the shared dict.
+    For kernels that build their own copy, an equal copy is replaced so
+    that it can be freed right away.
+    """
+    if not isinstance(psi, InternedPsi):
+        return
+    shared = psi.describe()
+    current = bundle.get("psi")
+    if current is not shared and current == shared:
+        bundle["psi"] = shared
+
+
+def interned_counts() -> Tuple[int, int]:
+    """
+    Number of distinct interned (policies, Psi definitions).
+    """
+    return len(_policies), len(_psis)
@@ -0,0 +1,677 @@
+"""
+Durable request journal for long running batch workloads.
+
+The journal is an append only JSON lines file with three record types:
+
+    {"type": "accepted",  "request_id": ..., "key": ..., "user_id": ..., "kwargs": {...}}
+    {"type": "completed", "request_id": ..., "bundle": {...}}
+    {"type": "failed",    "request_id": ..., "error": "..."}
+
+Writes are group committed: records are buffered and a background
+thread writes and fsyncs them in batches, either when `group_size`
+records are pending or after `group_interval_ms`. Callers that need a
+record to be durable before continuing pass `wait=True` and share the
+next fsync with every other waiting writer.
+
+After a crash, `recover_journal` reports which requests completed and
+which were accepted but never finished, so that `JournaledBatchRunner`
+can skip the former and replay the latter. `replay_journal` re-runs
+every completed request (for example against a new config) and reports
+results that differ from the recorded ones.
+
+For large journals, `verify_journal` compares content digests (see
+`hashing`) instead of full results and re-executes requests in parallel
+threads or worker processes, keeping only the digests in memory.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .binary_io import open_values_file
+from .config import build_registry_and_policies, load_config
+from .hashing import DigestIndexWriter, bundle_digest, load_digest_index
+from .orchestrator import Orchestrator
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serialise compact numeric values (array, memoryview, NumPy) as lists.
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@dataclass
+class JournalRequest:
+    """
+    A single request as recorded in the journal.
+
+    `values_file` references a binary series file (see `binary_io`)
+    that is memory mapped and passed as the `values` argument, so the
+    journal stores the reference instead of the data.
+    """
+
+    key: str
+    user_id: str
+    request_id: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    values_file: Optional[str] = None
+    values_dtype: str = "float64"
+
+    def to_record(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {
+            "type": "accepted",
+            "request_id": self.request_id,
+            "key": self.key,
+            "user_id": self.user_id,
+            "kwargs": self.kwargs,
+        }
+        if self.values_file is not None:
+            record["values_file"] = self.values_file
+            record["values_dtype"] = self.values_dtype
+        return record
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> "JournalRequest":
+        return cls(
+            key=str(record["key"]),
+            user_id=str(record["user_id"]),
+            request_id=str(record["request_id"]),
+            kwargs=dict(record.get("kwargs", {})),
+            values_file=record.get("values_file"),
+            values_dtype=str(record.get("values_dtype", "float64")),
+        )
+
+
+def _truncate_torn_tail(path: Path, chunk_size: int = 64 * 1024) -> None:
+    """
+    Cut a torn last line (crash during a write) off an existing journal.
+
+    Every record ends with a newline, so the file is truncated after the
+    last one. Without this, the next record would be appended to the
+    torn line and lost on recovery.
+    """
+    try:
+        fh = path.open("r+b")
+    except FileNotFoundError:
+        return
+    with fh:
+        size = fh.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            fh.seek(start)
+            newline = fh.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            fh.truncate(end)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+
+class RequestJournal:
+    """
+    Append only journal with group commit and fsync batching.
+
+    Opening an existing journal removes a torn last line first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        group_size: int = 64,
+        group_interval_ms: float = 10.0,
+        fsync: bool = True,
+    ) -> None:
+        if group_size < 1:
+            raise ValueError("group_size must be at least 1")
+
+        self.path = Path(path)
+        self.group_size = group_size
+        self.group_interval_ms = group_interval_ms
+        self.fsync = fsync
+
+        _truncate_torn_tail(self.path)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._cond = threading.Condition()
+        self._buffer: List[str] = []
+        self._seq = 0
+        self._durable_seq = 0
+        self._flush_requested = False
+        self._closed = False
+        self._error: BaseException | None = None
+        self.commits = 0
+
+        self._flusher = threading.Thread(target=self._run, name="kl-journal", daemon=True)
+        self._flusher.start()
+
+    def record_accepted(self, request: JournalRequest, wait: bool = False) -> None:
+        self._append(request.to_record(), wait)
+
+    def record_completed(self, request_id: str, bundle: Dict[str, Any], wait: bool = False) -> None:
+        self._append({"type": "completed", "request_id": request_id, "bundle": bundle}, wait)
+
+    def record_failed(self, request_id: str, error: str, wait: bool = False) -> None:
+        self._append({"type": "failed", "request_id": request_id, "error": error}, wait)
+
+    def flush(self) -> None:
+        """
+        Block until every record appended so far is durable.
+        """
+        with self._cond:
+            target = self._seq
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._wait_durable(target)
+
+    def close(self) -> None:
+        """
+        Flush pending records and stop the background writer.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "RequestJournal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _append(self, record: Dict[str, Any], wait: bool) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=json_default) + "\n"
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Journal is closed")
+            self._seq += 1
+            seq = self._seq
+            self._buffer.append(line)
+            if len(self._buffer) >= self.group_size:
+                self._cond.notify_all()
+            if wait:
+                self._flush_requested = True
+                self._cond.notify_all()
+                self._wait_durable(seq)
+
+    def _wait_durable(self, seq: int) -> None:
+        while self._durable_seq < seq:
+            if self._error is not None:
+                raise self._error
+            self._cond.wait()
+
+    def _run(self) -> None:
+        interval = self.group_interval_ms / 1000.0
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed
+                    or self._flush_requested
+                    or len(self._buffer) >= self.group_size,
+                    timeout=interval,
+                )
+                lines, self._buffer = self._buffer, []
+                upto = self._seq
+                self._flush_requested = False
+                closed = self._closed
+
+            if lines:
+                try:
+                    self._file.write("".join(lines))
+                    self._file.flush()
+                    if self.fsync:
+                        os.fsync(self._file.fileno())
+                except BaseException as exc:  # noqa: BLE001 - surfaced to writers
+                    with self._cond:
+                        self._error = exc
+                        self._cond.notify_all()
+                    return
+                self.commits += 1
+
+            with self._cond:
+                self._durable_seq = upto
+                self._cond.notify_all()
+
+            if closed and not lines:
+                return
+
+
+def read_journal(
+    path: str | Path,
+    types: Optional[Collection[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield journal records in order, optionally only those of `types`.
+
+    Records written by `RequestJournal` start with their type, so lines
+    of other types are skipped without parsing them (completed records
+    carry full bundles and dominate the file).
+
+    A torn last line (crash during a write) is ignored. Corruption in
+    the middle of the file raises ValueError.
+    """
+    prefixes = None
+    if types is not None:
+        prefixes = tuple(f'{{"type":"{name}",' for name in types)
+
+    with Path(path).open("r", encoding="utf-8") as fh:
+        pending_error: Optional[str] = None
+        for line_no, line in enumerate(fh, start=1):
+            if pending_error is not None:
+                raise ValueError(pending_error)
+            if not line.strip():
+                continue
+            if prefixes is not None and line.startswith('{"type":"') and not line.startswith(prefixes):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                pending_error = f"{path}:{line_no}: corrupt journal record"
+                continue
+            if types is None or record.get("type") in types:
+                yield record
+
+
+def read_batch_requests(path: str | Path) -> Iterator[JournalRequest]:
+    """
+    Parse a `batch` requests file lazily, one request per line.
+
+    Lines without a request_id get a stable one derived from the line
+    number, so reruns of an unchanged file are still deduplicated.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({exc.msg})") from exc
+            if not isinstance(item, dict) or "op" not in item:
+                raise ValueError(f"{path}:{line_no}: expected an object with an 'op' field")
+            yield JournalRequest(
+                key=str(item["op"]),
+                user_id=str(item.get("user_id", "cli-user")),
+                request_id=str(item.get("request_id", f"batch-{line_no}")),
+                kwargs=dict(item.get("kwargs", {})),
+                values_file=item.get("values_file"),
+                values_dtype=str(item.get("values_dtype", "float64")),
+            )
+
+
+@dataclass
+class JournalState:
+    """
+    Result of scanning a journal after a restart.
+    """
+
+    finished: set = field(default_factory=set)
+    pending: List[JournalRequest] = field(default_factory=list)
+
+
+def recover_journal(path: str | Path) -> JournalState:
+    """
+    Collect finished request ids and accepted-but-unfinished requests.
+    """
+    state = JournalState()
+    if not Path(path).exists():
+        return state
+
+    accepted: Dict[str, JournalRequest] = {}
+    for record in read_journal(path):
+        request_id = str(record.get("request_id"))
+        if record.get("type") == "accepted":
+            accepted[request_id] = JournalRequest.from_record(record)
+        elif record.get("type") in ("completed", "failed"):
+            state.finished.add(request_id)
+            accepted.pop(request_id, None)
+
+    state.pending = list(accepted.values())
+    return state
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one request executed by the batch runner.
+    """
+
+    request: JournalRequest
+    bundle: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+    replayed: bool = False
+
+
+class JournaledBatchRunner:
+    """
+    Executes a stream of requests through an orchestrator, recording
+    every accepted request and every outcome in a journal.
+
+    On start, the journal is recovered: requests that already finished
+    are skipped and requests that were accepted but never finished are
+    replayed first.
+
+    With `index_path`, the digest of every completed bundle is appended
+    to a digest index for later verification.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        policies: Mapping[str, Any],
+        journal_path: str | Path,
+        group_size: int = 64,
+        group_interval_ms: float = 10.0,
+        fsync: bool = True,
+        index_path: str | Path | None = None,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.policies = policies
+        self.journal_path = Path(journal_path)
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.group_size = group_size
+        self.group_interval_ms = group_interval_ms
+        self.fsync = fsync
+        self._index: Optional[DigestIndexWriter] = None
+        self.executed = 0
+        self.skipped = 0
+        self.replayed = 0
+        self.failed = 0
+
+    def run(self, requests: Iterable[JournalRequest]) -> Iterator[BatchResult]:
+        state = recover_journal(self.journal_path)
+        done = set(state.finished)
+
+        with ExitStack() as stack:
+            journal = stack.enter_context(
+                RequestJournal(
+                    self.journal_path,
+                    group_size=self.group_size,
+                    group_interval_ms=self.group_interval_ms,
+                    fsync=self.fsync,
+                )
+            )
+            self._index = (
+                stack.enter_context(DigestIndexWriter(self.index_path))
+                if self.index_path is not None
+                else None
+            )
+            for request in state.pending:
+                result = self._execute(journal, request, accept=False)
+                result.replayed = True
+                self.replayed += 1
+                done.add(request.request_id)
+                yield result
+
+            for request in requests:
+                if request.request_id in done:
+                    self.skipped += 1
+                    continue
+                done.add(request.request_id)
+                yield self._execute(journal, request, accept=True)
+
+    def _execute(
+        self,
+        journal: RequestJournal,
+        request: JournalRequest,
+        accept: bool,
+    ) -> BatchResult:
+        if accept:
+            journal.record_accepted(request)
+        try:
+            bundle = execute_journal_request(self.orchestrator, self.policies, request)
+        except Exception as exc:  # noqa: BLE001 - recorded as a terminal failure
+            error = f"{type(exc).__name__}: {exc}"
+            journal.record_failed(request.request_id, error)
+            self.failed += 1
+            return BatchResult(request=request, bundle=None, error=error)
+
+        journal.record_completed(request.request_id, bundle)
+        if self._index is not None:
+            self._index.append(request.request_id, bundle_digest(bundle))
+        self.executed += 1
+        return BatchResult(request=request, bundle=bundle)
+
+
+def execute_journal_request(
+    orchestrator: Orchestrator,
+    policies: Mapping[str, Any],
+    request: JournalRequest,
+) -> Dict[str, Any]:
+    """
+    Execute a journaled request, memory mapping its values file if any.
+    """
+    if request.key not in policies:
+        raise KeyError(f"Unknown operation key: {request.key}")
+
+    with ExitStack() as stack:
+        kwargs = dict(request.kwargs)
+        if request.values_file is not None:
+            values_file = stack.enter_context(
+                open_values_file(request.values_file, dtype=request.values_dtype)
+            )
+            kwargs["values"] = values_file.values
+        return orchestrator.execute_operation(
+            key=request.key,
+            user_id=request.user_id,
+            request_id=request.request_id,
+            policy=policies[request.key],
+            **kwargs,
+        )
+
+
+def replay_journal(
+    path: str | Path,
+    orchestrator: Orchestrator,
+    policies: Mapping[str, Any],
+) -> Dict[str, Any]:
+    """
+    Re-execute every completed request in a journal and compare results.
+
+    Only `execution.result` is compared, traces carry timestamps. The
+    journal is streamed, so memory use is bounded by the number of
+    requests that are in flight at any point of the recorded run.
+
+    Returns a report with the number of checked requests, mismatches
+    (request id, expected and actual result) and execution errors.
+    """
+    accepted: Dict[str, JournalRequest] = {}
+    report: Dict[str, Any] = {"checked": 0, "mismatches": [], "errors": []}
+
+    for record in read_journal(path):
+        request_id = str(record.get("request_id"))
+        kind = record.get("type")
+        if kind == "accepted":
+            accepted[request_id] = JournalRequest.from_record(record)
+            continue
+        request = accepted.pop(request_id, None)
+        if kind != "completed" or request is None:
+            continue
+
+        report["checked"] += 1
+        expected = record["bundle"]["execution"]["result"]
+        try:
+            bundle = execute_journal_request(orchestrator, policies, request)
+        except Exception as exc:  # noqa: BLE001 - reported, replay continues
+            report["errors"].append(
+                {"request_id": request_id, "error": f"{type(exc).__name__}: {exc}"}
+            )
+            continue
+
+        actual = bundle["execution"]["result"]
+        if _canonical(actual) != _canonical(expected):
+            report["mismatches"].append(
+                {"request_id": request_id, "expected": expected, "actual": actual}
+            )
+
+    return report
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=json_default)
+
+
+def journal_digests(path: str | Path) -> Dict[str, bytes]:
+    """
+    Compute bundle digests for every completed request in a journal.
+
+    Bundles are hashed one at a time, only the digests are kept.
+    """
+    return {
+        str(record["request_id"]): bundle_digest(record["bundle"])
+        for record in read_journal(path, types=("completed",))
+    }
+
+
+# Orchestrator and policies of a verification worker, see `_init_verifier`.
+_VERIFIER: Optional[Tuple[Orchestrator, Dict[str, Any]]] = None
+
+
+def _init_verifier(config_path: str) -> None:
+    global _VERIFIER
+    registry, policies = build_registry_and_policies(load_config(config_path))
+    _VERIFIER = (Orchestrator(registry=registry), policies)
+
+
+def _verify_chunk(records: List[Dict[str, Any]]) -> List[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Worker side: execute a chunk of accepted records and return
+    (request id, digest, error) for each.
+    """
+    assert _VERIFIER is not None, "verification worker not initialised"
+    orchestrator, policies = _VERIFIER
+    results: List[Tuple[str, Optional[bytes], Optional[str]]] = []
+    for record in records:
+        request = JournalRequest.from_record(record)
+        try:
+            bundle = execute_journal_request(orchestrator, policies, request)
+        except Exception as exc:  # noqa: BLE001 - reported, verification continues
+            results.append((request.request_id, None, f"{type(exc).__name__}: {exc}"))
+            continue
+        results.append((request.request_id, bundle_digest(bundle), None))
+    return results
+
+
+def verify_journal(
+    path: str | Path,
+    config_path: str | Path,
+    index_path: str | Path | None = None,
+    workers: int = 4,
+    processes: bool = False,
+    chunk_size: int = 64,
+    max_reported: int = 100,
+) -> Dict[str, Any]:
+    """
+    Re-execute journaled requests in parallel and compare bundle digests.
+
+    Expected digests come from `index_path` if given, otherwise they are
+    computed from the completed bundles in the journal. Requests are
+    streamed from the journal in chunks of `chunk_size`, with at most
+    `2 * workers` chunks in flight, so memory use is bounded by the
+    digest map rather than by the journal size.
+
+    Returns counts of checked, matched and mismatched requests and of
+    execution errors. At most `max_reported` mismatching request ids and
+    errors are listed.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    expected = load_digest_index(index_path) if index_path is not None else journal_digests(path)
+    report: Dict[str, Any] = {
+        "checked": 0,
+        "matched": 0,
+        "mismatched": 0,
+        "failed": 0,
+        "mismatches": [],
+        "errors": [],
+    }
+
+    def collect(results: List[Tuple[str, Optional[bytes], Optional[str]]]) -> None:
+        for request_id, digest, error in results:
+            report["checked"] += 1
+            if error is not None:
+                report["failed"] += 1
+                if len(report["errors"]) < max_reported:
+                    report["errors"].append({"request_id": request_id, "error": error})
+            elif digest == expected[request_id]:
+                report["matched"] += 1
+            else:
+                report["mismatched"] += 1
+                if len(report["mismatches"]) < max_reported:
+                    report["mismatches"].append(request_id)
+
+    executor: Executor
+    if processes:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_verifier,
+            initargs=(str(config_path),),
+        )
+    else:
+        _init_verifier(str(config_path))
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    seen: Set[str] = set()
+    with executor:
+        in_flight: Set[Future] = set()
+        for chunk in _chunks(_verifiable_records(path, expected, seen), chunk_size):
+            if len(in_flight) >= 2 * workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+            in_flight.add(executor.submit(_verify_chunk, chunk))
+        for future in in_flight:
+            collect(future.result())
+
+    report["unverified"] = len(expected) - len(seen)
+    return report
+
+
+def _verifiable_records(
+    path: str | Path,
+    expected: Mapping[str, bytes],
+    seen: Set[str],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield accepted records that have an expected digest, once per request.
+    """
+    for record in read_journal(path, types=("accepted",)):
+        request_id = str(record["request_id"])
+        if request_id in expected and request_id not in seen:
+            seen.add(request_id)
+            yield record
+
+
+def _chunks(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
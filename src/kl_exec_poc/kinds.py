@@ -0,0 +1,195 @@
+"""
+Operation kinds for the KL Execution PoC.
+
+A kind is what the "kind" of an operation (or route) in config refers
+to. It is described by a `KindSpec`: the task plus optional capabilities
+the loader and orchestrator use to pick the execution path:
+
+- batch: `batch_task` processes a list of `batch_param` values in one
+  call (used when the operation has a "batching" block)
+- streaming: `stream_task` yields partial results
+- async: `async_task` is a coroutine function. `execute_operation_async`
+  awaits it on the caller's event loop instead of blocking a thread on it.
+- vectorized: the task accepts `array.array` and `memoryview` inputs.
+  Other kinds get such arguments as lists.
+- adapter: `adapter_builder` binds the tasks to a pooled client for the
+  "adapter" block of an operation
+
+Kinds are resolved by name, in this order:
+
+1. built-in kinds and kinds added with `register_kind`
+2. "module:attr" references, for example "my_pkg.kinds:tokenize"
+3. entry points in the group "kl_exec_poc.operation_kinds"
+
+Resolution is lazy and cached: a plugin module is only imported when a
+config refers to it, and only once. The referenced object is either a
+`KindSpec` or a plain callable: a task without further capabilities,
+or a coroutine function for an async kind.
+"""
+
+import asyncio
+import importlib
+import inspect
+import threading
+from dataclasses import dataclass
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterator, Mapping, Optional
+
+from kl_kernel_logic.examples.text_simplify import simplify_text
+
+from .adapters.client_pool import AdapterTasks
+from .adapters.llm_stub import (
+    build_llm_stub_tasks,
+    llm_stub_generate,
+    llm_stub_generate_batch,
+    llm_stub_generate_stream,
+)
+from .ops.signals import smooth_series, smooth_series_chunked
+from .ops.text import simplify_bulk, simplify_bulk_chunks
+
+ENTRY_POINT_GROUP = "kl_exec_poc.operation_kinds"
+
+
+@dataclass(frozen=True)
+class KindSpec:
+    """
+    Task and capabilities of an operation kind.
+
+    At least one of `task` and `async_task` is required. A kind with only
+    `async_task` runs it with `asyncio.run` on the synchronous path.
+    """
+
+    task: Optional[Callable[..., Any]] = None
+    batch_task: Optional[Callable[..., Any]] = None
+    batch_param: Optional[str] = None
+    stream_task: Optional[Callable[..., Iterator[Any]]] = None
+    async_task: Optional[Callable[..., Awaitable[Any]]] = None
+    vectorized: bool = False
+    adapter_builder: Optional[Callable[[Mapping[str, Any]], AdapterTasks]] = None
+
+    def __post_init__(self) -> None:
+        if self.task is None:
+            if self.async_task is None:
+                raise ValueError("A KindSpec needs a task or an async_task")
+            object.__setattr__(self, "task", _run_coroutine(self.async_task))
+        if (self.batch_task is None) != (self.batch_param is None):
+            raise ValueError("batch_task and batch_param must be set together")
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        """
+        Names of the optional capabilities of this kind.
+        """
+        flags = {
+            "batch": self.batch_task is not None,
+            "streaming": self.stream_task is not None,
+            "async": self.async_task is not None,
+            "vectorized": self.vectorized,
+            "adapter": self.adapter_builder is not None,
+        }
+        return frozenset(name for name, enabled in flags.items() if enabled)
+
+
+def _run_coroutine(async_task: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+    def task(**kwargs: Any) -> Any:
+        return asyncio.run(async_task(**kwargs))
+
+    return task
+
+
+BUILTIN_KINDS: Dict[str, KindSpec] = {
+    "text_simplify": KindSpec(task=simplify_text),
+    "text_simplify_bulk": KindSpec(task=simplify_bulk, stream_task=simplify_bulk_chunks),
+    "signals_smooth": KindSpec(task=smooth_series, vectorized=True),
+    "signals_smooth_chunked": KindSpec(task=smooth_series_chunked, vectorized=True),
+    "llm_stub": KindSpec(
+        task=llm_stub_generate,
+        batch_task=llm_stub_generate_batch,
+        batch_param="prompt",
+        stream_task=llm_stub_generate_stream,
+        adapter_builder=build_llm_stub_tasks,
+    ),
+}
+
+_lock = threading.Lock()
+_kinds: Dict[str, KindSpec] = dict(BUILTIN_KINDS)
+_entry_points: Optional[Dict[str, EntryPoint]] = None
+
+
+def register_kind(name: str, spec: KindSpec | Callable[..., Any]) -> KindSpec:
+    """
+    Register a kind under `name` (a KindSpec or a plain task callable).
+    """
+    kind = _as_spec(name, spec)
+    with _lock:
+        if name in _kinds:
+            raise ValueError(f"Operation kind already registered: {name}")
+        _kinds[name] = kind
+    return kind
+
+
+def resolve_kind(name: str) -> KindSpec:
+    """
+    Return the KindSpec for a kind name, loading plugins on first use.
+
+    Raises KeyError for unknown kinds and for references that cannot be
+    imported.
+    """
+    kind = _kinds.get(name)
+    if kind is not None:
+        return kind
+
+    with _lock:
+        kind = _kinds.get(name)
+        if kind is None:
+            kind = _as_spec(name, _load(name))
+            _kinds[name] = kind
+    return kind
+
+
+def clear_kind_cache() -> None:
+    """
+    Forget loaded plugin kinds and the entry point listing.
+
+    Built-in kinds stay. Kinds added with `register_kind` are dropped.
+    """
+    global _entry_points
+    with _lock:
+        _kinds.clear()
+        _kinds.update(BUILTIN_KINDS)
+        _entry_points = None
+
+
+def _load(name: str) -> Any:
+    if ":" in name:
+        module_name, _, attr = name.partition(":")
+        try:
+            target: Any = importlib.import_module(module_name)
+            for part in attr.split("."):
+                target = getattr(target, part)
+        except (ImportError, AttributeError) as exc:
+            raise KeyError(f"Cannot load operation kind {name}: {exc}") from exc
+        return target
+
+    global _entry_points
+    if _entry_points is None:
+        # Reading the installed distributions' metadata is the slow part,
+        # so it happens once and only for names that are not built in.
+        _entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    entry_point = _entry_points.get(name)
+    if entry_point is None:
+        raise KeyError(f"Unknown operation kind: {name}")
+    try:
+        return entry_point.load()
+    except (ImportError, AttributeError) as exc:
+        raise KeyError(f"Cannot load operation kind {name}: {exc}") from exc
+
+
+def _as_spec(name: str, target: Any) -> KindSpec:
+    if isinstance(target, KindSpec):
+        return target
+    if inspect.iscoroutinefunction(target):
+        return KindSpec(async_task=target)
+    if callable(target):
+        return KindSpec(task=target)
+    raise KeyError(f"Operation kind {name} is neither a KindSpec nor callable: {target!r}")
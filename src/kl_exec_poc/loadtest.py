@@ -0,0 +1,510 @@
+"""
+Load generator for capacity tests.
+
+A load test sends requests from a workload to a target at open loop
+Poisson arrival rates, one stage per rate, and reports latency
+percentiles, throughput and the saturation point as JSON.
+
+Workloads:
+- `SyntheticWorkload`: a weighted mix of operations with text lengths
+  and series sizes drawn per request, and a skewed (Zipf like) user
+  distribution. Payloads are generated up front, so generation does not
+  slow down the dispatcher.
+- `RecordedWorkload`: requests from a journal or a `batch` requests
+  file, replayed in a loop.
+
+Targets:
+- `OrchestratorTarget`: an in-process Orchestrator on a thread pool,
+  with `KLBridge` or with `NullBridge` (no Kernel, fabric overhead only)
+- `PoolTarget`: a `WorkerPool` of warm worker processes
+
+Open loop means arrivals follow the schedule regardless of how many
+requests are still running. Latency is measured from the scheduled
+arrival time, so queueing delay in an overloaded target is included.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+from kl_kernel_logic import ExecutionPolicy
+
+from .binary_io import open_values_file
+from .journal import JournalRequest, read_batch_requests, read_journal
+from .orchestrator import Orchestrator
+from .worker_pool import WorkerPool
+
+# Latency percentiles in the report.
+PERCENTILES: Dict[str, float] = {"p50": 0.50, "p90": 0.90, "p99": 0.99, "p999": 0.999}
+
+_WORDS = (
+    "kernel", "policy", "trace", "signal", "Value", "ORDER", "alpha", "beta",
+    "Gamma", "delta", "request", "user", "stream", "batch", "Result", "data",
+)
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    """
+    A single request sent by the load generator.
+    """
+
+    key: str
+    user_id: str
+    request_id: str
+    kwargs: Dict[str, Any]
+
+
+class Workload(Protocol):
+    """
+    Source of requests. `index` counts the requests of a test run.
+    """
+
+    def request(self, index: int) -> LoadRequest:
+        ...
+
+
+class LoadTarget(Protocol):
+    """
+    System under test. `submit` must not block on the execution.
+    """
+
+    def submit(self, request: LoadRequest) -> "Future[Dict[str, Any]]":
+        ...
+
+
+@dataclass
+class OperationMix:
+    """
+    One operation of a synthetic workload.
+
+    - `weight`: relative share of requests
+    - `text_length` / `series_length`: (min, max) size of the generated
+      argument, drawn log uniformly per payload
+    - `argument`: name of the generated argument ("text" or "values"
+      by default)
+    - `kwargs`: fixed additional task arguments
+    """
+
+    key: str
+    weight: float = 1.0
+    text_length: Optional[Tuple[int, int]] = None
+    series_length: Optional[Tuple[int, int]] = None
+    argument: Optional[str] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.weight <= 0:
+            raise ValueError(f"Weight of {self.key} must be positive")
+        if self.text_length is not None and self.series_length is not None:
+            raise ValueError(f"Operation {self.key} sets both text_length and series_length")
+        for bounds in (self.text_length, self.series_length):
+            if bounds is not None and not 0 < bounds[0] <= bounds[1]:
+                raise ValueError(f"Invalid size range of {self.key}: {bounds}")
+
+
+class SyntheticWorkload:
+    """
+    Weighted operation mix with generated payloads and skewed users.
+
+    User i (1 based) is picked with probability proportional to
+    1 / i ** `user_skew`. `variants` payloads are generated per
+    operation and reused.
+    """
+
+    def __init__(
+        self,
+        operations: Sequence[OperationMix],
+        users: int = 100,
+        user_skew: float = 1.0,
+        variants: int = 64,
+        seed: int = 0,
+    ) -> None:
+        if not operations:
+            raise ValueError("A synthetic workload needs at least one operation")
+        if users < 1 or variants < 1:
+            raise ValueError("users and variants must be at least 1")
+
+        self.operations = list(operations)
+        self._random = random.Random(seed)
+        self._op_weights = _cumulative([op.weight for op in self.operations])
+        self._user_weights = _cumulative([1.0 / (rank ** user_skew) for rank in range(1, users + 1)])
+        self._payloads = [
+            [self._payload(op) for _ in range(variants)] for op in self.operations
+        ]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SyntheticWorkload":
+        """
+        Build a workload from its JSON form:
+
+        {"operations": [{"op": "text.simplify", "weight": 3, "text_length": [50, 5000]}, ...],
+         "users": 1000, "user_skew": 1.1, "variants": 64, "seed": 0}
+        """
+        try:
+            operations = [
+                OperationMix(
+                    key=str(item["op"]),
+                    weight=float(item.get("weight", 1.0)),
+                    text_length=_bounds(item.get("text_length")),
+                    series_length=_bounds(item.get("series_length")),
+                    argument=item.get("argument"),
+                    kwargs=dict(item.get("kwargs", {})),
+                )
+                for item in data["operations"]
+            ]
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid workload mix: {exc!r}") from exc
+        return cls(
+            operations,
+            users=int(data.get("users", 100)),
+            user_skew=float(data.get("user_skew", 1.0)),
+            variants=int(data.get("variants", 64)),
+            seed=int(data.get("seed", 0)),
+        )
+
+    def request(self, index: int) -> LoadRequest:
+        rng = self._random
+        op_index = _pick(self._op_weights, rng.random())
+        user = _pick(self._user_weights, rng.random()) + 1
+        payloads = self._payloads[op_index]
+        return LoadRequest(
+            key=self.operations[op_index].key,
+            user_id=f"user-{user}",
+            request_id=f"load-{index}",
+            kwargs=payloads[rng.randrange(len(payloads))],
+        )
+
+    def _payload(self, op: OperationMix) -> Dict[str, Any]:
+        kwargs = dict(op.kwargs)
+        if op.text_length is not None:
+            kwargs[op.argument or "text"] = self._text(self._size(op.text_length))
+        elif op.series_length is not None:
+            kwargs[op.argument or "values"] = [
+                round(self._random.gauss(0.0, 1.0), 6) for _ in range(self._size(op.series_length))
+            ]
+        return kwargs
+
+    def _size(self, bounds: Tuple[int, int]) -> int:
+        low, high = bounds
+        return int(round(math.exp(self._random.uniform(math.log(low), math.log(high)))))
+
+    def _text(self, length: int) -> str:
+        parts: List[str] = []
+        size = 0
+        while size < length:
+            word = self._random.choice(_WORDS) + " " * self._random.randint(1, 3)
+            parts.append(word)
+            size += len(word)
+        return "".join(parts)[:length]
+
+
+class RecordedWorkload:
+    """
+    Replays recorded requests in a loop, with fresh request ids.
+    """
+
+    def __init__(self, requests: Sequence[LoadRequest]) -> None:
+        if not requests:
+            raise ValueError("A recorded workload needs at least one request")
+        self.requests = list(requests)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "RecordedWorkload":
+        """
+        Load the accepted requests of a journal, or a `batch` requests file.
+
+        Values files are read into memory once.
+        """
+        path = Path(path)
+        with path.open("r", encoding="utf-8") as fh:
+            first = fh.readline()
+        try:
+            is_journal = "type" in json.loads(first)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}: not a journal or requests file ({exc.msg})") from exc
+
+        if is_journal:
+            recorded = [JournalRequest.from_record(r) for r in read_journal(path, types=("accepted",))]
+        else:
+            recorded = list(read_batch_requests(path))
+        return cls([_load_request(request) for request in recorded])
+
+    def request(self, index: int) -> LoadRequest:
+        recorded = self.requests[index % len(self.requests)]
+        return LoadRequest(
+            key=recorded.key,
+            user_id=recorded.user_id,
+            request_id=f"{recorded.request_id}-load-{index}",
+            kwargs=recorded.kwargs,
+        )
+
+
+class OrchestratorTarget:
+    """
+    In-process target: an Orchestrator executed on `concurrency` threads.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        policies: Mapping[str, ExecutionPolicy],
+        concurrency: int = 8,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.policies = policies
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="kl-load")
+
+    def submit(self, request: LoadRequest) -> "Future[Dict[str, Any]]":
+        return self._executor.submit(
+            self.orchestrator.execute_operation,
+            key=request.key,
+            user_id=request.user_id,
+            request_id=request.request_id,
+            policy=self.policies[request.key],
+            **request.kwargs,
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class PoolTarget:
+    """
+    Worker process target. The pool is started by the caller.
+    """
+
+    def __init__(self, pool: WorkerPool) -> None:
+        self.pool = pool
+
+    def submit(self, request: LoadRequest) -> "Future[Dict[str, Any]]":
+        return self.pool.submit(request.key, request.user_id, request.request_id, **request.kwargs)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+@dataclass
+class _StageState:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    last_done: float = 0.0
+    done: threading.Event = field(default_factory=threading.Event)
+    dispatching: bool = True
+
+
+def run_stage(
+    target: LoadTarget,
+    workload: Workload,
+    rate: float,
+    duration_s: float,
+    start_index: int = 0,
+    max_in_flight: int = 10_000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Send Poisson arrivals at `rate` per second for `duration_s` seconds
+    and wait for all of them to finish.
+
+    Arrivals that find `max_in_flight` requests outstanding are dropped
+    and counted, so an overloaded target cannot exhaust memory.
+    """
+    if rate <= 0 or duration_s <= 0:
+        raise ValueError("rate and duration must be positive")
+
+    rng = random.Random(seed)
+    state = _StageState()
+    sent = dropped = 0
+
+    def finished(future: "Future[Dict[str, Any]]", scheduled: float) -> None:
+        now = time.perf_counter()
+        failed = future.exception() is not None
+        with state.lock:
+            state.in_flight -= 1
+            state.last_done = max(state.last_done, now)
+            if failed:
+                state.errors += 1
+            else:
+                state.latencies_ms.append((now - scheduled) * 1000.0)
+            if not state.dispatching and state.in_flight == 0:
+                state.done.set()
+
+    started = time.perf_counter()
+    offset = rng.expovariate(rate)
+    while offset < duration_s:
+        scheduled = started + offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        with state.lock:
+            overloaded = state.in_flight >= max_in_flight
+            if not overloaded:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        if overloaded:
+            dropped += 1
+        else:
+            try:
+                future = target.submit(workload.request(start_index + sent))
+            except Exception:  # noqa: BLE001 - counted like a failed execution
+                future = Future()
+                future.set_exception(RuntimeError("Submission failed"))
+            future.add_done_callback(lambda f, s=scheduled: finished(f, s))
+            sent += 1
+        offset += rng.expovariate(rate)
+
+    with state.lock:
+        state.dispatching = False
+        if state.in_flight == 0:
+            state.done.set()
+    state.done.wait()
+
+    completed = len(state.latencies_ms)
+    elapsed = max(state.last_done - started, duration_s)
+    offered = (sent + dropped) / duration_s
+    return {
+        "rate": rate,
+        "offered_rps": round(offered, 3),
+        "sent": sent,
+        "completed": completed,
+        "errors": state.errors,
+        "dropped": dropped,
+        "throughput_rps": round((completed + state.errors) / elapsed, 3) if elapsed > 0 else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "max_in_flight": state.max_in_flight,
+        "latency_ms": latency_summary(state.latencies_ms),
+    }
+
+
+def latency_summary(latencies_ms: Sequence[float]) -> Dict[str, Optional[float]]:
+    """
+    Mean, max and nearest rank percentiles of a latency sample.
+    """
+    if not latencies_ms:
+        return {name: None for name in ("mean", *PERCENTILES, "max")}
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    summary: Dict[str, Optional[float]] = {"mean": round(sum(ordered) / count, 3)}
+    for name, quantile in PERCENTILES.items():
+        summary[name] = round(ordered[min(count - 1, max(0, math.ceil(quantile * count) - 1))], 3)
+    summary["max"] = round(ordered[-1], 3)
+    return summary
+
+
+def is_saturated(
+    stage: Mapping[str, Any],
+    slo_p99_ms: Optional[float] = None,
+    min_throughput_ratio: float = 0.9,
+) -> Optional[str]:
+    """
+    Return why a stage counts as saturated, or None.
+    """
+    if stage["dropped"]:
+        return "dropped"
+    if stage["throughput_rps"] < min_throughput_ratio * stage["offered_rps"]:
+        return "throughput"
+    p99 = stage["latency_ms"]["p99"]
+    if slo_p99_ms is not None and p99 is not None and p99 > slo_p99_ms:
+        return "latency"
+    return None
+
+
+def run_load_test(
+    target: LoadTarget,
+    workload: Workload,
+    rates: Sequence[float],
+    duration_s: float = 10.0,
+    slo_p99_ms: Optional[float] = None,
+    max_in_flight: int = 10_000,
+    stop_at_saturation: bool = True,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Run one stage per rate (in the given order) and report the results.
+
+    A stage is saturated if requests were dropped, if the achieved
+    throughput stays below 90% of the offered rate, or if p99 latency
+    exceeds `slo_p99_ms`. The report names the first saturated rate
+    and the highest rate sustained before it.
+    """
+    stages: List[Dict[str, Any]] = []
+    saturation: Dict[str, Any] = {"saturated": False, "rate": None, "reason": None, "max_sustained_rps": None}
+    index = 0
+    for number, rate in enumerate(rates):
+        stage = run_stage(
+            target,
+            workload,
+            rate,
+            duration_s,
+            start_index=index,
+            max_in_flight=max_in_flight,
+            seed=seed + number,
+        )
+        index += stage["sent"]
+        reason = is_saturated(stage, slo_p99_ms)
+        stage["saturated"] = reason is not None
+        stages.append(stage)
+
+        if reason is None:
+            if not saturation["saturated"]:
+                saturation["max_sustained_rps"] = stage["throughput_rps"]
+        elif not saturation["saturated"]:
+            saturation.update(saturated=True, rate=rate, reason=reason)
+            if stop_at_saturation:
+                break
+
+    return {
+        "duration_s": duration_s,
+        "slo_p99_ms": slo_p99_ms,
+        "stages": stages,
+        "saturation": saturation,
+    }
+
+
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    total = 0.0
+    cumulative: List[float] = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return [value / total for value in cumulative]
+
+
+def _pick(cumulative: Sequence[float], point: float) -> int:
+    low, high = 0, len(cumulative) - 1
+    while low < high:
+        middle = (low + high) // 2
+        if cumulative[middle] <= point:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _bounds(raw: Any) -> Optional[Tuple[int, int]]:
+    if raw is None:
+        return None
+    low, high = raw
+    return int(low), int(high)
+
+
+def _load_request(request: JournalRequest) -> LoadRequest:
+    kwargs = dict(request.kwargs)
+    if request.values_file is not None:
+        with open_values_file(request.values_file, dtype=request.values_dtype) as values_file:
+            view = values_file.values
+            values = array(view.format.lstrip("<=@"))
+            values.frombytes(view.cast("B"))
+            kwargs["values"] = values
+    return LoadRequest(key=request.key, user_id=request.user_id, request_id=request.request_id, kwargs=kwargs)
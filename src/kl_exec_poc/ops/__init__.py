@@ -0,0 +1,18 @@
+"""
+Operation implementations that live in the PoC itself.
+
+The KL Kernel Logic foundations provide the reference tasks. The
+variants here keep the same results but avoid unnecessary copies for
+large payloads.
+"""
+
+from .signals import smooth_series, smooth_series_chunked
+from .text import simplify_bulk, simplify_bulk_chunks, simplify_documents
+
+__all__ = [
+    "smooth_series",
+    "smooth_series_chunked",
+    "simplify_bulk",
+    "simplify_bulk_chunks",
+    "simplify_documents",
+]
@@ -0,0 +1,184 @@
+"""
+Numeric smoothing on compact float buffers.
+
+`smooth_series` is a drop in task for the `signals_smooth` kind:
+
+- plain Python sequences go through the foundations reference
+  implementation (`smooth_measurements`) unchanged
+- `array.array`, `memoryview` and NumPy arrays of float64 / float32 are
+  read through the buffer protocol without building a list, and the
+  result is returned in the same compact form
+
+The buffer path computes the same three point moving average as the
+reference. Interior points are summed left to right, so results match
+the reference up to floating point summation order.
+"""
+
+import sys
+from array import array
+from typing import Any
+
+from kl_kernel_logic.examples_foundations import smooth_measurements
+
+# Mirrors the limit enforced by the foundations reference implementation.
+MAX_SERIES_LENGTH = 10_000
+
+# Interior points are computed in chunks of this many items, which bounds
+# the size of temporary Python objects for very long series.
+SMOOTH_CHUNK_SIZE = 65_536
+
+# Buffer formats accepted by the compact path, mapped to the native
+# typecode. Explicit little endian formats only match native order on
+# little endian hosts.
+_FLOAT_FORMATS = {"d": "d", "=d": "d", "f": "f", "=f": "f"}
+if sys.byteorder == "little":
+    _FLOAT_FORMATS.update({"<d": "d", "<f": "f"})
+
+
+def is_numpy_array(values: Any) -> bool:
+    """
+    Detect a NumPy array without importing NumPy.
+    """
+    return type(values).__module__ == "numpy" and hasattr(values, "__array_interface__")
+
+
+def as_float_view(values: Any) -> memoryview:
+    """
+    Return a flat, read only float memoryview over a buffer object.
+
+    Raises TypeError for objects without a 1D float64 / float32 buffer.
+    """
+    try:
+        view = memoryview(values)
+    except TypeError as exc:
+        raise TypeError(f"Expected a float buffer, got {type(values).__name__}") from exc
+
+    typecode = _FLOAT_FORMATS.get(view.format)
+    if typecode is None:
+        raise TypeError(f"Unsupported buffer format for smoothing: {view.format!r}")
+    if view.ndim != 1:
+        raise TypeError("Smoothing expects a one dimensional series")
+    if not view.c_contiguous:
+        raise TypeError("Smoothing expects a contiguous buffer")
+
+    if view.format != typecode:
+        view = view.cast("B").cast(typecode)
+    return view.toreadonly()
+
+
+def smooth_view(view: memoryview, chunk_size: int = SMOOTH_CHUNK_SIZE) -> array:
+    """
+    Three point moving average over a float memoryview.
+
+    The result is an `array.array` with the same typecode as the view.
+    Edges use the available values without padding.
+    """
+    n = len(view)
+    out = array(view.format)
+    if n == 0:
+        return out
+    if n == 1:
+        out.append(view[0])
+        return out
+
+    out.append((view[0] + view[1]) / 2.0)
+    for start in range(1, n - 1, chunk_size):
+        stop = min(start + chunk_size, n - 1)
+        out.extend(
+            [
+                (a + b + c) / 3.0
+                for a, b, c in zip(
+                    view[start - 1:stop - 1],
+                    view[start:stop],
+                    view[start + 1:stop + 1],
+                )
+            ]
+        )
+    out.append((view[n - 2] + view[n - 1]) / 2.0)
+    return out
+
+
+def smooth_series(values: Any) -> Any:
+    """
+    Task for the `signals_smooth` kind.
+
+    Returns a list for list input, an `array.array` for array input,
+    a memoryview for memoryview input and a NumPy array for NumPy input.
+    """
+    if is_numpy_array(values):
+        _check_length(len(values))
+        return _smooth_numpy(values)
+
+    if isinstance(values, (array, memoryview)):
+        view = as_float_view(values)
+        _check_length(len(view))
+        return restore_form(values, smooth_view(view))
+
+    return smooth_measurements(values)
+
+
+def smooth_series_chunked(values: Any) -> Any:
+    """
+    Task for the `signals_smooth_chunked` kind.
+
+    Same moving average as `smooth_series` without the length limit,
+    intended for routed oversized inputs. Lists are packed into a
+    float64 array once and processed in chunks, NumPy input is
+    vectorised. The result keeps the input form.
+    """
+    if is_numpy_array(values):
+        return _smooth_numpy(values)
+
+    if isinstance(values, (array, memoryview)):
+        return restore_form(values, smooth_view(as_float_view(values)))
+
+    return smooth_view(memoryview(array("d", values))).tolist()
+
+
+def restore_form(values: Any, result: array) -> Any:
+    """
+    Return `result` in the same compact form as the original input.
+
+    NumPy results wrap the array buffer without copying it. Plain
+    sequences get a list back.
+    """
+    if isinstance(values, array):
+        return result
+    if isinstance(values, memoryview):
+        return memoryview(result)
+    if is_numpy_array(values):
+        import numpy as np
+
+        return np.frombuffer(result, dtype=values.dtype)
+    return result.tolist()
+
+
+def _check_length(length: int) -> None:
+    if length > MAX_SERIES_LENGTH:
+        raise ValueError(f"Series length must be <= {MAX_SERIES_LENGTH:_}")
+
+
+def _smooth_numpy(values: Any) -> Any:
+    """
+    Vectorised moving average for NumPy input.
+
+    NumPy is only imported when a NumPy array is actually passed in.
+    The sum is computed in float64 and cast back to the input dtype.
+    """
+    import numpy as np
+
+    if values.ndim != 1:
+        raise TypeError("Smoothing expects a one dimensional series")
+    if values.dtype not in (np.float64, np.float32):
+        raise TypeError(f"Unsupported dtype for smoothing: {values.dtype}")
+
+    n = values.shape[0]
+    src = values.astype(np.float64, copy=False)
+    out = np.empty(n, dtype=np.float64)
+    if n == 1:
+        out[0] = src[0]
+    elif n > 1:
+        out[0] = (src[0] + src[1]) / 2.0
+        out[1:-1] = (src[:-2] + src[1:-1] + src[2:]) / 3.0
+        out[-1] = (src[-2] + src[-1]) / 2.0
+    return out.astype(values.dtype, copy=False)
@@ -6,23 +6,76 @@ The orchestrator connects:
 - the KLBridge (how it is executed through the Kernel)
 """
 
-from typing import Any, Dict
+import asyncio
+import time
+from array import array
+from typing import Any, Awaitable, Callable, Dict, List
 
-from kl_kernel_logic import ExecutionPolicy
+from kl_kernel_logic import ExecutionPolicy, EffectClass
 
+from .accounting import UsageLedger, UsageMeter
+from .adaptive import BackendChoice, backend_trace_entry
 from .adapters.kl_bridge import KLBridge
+from .coalescing import SingleFlight, build_flight_key
+from .constraints import check_arguments, select_route
+from .interning import share_psi_description
 from .registry import OperationRegistry, OperationMetadata
+from .streaming import StreamingExecution
+from .trace_store import TraceStore
+from .tracing import apply_trace_policy, failure_bundle, insert_trace_entry, is_error_bundle
 
 
 class Orchestrator:
     """
     Minimal orchestrator that looks up an operation in the registry,
     builds a KL context and executes through the KL bridge.
+
+    With `coalesce=True`, concurrent identical calls (same key and kwargs)
+    to NON_STATE_CHANGING operations share a single task invocation.
+
+    Arguments are checked against the operation constraints before
+    dispatch. Oversized inputs are sent to the matching route, and the
+    decision is recorded as a "route" stage in the trace. Otherwise,
+    operations with several backends run the one that is currently
+    fastest for the input size, recorded as a "backend" stage.
+
+    Operations with a trace policy get their trace sampled or reduced
+    before the bundle is returned or written anywhere. With a
+    `trace_store`, the retained trace of every execution is also
+    written to the store together with the measured duration. A task
+    that raises is traced as a failed execution (see `failure_bundle`)
+    before the error propagates to the caller.
+
+    Operations with an accounting level other than "off" get the
+    resources of their task recorded as an "accounting" stage and summed
+    per user and operation in `ledger` (a private ledger by default),
+    including executions whose task raised.
+
+    Tasks of kinds that are not vectorized get `array` and `memoryview`
+    arguments as lists. `execute_operation_async` awaits the async task
+    of async capable kinds on the caller's event loop.
     """
 
-    def __init__(self, registry: OperationRegistry, bridge: KLBridge | None = None) -> None:
+    def __init__(
+        self,
+        registry: OperationRegistry,
+        bridge: KLBridge | None = None,
+        coalesce: bool = False,
+        trace_store: TraceStore | None = None,
+        ledger: UsageLedger | None = None,
+    ) -> None:
         self.registry = registry
         self.bridge = bridge or KLBridge()
+        self.trace_store = trace_store
+        self.ledger = ledger if ledger is not None else UsageLedger()
+        self._flight: SingleFlight | None = SingleFlight() if coalesce else None
+
+    @property
+    def coalesced_count(self) -> int:
+        """
+        Number of executions that reused the result of an in-flight duplicate.
+        """
+        return self._flight.coalesced if self._flight is not None else 0
 
     def execute_operation(
         self,
@@ -35,6 +88,224 @@ class Orchestrator:
         """
         Execute a registered operation using the KL Kernel through the bridge.
         """
+        return self._execute(key, user_id, request_id, policy, kwargs)
+
+    async def execute_operation_async(
+        self,
+        key: str,
+        user_id: str,
+        request_id: str,
+        policy: ExecutionPolicy,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Execute a registered operation without blocking the event loop.
+
+        The Kernel runs in a worker thread. If the operation has an
+        `async_task`, that coroutine runs on the calling event loop and
+        the worker thread only waits for it.
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.to_thread(self._execute, key, user_id, request_id, policy, kwargs, loop)
+
+    def _execute(
+        self,
+        key: str,
+        user_id: str,
+        request_id: str,
+        policy: ExecutionPolicy,
+        kwargs: Dict[str, Any],
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Dict[str, Any]:
+        meta: OperationMetadata = self.registry.get(key)
+
+        route = select_route(meta.routes, kwargs) if meta.routes else None
+        if meta.constraints:
+            check_arguments(
+                meta.constraints,
+                kwargs,
+                skip_length=route.field if route is not None else None,
+            )
+        choice: BackendChoice | None = None
+        if route is not None:
+            task, vectorized = route.task, route.vectorized
+        elif meta.backends is not None:
+            choice = meta.backends.choose(kwargs)
+            task, vectorized = meta.backends.timed_task(choice), choice.backend.vectorized
+        elif loop is not None and meta.async_task is not None:
+            task, vectorized = _on_loop(meta.async_task, loop), meta.vectorized
+        else:
+            task, vectorized = meta.task, meta.vectorized
+        if not vectorized:
+            kwargs = _buffers_as_lists(kwargs)
+
+        stages: List[Dict[str, Any]] = []
+        if route is not None:
+            stages.append(
+                {
+                    "stage": "route",
+                    "user_id": user_id,
+                    "request_id": request_id,
+                    "kind": route.kind,
+                    "field": route.field,
+                    "length": len(kwargs[route.field]),
+                }
+            )
+        if choice is not None:
+            stages.append(backend_trace_entry(choice, user_id, request_id))
+
+        ctx = self.bridge.build_ctx(user_id=user_id, request_id=request_id, policy=policy)
+        task = self._coalesced_task(key, meta, task, kwargs)
+        meter = UsageMeter(meta.accounting)
+        task = meter.wrap(task)
+        started = time.perf_counter()
+        try:
+            bundle = self.bridge.execute(psi=meta.psi, ctx=ctx, task=task, **kwargs)
+        except Exception as exc:
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            bundle = failure_bundle(meta.psi, user_id, request_id, exc, duration_ms)
+            self._finish(key, meta, user_id, request_id, bundle, duration_ms, stages, meter)
+            raise
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        self._finish(key, meta, user_id, request_id, bundle, duration_ms, stages, meter)
+        return bundle
+
+    def execute_operation_stream(
+        self,
+        key: str,
+        user_id: str,
+        request_id: str,
+        policy: ExecutionPolicy,
+        **kwargs: Any,
+    ) -> StreamingExecution:
+        """
+        Execute a streaming capable operation and return a handle that
+        yields partial chunks while the Kernel is still running.
+
+        The final bundle (with the combined result and the full trace)
+        is available as `handle.bundle` once the stream is exhausted.
+        """
         meta: OperationMetadata = self.registry.get(key)
+        if meta.stream_task is None:
+            raise ValueError(f"Operation does not support streaming: {key}")
+        if meta.constraints:
+            check_arguments(meta.constraints, kwargs)
+        if not meta.vectorized:
+            kwargs = _buffers_as_lists(kwargs)
+
         ctx = self.bridge.build_ctx(user_id=user_id, request_id=request_id, policy=policy)
-        return self.bridge.execute(psi=meta.psi, ctx=ctx, task=meta.task, **kwargs)
+
+        def run(task: Any) -> Dict[str, Any]:
+            meter = UsageMeter(meta.accounting)
+            started = time.perf_counter()
+            try:
+                bundle = self.bridge.execute(psi=meta.psi, ctx=ctx, task=meter.wrap(task), **kwargs)
+            except Exception as exc:
+                duration_ms = (time.perf_counter() - started) * 1000.0
+                bundle = failure_bundle(meta.psi, user_id, request_id, exc, duration_ms)
+                self._finish(key, meta, user_id, request_id, bundle, duration_ms, [], meter)
+                raise
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            self._finish(key, meta, user_id, request_id, bundle, duration_ms, [], meter)
+            return bundle
+
+        return StreamingExecution(run=run, stream_task=meta.stream_task)
+
+    def _finish(
+        self,
+        key: str,
+        meta: OperationMetadata,
+        user_id: str,
+        request_id: str,
+        bundle: Dict[str, Any],
+        duration_ms: float,
+        stages: List[Dict[str, Any]],
+        meter: UsageMeter,
+    ) -> None:
+        """
+        Add the orchestrator stages to a bundle, apply the trace policy
+        and write the trace to the store.
+        """
+        share_psi_description(bundle, meta.psi)
+        for entry in stages:
+            insert_trace_entry(bundle, entry)
+        self._account(key, user_id, request_id, meter, bundle)
+        if meta.tracing is not None:
+            apply_trace_policy(bundle, meta.tracing, request_id, duration_ms)
+        if self.trace_store is not None:
+            self.trace_store.record(
+                key, bundle, duration_ms=duration_ms, user_id=user_id, request_id=request_id
+            )
+
+    def _account(
+        self,
+        key: str,
+        user_id: str,
+        request_id: str,
+        meter: UsageMeter,
+        bundle: Dict[str, Any],
+    ) -> None:
+        """
+        Record the measured usage in the trace and the ledger.
+
+        Failed executions are recorded as well and counted as failures.
+        """
+        usage = meter.usage
+        if usage is None:
+            return
+        insert_trace_entry(bundle, usage.trace_entry(user_id, request_id))
+        self.ledger.record(user_id, key, usage, failed=is_error_bundle(bundle))
+
+    def _coalesced_task(
+        self,
+        key: str,
+        meta: OperationMetadata,
+        task: Any,
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """
+        Wrap the task in the single flight group if coalescing applies.
+
+        Only deterministic NON_STATE_CHANGING operations are coalesced.
+        Calls with unhashable kwargs fall back to the plain task.
+        """
+        if self._flight is None or meta.psi.effect_class != EffectClass.NON_STATE_CHANGING:
+            return task
+
+        flight_key = build_flight_key(key, kwargs)
+        if flight_key is None:
+            return task
+
+        flight = self._flight
+
+        def coalesced(**task_kwargs: Any) -> Any:
+            return flight.do(flight_key, lambda: task(**task_kwargs))
+
+        return coalesced
+
+
+def _buffers_as_lists(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert `array` and `memoryview` arguments to lists for tasks that
+    are not vectorized.
+    """
+    if not any(isinstance(value, (array, memoryview)) for value in kwargs.values()):
+        return kwargs
+    return {
+        name: value.tolist() if isinstance(value, (array, memoryview)) else value
+        for name, value in kwargs.items()
+    }
+
+
+def _on_loop(
+    async_task: Callable[..., Awaitable[Any]],
+    loop: asyncio.AbstractEventLoop,
+) -> Callable[..., Any]:
+    """
+    Synchronous task that runs `async_task` on `loop` and waits for it.
+    """
+
+    def task(**kwargs: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(async_task(**kwargs), loop).result()
+
+    return task
@@ -4,20 +4,57 @@ Operation registry for the KL Execution PoC.
 The registry maps operation keys to Psi definitions and callable tasks.
 """
 
-from dataclasses import dataclass
-from typing import Any, Callable, Dict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
 
 from kl_kernel_logic import PsiDefinition
 
+from .adapters.batching import MicroBatcher
+from .adaptive import BackendSelector
+from .constraints import ArgumentConstraint, OperationRoute
+from .tracing import TracePolicy
+
 
 @dataclass
 class OperationMetadata:
     """
     Holds the Psi definition and the callable task for a single operation.
+
+    `stream_task` is optional. If set, it takes the same arguments as
+    `task` and yields partial results instead of returning the full one.
+
+    `constraints` are checked before dispatch. `routes` send oversized
+    inputs to a scalable variant of the task.
+
+    `async_task` is an optional coroutine function with the same
+    arguments, awaited by `Orchestrator.execute_operation_async`.
+    `vectorized` tasks get `array` and `memoryview` arguments as they
+    are; other tasks get them as lists.
+
+    `tracing` bounds the retained trace (sampling and trace level).
+    Without it, every bundle carries the full trace.
+
+    `backends` chooses between several implementations by observed
+    latency (see `adaptive.py`). It replaces `task` when no route applies.
+
+    `accounting` is the resource accounting level of the task ("off",
+    "basic" or "memory", see `accounting.py`).
+
+    `batcher` is the micro batcher behind a batched `task`. It is closed
+    by `OperationRegistry.close`.
     """
 
     psi: PsiDefinition
     task: Callable[..., Any]
+    stream_task: Optional[Callable[..., Iterator[Any]]] = None
+    async_task: Optional[Callable[..., Awaitable[Any]]] = None
+    vectorized: bool = False
+    constraints: Dict[str, ArgumentConstraint] = field(default_factory=dict)
+    routes: List[OperationRoute] = field(default_factory=list)
+    tracing: Optional[TracePolicy] = None
+    accounting: str = "off"
+    backends: Optional[BackendSelector] = None
+    batcher: Optional[MicroBatcher] = None
 
 
 class OperationRegistry:
@@ -50,3 +87,14 @@ class OperationRegistry:
         Return a list of all registered operation keys.
         """
         return list(self._operations.keys())
+
+    def close(self) -> None:
+        """
+        Stop the background threads of the registered operations.
+
+        Micro batchers serve their queued items first. Batched tasks
+        raise RuntimeError afterwards.
+        """
+        for meta in self._operations.values():
+            if meta.batcher is not None:
+                meta.batcher.close()
@@ -0,0 +1,157 @@
+"""
+Shared memory transport for numeric series.
+
+When smoothing work is sent to a worker process, the series is written
+once into a `multiprocessing.shared_memory` block and only a small
+handle (`SharedSeries`) is pickled. The worker attaches to the block,
+reads the input through a memoryview and writes its result into a
+second block owned by the caller.
+"""
+
+from array import array
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Iterator
+
+from .ops.signals import as_float_view, restore_form, smooth_view
+
+
+@dataclass(frozen=True)
+class SharedSeries:
+    """
+    Picklable handle to a float series stored in shared memory.
+    """
+
+    name: str
+    length: int
+    typecode: str
+
+    @property
+    def nbytes(self) -> int:
+        return self.length * array(self.typecode).itemsize
+
+
+class SharedSeriesBuffer:
+    """
+    Owner of a shared memory block holding a float series.
+
+    The owner creates and unlinks the block. Workers only attach to it
+    through `attach_series(handle)`.
+    """
+
+    def __init__(self, length: int, typecode: str = "d") -> None:
+        itemsize = array(typecode).itemsize
+        # Zero sized blocks are not allowed, keep at least one item.
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, length) * itemsize)
+        self.handle = SharedSeries(name=self._shm.name, length=length, typecode=typecode)
+
+    @classmethod
+    def from_values(cls, values: Any) -> "SharedSeriesBuffer":
+        """
+        Copy a series into a new shared block with a single buffer copy.
+
+        Plain Python sequences are packed as float64 first.
+        """
+        if not isinstance(values, (array, memoryview)) and not hasattr(values, "__array_interface__"):
+            values = array("d", values)
+        source = as_float_view(values)
+        buffer = cls(len(source), source.format)
+        with buffer.view() as target:
+            target[:] = source
+        return buffer
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """
+        Writable float memoryview over the block.
+        """
+        with _cast_view(self._shm, self.handle) as view:
+            yield view
+
+    def to_array(self) -> array:
+        """
+        Copy the block contents into an `array.array`.
+        """
+        result = array(self.handle.typecode)
+        raw = self._shm.buf[: self.handle.nbytes]
+        try:
+            result.frombytes(raw)
+        finally:
+            raw.release()
+        return result
+
+    def close(self) -> None:
+        """
+        Release and unlink the shared block.
+        """
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedSeriesBuffer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+@contextmanager
+def attach_series(handle: SharedSeries) -> Iterator[memoryview]:
+    """
+    Attach to a shared series from another process.
+
+    The block is closed on exit but not unlinked, the owner does that.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=handle.name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Python < 3.13 has no track flag. Workers share the resource
+        # tracker of their parent, so attaching is still safe.
+        shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        with _cast_view(shm, handle) as view:
+            yield view
+    finally:
+        shm.close()
+
+
+@contextmanager
+def _cast_view(shm: shared_memory.SharedMemory, handle: SharedSeries) -> Iterator[memoryview]:
+    raw = shm.buf[: handle.nbytes]
+    view = raw.cast(handle.typecode)
+    try:
+        yield view
+    finally:
+        # Views must be released before the block can be closed.
+        view.release()
+        raw.release()
+
+
+def smooth_shared(source: SharedSeries, target: SharedSeries) -> SharedSeries:
+    """
+    Worker side: smooth `source` into `target`, both in shared memory.
+
+    Only the two handles cross the process boundary.
+    """
+    if source.length != target.length or source.typecode != target.typecode:
+        raise ValueError("Shared source and target series must have the same shape")
+    with attach_series(source) as src, attach_series(target) as dst:
+        result = smooth_view(src)
+        dst[:] = memoryview(result)
+    return target
+
+
+def smooth_in_process(executor: Executor, values: Any) -> Any:
+    """
+    Smooth a series in a worker process, passing payloads through
+    shared memory instead of pickling them.
+
+    The result is returned in the same compact form as the input.
+    """
+    with SharedSeriesBuffer.from_values(values) as source:
+        handle = source.handle
+        with SharedSeriesBuffer(handle.length, handle.typecode) as target:
+            executor.submit(smooth_shared, handle, target.handle).result()
+            result = target.to_array()
+    return restore_form(values, result)
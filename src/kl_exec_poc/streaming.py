@@ -0,0 +1,90 @@
+"""
+Streaming execution for the KL Execution PoC.
+
+A streaming execution runs the operation through the Kernel on a
+background thread. The task consumes the operation's stream task and
+forwards every chunk to the caller as soon as it is produced. When the
+stream ends, the task returns the combined result, so the Kernel emits
+the usual final bundle and trace.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List
+
+# Marks the end of the chunk stream.
+_DONE = object()
+
+
+def combine_chunks(chunks: List[Any]) -> Any:
+    """
+    Combine streamed chunks into the final result.
+
+    Text chunks are concatenated and list chunks (partial result lists)
+    are flattened into one list. Anything else is returned as a list of
+    chunks. An empty stream is treated as empty text.
+    """
+    if all(isinstance(chunk, str) for chunk in chunks):
+        return "".join(chunks)
+    if all(isinstance(chunk, list) for chunk in chunks):
+        return [item for chunk in chunks for item in chunk]
+    return list(chunks)
+
+
+class StreamingExecution:
+    """
+    Handle for a running streaming execution.
+
+    Iterating yields chunks while the operation is still running.
+    After the iteration is exhausted, `bundle` holds the final KL bundle.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Callable[..., Any]], Dict[str, Any]],
+        stream_task: Callable[..., Iterator[Any]],
+    ) -> None:
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._bundle: Dict[str, Any] | None = None
+        self._error: BaseException | None = None
+        self._finished = threading.Event()
+
+        def collecting_task(**kwargs: Any) -> Any:
+            chunks: List[Any] = []
+            for chunk in stream_task(**kwargs):
+                chunks.append(chunk)
+                self._queue.put(chunk)
+            return combine_chunks(chunks)
+
+        def worker() -> None:
+            try:
+                self._bundle = run(collecting_task)
+            except BaseException as exc:  # noqa: BLE001 - re-raised to the consumer
+                self._error = exc
+            finally:
+                self._queue.put(_DONE)
+                self._finished.set()
+
+        self._thread = threading.Thread(target=worker, name="kl-stream", daemon=True)
+        self._thread.start()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            chunk = self._queue.get()
+            if chunk is _DONE:
+                break
+            yield chunk
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def bundle(self) -> Dict[str, Any]:
+        """
+        Final KL bundle. Blocks until the execution has finished.
+        """
+        self._finished.wait()
+        if self._error is not None:
+            raise self._error
+        if self._bundle is None:
+            raise RuntimeError("Streaming execution finished without a bundle")
+        return self._bundle
@@ -0,0 +1,280 @@
+"""
+Persistent, indexed store for execution traces.
+
+Traces otherwise only exist inside the returned bundles. The store keeps
+them in a SQLite database (WAL mode) with two tables:
+
+- `executions`: one row per execution with operation key, user id,
+  request id, start time and duration
+- `trace_entries`: one row per trace stage, with the stage specific
+  fields as JSON
+
+Indexes on (key, user_id, started_at), (key, started_at), (user_id,
+started_at), started_at, request id and (stage, execution) keep
+filtered queries independent of the table size. The start time as last
+index column serves as the time bucket and returns the newest
+executions first without a sort.
+
+Ingestion is buffered: `record` only appends rows to memory and every
+`batch_size` executions the buffer is written in a single transaction.
+Execution ids are assigned by SQLite on insert, so several stores
+(threads or processes) can write to the same database.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Trace entry fields stored in dedicated columns instead of the JSON data.
+_ENTRY_COLUMNS = ("stage", "timestamp", "user_id", "request_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY,
+    op_key TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    request_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration_ms REAL
+);
+CREATE TABLE IF NOT EXISTS trace_entries (
+    execution_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    ts REAL,
+    data TEXT,
+    PRIMARY KEY (execution_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_executions_key_user ON executions (op_key, user_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_key ON executions (op_key, started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_user ON executions (user_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_started ON executions (started_at);
+CREATE INDEX IF NOT EXISTS idx_executions_request ON executions (request_id);
+CREATE INDEX IF NOT EXISTS idx_trace_entries_stage ON trace_entries (stage, execution_id);
+"""
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """
+    Convert a trace timestamp (epoch number or ISO 8601 string) to seconds.
+
+    A trailing "Z" means UTC, and strings without an offset are read as
+    UTC too.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        if value.endswith(("Z", "z")):
+            value = value[:-1] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+class TraceStore:
+    """
+    SQLite backed trace store with buffered ingestion.
+
+    Safe to share between threads. Call `flush` (or `close`) to make
+    buffered executions visible to queries.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        batch_size: int = 512,
+        clock: Any = time.time,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 64 MiB page cache keeps the index pages hot during ingestion.
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._conn.executescript(_SCHEMA)
+
+        # Buffered executions: the execution row and its trace entry rows.
+        self._pending: List[Tuple[Tuple[Any, ...], List[Tuple[Any, ...]]]] = []
+
+    def record(
+        self,
+        key: str,
+        bundle: Dict[str, Any],
+        duration_ms: Optional[float] = None,
+        user_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> None:
+        """
+        Buffer the trace of one execution.
+
+        Without `duration_ms`, the duration is taken from the first and
+        last trace timestamps when both are present. Without `user_id` /
+        `request_id`, the ids are read from the first trace entry; pass
+        them explicitly when the trace may have been dropped.
+        """
+        trace = bundle.get("execution", {}).get("trace", [])
+        first = trace[0] if trace else {}
+        started = _to_epoch(first.get("timestamp"))
+        if duration_ms is None and len(trace) > 1 and started is not None:
+            ended = _to_epoch(trace[-1].get("timestamp"))
+            if ended is not None:
+                duration_ms = (ended - started) * 1000.0
+        if started is None:
+            started = float(self._clock())
+
+        entry_rows = []
+        for seq, entry in enumerate(trace):
+            data = {name: value for name, value in entry.items() if name not in _ENTRY_COLUMNS}
+            entry_rows.append(
+                (
+                    seq,
+                    str(entry.get("stage", "")),
+                    _to_epoch(entry.get("timestamp")),
+                    json.dumps(data, default=str) if data else None,
+                )
+            )
+
+        if user_id is None:
+            user_id = str(first.get("user_id", ""))
+        if request_id is None:
+            request_id = str(first.get("request_id", ""))
+
+        with self._lock:
+            self._pending.append(((key, user_id, request_id, started, duration_ms), entry_rows))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """
+        Write buffered executions in one transaction.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        entries: List[Tuple[Any, ...]] = []
+        with self._conn:
+            for execution, entry_rows in self._pending:
+                cursor = self._conn.execute(
+                    "INSERT INTO executions (op_key, user_id, request_id, started_at, duration_ms) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    execution,
+                )
+                execution_id = cursor.lastrowid
+                entries.extend((execution_id, *row) for row in entry_rows)
+            self._conn.executemany("INSERT INTO trace_entries VALUES (?, ?, ?, ?, ?)", entries)
+        self._pending = []
+
+    def query(
+        self,
+        key: Optional[str] = None,
+        user_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        stage: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_duration_ms: Optional[float] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return matching executions, newest first.
+
+        `since` / `until` are epoch seconds. `stage` keeps executions
+        that have a trace entry with that stage. It is meant for
+        selective orchestrator stages (for example "route"): the
+        matching ids are collected first, so filtering on a stage that
+        every trace has ("start", "end") scans the whole index.
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        for column, value in (("op_key", key), ("user_id", user_id), ("request_id", request_id)):
+            if value is not None:
+                where.append(f"e.{column} = ?")
+                params.append(value)
+        if since is not None:
+            where.append("e.started_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("e.started_at < ?")
+            params.append(until)
+        if min_duration_ms is not None:
+            where.append("e.duration_ms >= ?")
+            params.append(min_duration_ms)
+        if stage is not None:
+            where.append("e.id IN (SELECT execution_id FROM trace_entries WHERE stage = ?)")
+            params.append(stage)
+
+        sql = "SELECT e.id, e.op_key, e.user_id, e.request_id, e.started_at, e.duration_ms FROM executions e"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.started_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(sql, params).fetchall()
+            stages = self._stages([row[0] for row in rows])
+
+        return [
+            {
+                "key": op_key,
+                "user_id": user,
+                "request_id": request,
+                "started_at": started,
+                "duration_ms": duration,
+                "stages": stages.get(execution_id, []),
+            }
+            for execution_id, op_key, user, request, started, duration in rows
+        ]
+
+    def _stages(self, execution_ids: List[int]) -> Dict[int, List[str]]:
+        if not execution_ids:
+            return {}
+        placeholders = ",".join("?" * len(execution_ids))
+        stages: Dict[int, List[str]] = {}
+        for execution_id, stage in self._conn.execute(
+            f"SELECT execution_id, stage FROM trace_entries WHERE execution_id IN ({placeholders}) "
+            "ORDER BY execution_id, seq",
+            execution_ids,
+        ):
+            stages.setdefault(execution_id, []).append(stage)
+        return stages
+
+    def count(self) -> int:
+        """
+        Number of stored executions, including buffered ones.
+        """
+        with self._lock:
+            (stored,) = self._conn.execute("SELECT COUNT(*) FROM executions").fetchone()
+            return int(stored) + len(self._pending)
+
+    def close(self) -> None:
+        """
+        Flush buffered executions and close the database.
+        """
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def __enter__(self) -> "TraceStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,170 @@
+"""
+Helpers for working with the trace inside a KL bundle.
+
+The Kernel produces `execution.trace` as a list of stage entries that
+starts with "start" and ends with "end". The orchestrator adds its own
+stages (for example routing decisions) between those two, so that
+consumers can keep relying on trace[0] and trace[-1].
+
+`TracePolicy` bounds the trace volume per operation: head based
+sampling by request id, tail based retention of slow and failed
+executions, and a "summary" level that keeps only timings.
+
+When a task raises out of the Kernel there is no bundle. The
+orchestrator builds one with `failure_bundle` so that the failed
+execution is traced like any other before the error is re-raised.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from kl_kernel_logic import PsiDefinition
+
+
+def get_trace(bundle: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the trace list of a bundle, creating it if missing.
+    """
+    execution = bundle.setdefault("execution", {})
+    trace = execution.get("trace")
+    if trace is None:
+        trace = execution["trace"] = []
+    return trace
+
+
+def insert_trace_entry(bundle: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """
+    Insert an orchestrator stage before the final "end" entry.
+    """
+    trace = get_trace(bundle)
+    if trace and trace[-1].get("stage") == "end":
+        trace.insert(len(trace) - 1, entry)
+    else:
+        trace.append(entry)
+
+
+def failure_bundle(
+    psi: PsiDefinition,
+    user_id: str,
+    request_id: str,
+    error: BaseException,
+    duration_ms: float,
+) -> Dict[str, Any]:
+    """
+    Kernel shaped bundle for an execution that raised.
+
+    The execution has `success` False, the error message and a start /
+    error / end trace whose timestamps span `duration_ms`.
+    """
+    finished = datetime.now(timezone.utc)
+    started = finished - timedelta(milliseconds=duration_ms)
+    message = f"{type(error).__name__}: {error}"
+    ids = {"user_id": user_id, "request_id": request_id}
+    return {
+        "psi": psi.describe(),
+        "execution": {
+            "success": False,
+            "result": None,
+            "error": message,
+            "trace": [
+                {"stage": "start", **ids, "timestamp": started.isoformat()},
+                {"stage": "error", **ids, "error": message},
+                {"stage": "end", **ids, "timestamp": finished.isoformat()},
+            ],
+        },
+    }
+
+
+# Fields kept on the start / end entries of a summary trace.
+_SUMMARY_FIELDS = ("stage", "user_id", "request_id", "timestamp")
+
+
+@dataclass(frozen=True)
+class TracePolicy:
+    """
+    Per operation trace sampling and retention.
+
+    - `level`: trace level of sampled executions ("full" or "summary")
+    - `sample_rate`: head based sampling, the fraction of request ids
+      that get `level`. The decision is a deterministic hash of the
+      request id, so retries and replays of a request agree.
+    - `unsampled_level`: level for the other executions ("summary" or
+      "none")
+    - `keep_if_slower_than_ms`: tail based, keep the full trace of
+      executions that took at least this long
+    - `keep_errors`: tail based, keep the full trace of failed executions
+
+    A "summary" trace keeps only the start and end entries (ids and
+    timestamps) and adds `duration_ms` to the end entry. "none" drops
+    the trace.
+    """
+
+    level: str = "full"
+    sample_rate: float = 1.0
+    unsampled_level: str = "summary"
+    keep_if_slower_than_ms: Optional[float] = None
+    keep_errors: bool = True
+
+    def __post_init__(self) -> None:
+        if self.level not in ("full", "summary"):
+            raise ValueError(f"Invalid trace level: {self.level} (expected 'full' or 'summary')")
+        if self.unsampled_level not in ("summary", "none"):
+            raise ValueError(
+                f"Invalid unsampled trace level: {self.unsampled_level} (expected 'summary' or 'none')"
+            )
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {self.sample_rate}")
+
+
+def is_sampled(request_id: str, sample_rate: float) -> bool:
+    """
+    Deterministic head sampling decision for a request id.
+    """
+    if sample_rate >= 1.0:
+        return True
+    if sample_rate <= 0.0:
+        return False
+    digest = hashlib.blake2b(request_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2.0**64 < sample_rate
+
+
+def is_error_bundle(bundle: Dict[str, Any]) -> bool:
+    """
+    True if the bundle reports a failed execution.
+    """
+    execution = bundle.get("execution", {})
+    if execution.get("success") is False or execution.get("error"):
+        return True
+    return any(entry.get("stage") == "error" or entry.get("error") for entry in execution.get("trace", []))
+
+
+def apply_trace_policy(
+    bundle: Dict[str, Any],
+    policy: TracePolicy,
+    request_id: str,
+    duration_ms: float,
+) -> str:
+    """
+    Reduce the trace of a bundle according to `policy`.
+
+    Returns the level that was applied.
+    """
+    level = policy.level if is_sampled(request_id, policy.sample_rate) else policy.unsampled_level
+    if level != "full":
+        slow = policy.keep_if_slower_than_ms is not None and duration_ms >= policy.keep_if_slower_than_ms
+        if slow or (policy.keep_errors and is_error_bundle(bundle)):
+            level = "full"
+
+    if level == "summary":
+        trace = get_trace(bundle)
+        if trace:
+            ends = [trace[0], trace[-1]] if len(trace) > 1 else [trace[0]]
+            summary = [{name: entry[name] for name in _SUMMARY_FIELDS if name in entry} for entry in ends]
+            summary[-1]["duration_ms"] = round(duration_ms, 3)
+            summary[-1]["level"] = "summary"
+            bundle["execution"]["trace"] = summary
+    elif level == "none":
+        bundle.setdefault("execution", {})["trace"] = []
+    return level
@@ -0,0 +1,430 @@
+"""
+Warm worker process pool for the KL Execution PoC.
+
+Every worker process loads the config once, builds its own registry,
+policies and Orchestrator, and runs the `warmup` input of each operation
+(declared in operations.json) before it reports ready. Requests are only
+sent to ready workers, so import, config and first call costs are paid
+before traffic arrives.
+
+Workers are recycled after `max_requests` requests or when their
+resident memory exceeds `max_memory_mb`, which contains leaks in user
+supplied tasks. A replacement is started and warmed up in the background
+while the other workers keep serving.
+
+Float series (`array`, `memoryview`, NumPy) of at least
+`share_min_bytes` are not pickled: the caller copies them once into a
+shared memory block and sends a `SharedSeries` handle. The worker
+attaches to the block and passes a view to vectorized tasks without
+copying. The block is unlinked when the reply has arrived.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from kl_kernel_logic import ExecutionPolicy
+
+from .config import build_registry_and_policies, load_config
+from .config.schemas import OperationConfig
+from .ops.signals import as_float_view, is_numpy_array
+from .orchestrator import Orchestrator
+from .shared_buffers import SharedSeries, SharedSeriesBuffer, attach_series
+
+
+def warm_up_operations(
+    orchestrator: Orchestrator,
+    policies: Mapping[str, ExecutionPolicy],
+    configs: List[OperationConfig],
+) -> Dict[str, float]:
+    """
+    Execute the warm-up input of every operation that declares one.
+
+    Returns the warm-up duration per operation key in milliseconds.
+    """
+    timings: Dict[str, float] = {}
+    for cfg in configs:
+        if cfg.warmup is None:
+            continue
+        started = time.perf_counter()
+        orchestrator.execute_operation(
+            key=cfg.key,
+            user_id="warmup",
+            request_id=f"warmup-{cfg.key}",
+            policy=policies[cfg.key],
+            **cfg.warmup,
+        )
+        timings[cfg.key] = (time.perf_counter() - started) * 1000.0
+    return timings
+
+
+def _rss_mb() -> float:
+    """
+    Current resident set size of this process in MiB.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # No /proc: fall back to the peak RSS (bytes on macOS, KiB elsewhere).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _worker_main(
+    conn: Connection,
+    config_path: str,
+    max_requests: int,
+    max_memory_mb: Optional[float],
+) -> None:
+    """
+    Worker process entry point.
+
+    Protocol: the worker sends ("ready", warmup timings) or ("failed",
+    error). It then answers every (key, user_id, request_id, kwargs)
+    message with ("ok", bundle, recycle) or ("error", exception,
+    recycle) and exits after a reply with recycle set, or on None.
+    """
+    try:
+        configs = load_config(config_path)
+        registry, policies = build_registry_and_policies(configs)
+        orchestrator = Orchestrator(registry=registry)
+        timings = warm_up_operations(orchestrator, policies, configs)
+    except BaseException as exc:  # noqa: BLE001 - reported to the pool
+        conn.send(("failed", f"{type(exc).__name__}: {exc}"))
+        return
+    conn.send(("ready", timings))
+
+    handled = 0
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        key, user_id, request_id, kwargs = message
+        # Shared inputs stay attached until the reply is serialised, so a
+        # result that is a view of its input is copied before release.
+        with ExitStack() as attached:
+            try:
+                if key not in policies:
+                    raise KeyError(f"Unknown operation key: {key}")
+                bundle = orchestrator.execute_operation(
+                    key=key,
+                    user_id=user_id,
+                    request_id=request_id,
+                    policy=policies[key],
+                    **_attach_shared(kwargs, attached),
+                )
+                reply: tuple = ("ok", _detach_result(bundle))
+            except Exception as exc:  # noqa: BLE001 - re-raised in the caller
+                reply = ("error", exc)
+
+            handled += 1
+            recycle = handled >= max_requests or (
+                max_memory_mb is not None and _rss_mb() > max_memory_mb
+            )
+            try:
+                data = ForkingPickler.dumps((*reply, recycle))
+            except Exception as exc:  # noqa: BLE001 - e.g. an unpicklable result
+                data = ForkingPickler.dumps(("error", RuntimeError(f"Cannot return result: {exc!r}"), recycle))
+            del reply
+        conn.send_bytes(data)
+        if recycle:
+            return
+
+
+@dataclass(frozen=True)
+class _SharedArgument:
+    """
+    A float series argument passed through shared memory.
+
+    `numpy` restores a NumPy array in the worker, other series arrive
+    as a memoryview.
+    """
+
+    series: SharedSeries
+    numpy: bool = False
+
+
+def _share_buffers(kwargs: Dict[str, Any], min_bytes: int, owned: ExitStack) -> Dict[str, Any]:
+    """
+    Caller side: replace large float series by shared memory handles.
+
+    The blocks are registered on `owned` and unlinked when it closes.
+    Memoryviews that cannot be shared are sent as an `array` copy.
+    """
+    converted = dict(kwargs)
+    for name, value in kwargs.items():
+        if not isinstance(value, (array, memoryview)) and not is_numpy_array(value):
+            continue
+        try:
+            view = as_float_view(value)
+        except TypeError:
+            view = None
+        if view is not None and view.nbytes >= min_bytes:
+            buffer = owned.enter_context(SharedSeriesBuffer.from_values(view))
+            converted[name] = _SharedArgument(buffer.handle, numpy=is_numpy_array(value))
+        elif isinstance(value, memoryview):
+            copy = array(value.format.lstrip("<=@"))
+            copy.frombytes(value.cast("B"))
+            converted[name] = copy
+    return converted
+
+
+def _attach_shared(kwargs: Dict[str, Any], attached: ExitStack) -> Dict[str, Any]:
+    """
+    Worker side: attach to the shared series of a request.
+    """
+    converted = dict(kwargs)
+    for name, value in kwargs.items():
+        if isinstance(value, _SharedArgument):
+            view = attached.enter_context(attach_series(value.series))
+            if value.numpy:
+                import numpy as np
+
+                converted[name] = np.frombuffer(view, dtype=value.series.typecode)
+            else:
+                converted[name] = view
+    return converted
+
+
+def _detach_result(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a memoryview result into an `array`, memoryviews do not pickle.
+    """
+    execution = bundle.get("execution", {})
+    result = execution.get("result")
+    if isinstance(result, memoryview):
+        copy = array(result.format.lstrip("<=@"))
+        copy.frombytes(result.cast("B"))
+        execution["result"] = copy
+    return bundle
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+    warmup_ms: Dict[str, float] = field(default_factory=dict)
+
+
+class WorkerPool:
+    """
+    Pool of warm worker processes, each with its own Orchestrator.
+
+    `execute` is thread safe and blocks until a worker is free. `submit`
+    returns a Future. Use as a context manager, or call `start` and
+    `close` explicitly.
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path,
+        workers: int = 2,
+        max_requests: int = 10_000,
+        max_memory_mb: Optional[float] = None,
+        start_method: str = "spawn",
+        ready_timeout: float = 60.0,
+        share_min_bytes: int = 64 * 1024,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_requests < 1:
+            raise ValueError("max_requests must be at least 1")
+
+        self.config_path = str(config_path)
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_memory_mb = max_memory_mb
+        self.ready_timeout = ready_timeout
+        self.share_min_bytes = share_min_bytes
+        self._context = get_context(start_method)
+
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._replacements: List[threading.Thread] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._closed = False
+        self._spawn_error: BaseException | None = None
+        self.started = 0
+        self.recycled = 0
+        self.warmup_ms: Dict[str, float] = {}
+
+    def start(self) -> "WorkerPool":
+        """
+        Start all workers and wait until every one is warm.
+        """
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="kl-pool")
+        return self
+
+    def execute(
+        self,
+        key: str,
+        user_id: str,
+        request_id: str,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Execute an operation on a free worker and return the bundle.
+
+        Float series of at least `share_min_bytes` are passed through
+        shared memory, other arguments are pickled. Smaller memoryviews
+        (for example a memory mapped values file) are sent as an `array`
+        copy. Exceptions raised by the operation are re-raised here.
+        """
+        self._check_running()
+
+        with ExitStack() as owned:
+            message = (key, user_id, request_id, _share_buffers(kwargs, self.share_min_bytes, owned))
+            worker = self._acquire()
+            try:
+                worker.conn.send(message)
+                status, payload, recycle = worker.conn.recv()
+            except (EOFError, OSError) as exc:
+                self._retire(worker)
+                raise RuntimeError(f"Worker process exited unexpectedly: {exc!r}") from exc
+
+        if recycle:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+
+        if status == "error":
+            raise payload
+        return payload
+
+    def submit(
+        self,
+        key: str,
+        user_id: str,
+        request_id: str,
+        **kwargs: Any,
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Execute asynchronously. The Future resolves to the bundle.
+        """
+        return self._check_running().submit(self.execute, key, user_id, request_id, **kwargs)
+
+    def close(self) -> None:
+        """
+        Finish requests submitted through `submit` and stop all workers.
+        """
+        if self._closed:
+            return
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._closed = True
+        with self._lock:
+            replacements = list(self._replacements)
+        for thread in replacements:
+            thread.join()
+
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.config_path, self.max_requests, self.max_memory_mb),
+            name="kl-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        if not parent_conn.poll(self.ready_timeout):
+            process.terminate()
+            raise RuntimeError(f"Worker did not become ready within {self.ready_timeout} seconds")
+        try:
+            status, payload = parent_conn.recv()
+        except EOFError as exc:
+            raise RuntimeError("Worker process exited during start up") from exc
+        if status != "ready":
+            process.join()
+            raise RuntimeError(f"Worker failed to start: {payload}")
+
+        with self._lock:
+            self.started += 1
+            self.warmup_ms = dict(payload)
+        return _Worker(process=process, conn=parent_conn, warmup_ms=payload)
+
+    def _retire(self, worker: _Worker) -> None:
+        """
+        Reap a finished worker and warm up its replacement in the background.
+        """
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.conn.close()
+
+        with self._lock:
+            self.recycled += 1
+            if self._closed:
+                return
+            thread = threading.Thread(target=self._replace, name="kl-pool-replace", daemon=True)
+            self._replacements = [t for t in self._replacements if t.is_alive()]
+            self._replacements.append(thread)
+        thread.start()
+
+    def _check_running(self) -> ThreadPoolExecutor:
+        """
+        Return the request executor of a started, open pool.
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        if self._executor is None:
+            raise RuntimeError("Worker pool is not started")
+        return self._executor
+
+    def _acquire(self) -> _Worker:
+        while True:
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                if self._spawn_error is not None:
+                    raise RuntimeError("Worker replacement failed") from self._spawn_error
+                if self._closed:
+                    raise RuntimeError("Worker pool is closed")
+
+    def _replace(self) -> None:
+        try:
+            self._idle.put(self._spawn())
+        except BaseException as exc:  # noqa: BLE001 - surfaced to waiting callers
+            self._spawn_error = exc
@@ -0,0 +1,190 @@
+"""
+Tests for per execution resource accounting.
+
+Covers:
+- the "accounting" trace stage at the basic and memory levels
+- aggregation per user and operation key, export and drain
+- no stage and no ledger entry for operations with accounting off
+- failed executions are billed and counted
+- config validation of the accounting level
+"""
+
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from kl_kernel_logic import EffectClass, OperationType, PsiDefinition
+
+from kl_exec_poc import OperationMetadata, OperationRegistry, Orchestrator
+from kl_exec_poc.accounting import UsageLedger, UsageMeter
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.config import build_registry_and_policies, load_config
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _busy(n: int) -> int:
+    deadline = time.thread_time() + n / 1000.0
+    total = 0
+    while time.thread_time() < deadline:
+        total += 1
+    return total
+
+
+def _allocate(size: int) -> int:
+    blob = bytearray(size)
+    kept = [bytes(64) for _ in range(100)]
+    return len(blob) + len(kept)
+
+
+def _orchestrator(level: str, task) -> Orchestrator:
+    registry = OperationRegistry()
+    psi = PsiDefinition(
+        operation_type=OperationType.TRANSFORM,
+        logical_binding="application.test.accounting",
+        effect_class=EffectClass.NON_STATE_CHANGING,
+    )
+    registry.register("test.op", OperationMetadata(psi=psi, task=task, accounting=level))
+    return Orchestrator(registry=registry)
+
+
+def _accounting_entries(bundle):
+    return [entry for entry in bundle["execution"]["trace"] if entry.get("stage") == "accounting"]
+
+
+def test_basic_level_records_cpu_and_wall_time():
+    orchestrator = _orchestrator("basic", _busy)
+
+    bundle = orchestrator.execute_operation(
+        key="test.op", user_id="u1", request_id="r1", policy=KLBridge.build_policy(), n=20
+    )
+
+    trace = bundle["execution"]["trace"]
+    assert trace[0]["stage"] == "start"
+    assert trace[-1]["stage"] == "end"
+    (entry,) = _accounting_entries(bundle)
+    assert entry["level"] == "basic"
+    assert entry["user_id"] == "u1" and entry["request_id"] == "r1"
+    assert entry["cpu_ms"] >= 15
+    assert entry["wall_ms"] >= entry["cpu_ms"] * 0.9
+    assert "alloc_bytes" not in entry
+
+
+def test_memory_level_records_allocation_and_peak():
+    orchestrator = _orchestrator("memory", _allocate)
+
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        bundle = orchestrator.execute_operation(
+            key="test.op", user_id="u1", request_id="r1", policy=KLBridge.build_policy(), size=1_000_000
+        )
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    (entry,) = _accounting_entries(bundle)
+    assert entry["level"] == "memory"
+    # The 1 MB buffer is freed on return, but it is part of the peak.
+    assert entry["peak_bytes"] >= 1_000_000
+    assert entry["alloc_bytes"] < entry["peak_bytes"]
+
+
+def test_ledger_aggregates_per_user_and_key(tmp_path):
+    data = json.loads(_config_path().read_text())
+    for op in data["operations"]:
+        if op["key"] in ("text.simplify", "signals.smooth"):
+            op["accounting"] = "basic"
+    path = tmp_path / "operations.json"
+    path.write_text(json.dumps(data))
+    registry, policies = build_registry_and_policies(load_config(path))
+    ledger = UsageLedger()
+    orchestrator = Orchestrator(registry=registry, ledger=ledger)
+
+    for user_id, count in (("alice", 3), ("bob", 1)):
+        for i in range(count):
+            orchestrator.execute_operation(
+                key="text.simplify",
+                user_id=user_id,
+                request_id=f"{user_id}-{i}",
+                policy=policies["text.simplify"],
+                text=" Some   text ",
+            )
+    orchestrator.execute_operation(
+        key="signals.smooth",
+        user_id="alice",
+        request_id="alice-s",
+        policy=policies["signals.smooth"],
+        values=[1.0, 2.0, 3.0],
+    )
+
+    assert ledger.get("alice", "text.simplify").executions == 3
+    assert ledger.get("bob", "text.simplify").executions == 1
+    assert ledger.get("bob", "signals.smooth").executions == 0
+
+    records = ledger.records()
+    assert [(r["user_id"], r["key"], r["executions"]) for r in records] == [
+        ("alice", "signals.smooth", 1),
+        ("alice", "text.simplify", 3),
+        ("bob", "text.simplify", 1),
+    ]
+    assert all(r["wall_ms"] > 0 and r["cpu_ms"] >= 0 for r in records)
+
+    out = tmp_path / "usage.jsonl"
+    assert ledger.export_jsonl(out) == 3
+    assert [json.loads(line) for line in out.read_text().splitlines()] == records
+
+    assert ledger.drain() == records
+    assert ledger.records() == []
+
+
+def test_accounting_off_adds_nothing():
+    orchestrator = _orchestrator("off", _busy)
+
+    bundle = orchestrator.execute_operation(
+        key="test.op", user_id="u1", request_id="r1", policy=KLBridge.build_policy(), n=1
+    )
+
+    assert _accounting_entries(bundle) == []
+    assert orchestrator.ledger.records() == []
+
+
+def test_failed_task_is_still_accounted():
+    def failing(**kwargs):
+        raise RuntimeError("boom")
+
+    meter = UsageMeter("basic")
+    with pytest.raises(RuntimeError):
+        meter.wrap(failing)()
+    assert meter.usage is not None and meter.usage.wall_ms >= 0
+
+    def busy_then_fail(n: int) -> int:
+        _busy(n)
+        raise RuntimeError("boom")
+
+    orchestrator = _orchestrator("basic", busy_then_fail)
+    with pytest.raises(RuntimeError):
+        orchestrator.execute_operation(
+            key="test.op", user_id="u1", request_id="r1", policy=KLBridge.build_policy(), n=10
+        )
+    orchestrator.registry.get("test.op").task = _busy
+    orchestrator.execute_operation(key="test.op", user_id="u1", request_id="r2", policy=KLBridge.build_policy(), n=1)
+
+    totals = orchestrator.ledger.get("u1", "test.op")
+    assert (totals.executions, totals.failures) == (2, 1)
+    assert totals.cpu_ms >= 10
+
+
+def test_invalid_accounting_level_is_rejected(tmp_path):
+    data = json.loads(_config_path().read_text())
+    data["operations"][0]["accounting"] = "everything"
+    path = tmp_path / "operations.json"
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ValueError, match="accounting level"):
+        load_config(path)
+    with pytest.raises(ValueError):
+        UsageMeter("everything")
@@ -0,0 +1,203 @@
+"""
+Tests for adaptive backend selection.
+
+Covers:
+- warm-up, exploitation and exploration of the selector
+- separate statistics per input size bucket
+- following a change in backend latency
+- excluding backends that raise
+- the "backend" trace stage and config wiring
+"""
+
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from kl_kernel_logic import EffectClass, OperationType, PsiDefinition
+
+from kl_exec_poc import OperationMetadata, OperationRegistry, Orchestrator
+from kl_exec_poc.adaptive import BackendSelector, OperationBackend
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.hashing import bundle_digest
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _backends(*kinds: str):
+    return [OperationBackend(kind=kind, task=lambda **kwargs: kind) for kind in kinds]
+
+
+def test_selector_warms_up_then_exploits_the_fastest_backend():
+    selector = BackendSelector(_backends("a", "b"), epsilon=0.0, min_samples=2)
+
+    warmup = []
+    for _ in range(4):
+        choice = selector.choose({})
+        assert choice.reason == "warmup"
+        warmup.append(choice.backend.kind)
+        selector.observe(choice.bucket, choice.backend.kind, 1.0 if choice.backend.kind == "a" else 5.0)
+    assert Counter(warmup) == {"a": 2, "b": 2}
+
+    choice = selector.choose({})
+    assert (choice.backend.kind, choice.reason) == ("a", "fastest")
+    assert choice.estimates == {"a": 1.0, "b": 5.0}
+
+
+def test_selector_explores_with_probability_epsilon():
+    selector = BackendSelector(_backends("a", "b", "c"), epsilon=0.2, min_samples=1, seed=7)
+    for kind, latency in (("a", 1.0), ("b", 2.0), ("c", 3.0)):
+        selector.observe(0, kind, latency)
+
+    choices = [selector.choose({}) for _ in range(5_000)]
+    explored = [c for c in choices if c.reason == "explore"]
+
+    assert 0.17 < len(explored) / len(choices) < 0.23
+    assert {c.backend.kind for c in explored} == {"b", "c"}
+    assert all(c.backend.kind == "a" for c in choices if c.reason == "fastest")
+
+
+def test_statistics_are_kept_per_size_bucket():
+    selector = BackendSelector(_backends("small", "large"), field="values", epsilon=0.0, min_samples=1)
+    short, long = {"values": [0.0] * 10}, {"values": [0.0] * 5_000}
+    assert selector.bucket(short) != selector.bucket(long)
+
+    selector.observe(selector.bucket(short), "small", 0.1)
+    selector.observe(selector.bucket(short), "large", 0.5)
+    selector.observe(selector.bucket(long), "small", 9.0)
+    selector.observe(selector.bucket(long), "large", 2.0)
+
+    assert selector.choose(short).backend.kind == "small"
+    assert selector.choose(long).backend.kind == "large"
+    assert selector.choose({"values": 3}).bucket == 0
+
+
+def test_selector_follows_latency_changes():
+    selector = BackendSelector(_backends("a", "b"), epsilon=0.0, alpha=0.5, min_samples=1)
+    selector.observe(0, "a", 1.0)
+    selector.observe(0, "b", 2.0)
+    assert selector.choose({}).backend.kind == "a"
+
+    # Backend "a" becomes slow under load.
+    for _ in range(4):
+        selector.observe(0, "a", 10.0)
+    assert selector.choose({}).backend.kind == "b"
+    assert [row["samples"] for row in selector.snapshot()] == [5, 1]
+
+
+def test_failing_backend_is_excluded_from_its_bucket():
+    def limited(values):
+        if len(values) > 100:
+            raise ValueError("Series length must be <= 100")
+        return sum(values)
+
+    selector = BackendSelector(
+        [OperationBackend(kind="limited", task=limited), OperationBackend(kind="full", task=sum_values)],
+        field="values",
+        epsilon=0.5,
+        min_samples=3,
+        seed=1,
+    )
+    large = {"values": [1.0] * 1_000}
+
+    failures = 0
+    for _ in range(50):
+        choice = selector.choose(large)
+        try:
+            assert selector.timed_task(choice)(**large) == 1_000.0
+        except ValueError:
+            failures += 1
+    assert failures == 1
+    rows = {row["backend"]: row for row in selector.snapshot()}
+    assert rows["limited"]["failures"] == 1 and rows["limited"]["samples"] == 0
+    assert rows["full"]["samples"] == 49
+
+    # The exclusion is per bucket: small inputs still use both backends.
+    small = {"values": [1.0] * 10}
+    choice = selector.choose(small)
+    assert (choice.backend.kind, choice.reason) == ("limited", "warmup")
+    assert selector.timed_task(choice)(**small) == 10.0
+
+
+def sum_values(values):
+    return sum(values)
+
+
+def test_orchestrator_routes_to_the_measured_fastest_backend():
+    def slow(values):
+        time.sleep(0.005)
+        return sum(values)
+
+    def fast(values):
+        return sum(values)
+
+    selector = BackendSelector(
+        [OperationBackend(kind="slow", task=slow), OperationBackend(kind="fast", task=fast)],
+        field="values",
+        epsilon=0.0,
+        min_samples=2,
+    )
+    psi = PsiDefinition(
+        operation_type=OperationType.TRANSFORM,
+        logical_binding="application.test.adaptive",
+        effect_class=EffectClass.NON_STATE_CHANGING,
+    )
+    registry = OperationRegistry()
+    registry.register("test.sum", OperationMetadata(psi=psi, task=slow, backends=selector))
+    orchestrator = Orchestrator(registry=registry)
+
+    bundles = [
+        orchestrator.execute_operation(
+            key="test.sum", user_id="u1", request_id=f"r{i}", policy=KLBridge.build_policy(), values=[1, 2, 3]
+        )
+        for i in range(8)
+    ]
+
+    assert all(bundle["execution"]["result"] == 6 for bundle in bundles)
+    stages = [
+        next(entry for entry in bundle["execution"]["trace"] if entry["stage"] == "backend")
+        for bundle in bundles
+    ]
+    assert [s["reason"] for s in stages[:4]] == ["warmup"] * 4
+    assert all(s["backend"] == "fast" and s["reason"] == "fastest" for s in stages[4:])
+    assert stages[-1]["bucket"] == 2
+    assert stages[-1]["estimates_ms"]["slow"] > stages[-1]["estimates_ms"]["fast"]
+    assert bundles[-1]["execution"]["trace"][-1]["stage"] == "end"
+    # Backend decisions do not change the content digest.
+    again = orchestrator.execute_operation(
+        key="test.sum", user_id="u1", request_id="r0", policy=KLBridge.build_policy(), values=[1, 2, 3]
+    )
+    assert bundle_digest(again) == bundle_digest(bundles[0])
+
+
+def test_backends_from_config(tmp_path):
+    data = json.loads(_config_path().read_text())
+    smooth = next(op for op in data["operations"] if op["key"] == "signals.smooth")
+    smooth["backends"] = {"kinds": ["signals_smooth", "signals_smooth_chunked"], "field": "values"}
+    path = tmp_path / "operations.json"
+    path.write_text(json.dumps(data))
+
+    registry, policies = build_registry_and_policies(load_config(path))
+    orchestrator = Orchestrator(registry=registry)
+    used = set()
+    for i in range(6):
+        bundle = orchestrator.execute_operation(
+            key="signals.smooth",
+            user_id="u1",
+            request_id=f"r{i}",
+            policy=policies["signals.smooth"],
+            values=[1.0, 2.0, 3.0, 4.0],
+        )
+        assert bundle["execution"]["result"] == pytest.approx([1.5, 2.0, 3.0, 3.5])
+        used.update(e["backend"] for e in bundle["execution"]["trace"] if e["stage"] == "backend")
+    assert used == {"signals_smooth", "signals_smooth_chunked"}
+
+    llm = next(op for op in data["operations"] if op["key"] == "text.llm_stub")
+    llm["backends"] = {"kinds": ["llm_stub", "text_simplify"]}
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="cannot be combined"):
+        build_registry_and_policies(load_config(path))
@@ -0,0 +1,167 @@
+"""
+Tests for micro batching of LLM-style operations.
+
+Covers:
+- LLMStub.generate_batch
+- the MicroBatcher collecting concurrent submissions into one call
+- shutting down the batcher thread
+- per operation batching configured through JSON
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc import Orchestrator
+from kl_exec_poc.adapters.batching import MicroBatcher, make_batched_task
+from kl_exec_poc.adapters.llm_stub import LLMStub, LLMStubConfig
+from kl_exec_poc.config import load_config, build_registry_and_policies
+
+
+def test_llm_stub_generate_batch_keeps_order():
+    stub = LLMStub(LLMStubConfig(mode="upper"))
+    results = stub.generate_batch(["a b", "c"])
+    assert [r["output"] for r in results] == ["A B", "C"]
+    assert results[0]["prompt"] == "a b"
+
+
+def test_micro_batcher_collects_concurrent_items():
+    calls = []
+    batch_size = 4
+
+    def batch_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    # Large window so that the batch closes on size, not on time.
+    batcher = MicroBatcher(batch_fn, max_batch_size=batch_size, max_wait_ms=5_000)
+    results = {}
+
+    def worker(value: int) -> None:
+        results[value] = batcher.submit(value)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(batch_size)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert results == {i: i * 2 for i in range(batch_size)}
+    assert len(calls) == 1
+    assert sorted(calls[0]) == list(range(batch_size))
+    assert batcher.batches == 1
+    assert batcher.items == batch_size
+
+
+def test_micro_batcher_forwards_errors():
+    def batch_fn(items):
+        raise RuntimeError("backend down")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=0)
+    task = make_batched_task(batcher, "prompt")
+
+    with pytest.raises(RuntimeError, match="backend down"):
+        task(prompt="x")
+    with pytest.raises(TypeError):
+        task(text="x")
+
+
+def test_micro_batcher_close_serves_queued_items_and_stops():
+    release = threading.Event()
+
+    def batch_fn(items):
+        release.wait(timeout=5)
+        return [item + 1 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait_ms=0)
+    results = []
+    callers = [threading.Thread(target=lambda i=i: results.append(batcher.submit(i))) for i in range(3)]
+    for caller in callers:
+        caller.start()
+    while batcher._queue.qsize() < 2:
+        time.sleep(0.001)
+
+    closer = threading.Thread(target=batcher.close)
+    closer.start()
+    release.set()
+    closer.join(timeout=5)
+    for caller in callers:
+        caller.join(timeout=5)
+
+    assert sorted(results) == [1, 2, 3]
+    assert batcher._worker is not None and not batcher._worker.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(4)
+    batcher.close()
+
+    # A batcher that never started a thread closes without one.
+    with MicroBatcher(batch_fn) as unused:
+        pass
+    assert unused._worker is None
+
+
+def test_batching_configured_per_operation(tmp_path: Path):
+    cfg_path = tmp_path / "operations.json"
+    cfg_path.write_text(
+        json.dumps(
+            {
+                "operations": [
+                    {
+                        "key": "text.llm_stub",
+                        "kind": "llm_stub",
+                        "logical_binding": "application.domain.text.llm_stub",
+                        "policy": {"timeout_seconds": 5},
+                        "batching": {"max_batch_size": 4, "max_wait_ms": 1},
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    configs = load_config(cfg_path)
+    assert configs[0].batching is not None
+    assert configs[0].batching.max_batch_size == 4
+
+    registry, policy_map = build_registry_and_policies(configs)
+    orchestrator = Orchestrator(registry=registry)
+
+    bundle = orchestrator.execute_operation(
+        key="text.llm_stub",
+        user_id="test-user",
+        request_id="batch-1",
+        policy=policy_map["text.llm_stub"],
+        prompt="MiXeD",
+    )
+    assert bundle["execution"]["result"] == "mixed"
+    assert bundle["execution"]["trace"][0]["request_id"] == "batch-1"
+
+    batcher = registry.get("text.llm_stub").batcher
+    assert batcher is not None and batcher._worker is not None
+    registry.close()
+    assert not batcher._worker.is_alive()
+
+
+def test_batching_rejected_for_unsupported_kind(tmp_path: Path):
+    cfg_path = tmp_path / "operations.json"
+    cfg_path.write_text(
+        json.dumps(
+            {
+                "operations": [
+                    {
+                        "key": "text.simplify",
+                        "kind": "text_simplify",
+                        "logical_binding": "application.domain.text",
+                        "batching": {"max_batch_size": 4},
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="does not support batching"):
+        build_registry_and_policies(load_config(cfg_path))
@@ -0,0 +1,77 @@
+"""
+Tests for memory mapped binary series files.
+
+Covers:
+- raw float64 / float32 and .npy round trips
+- header and size validation
+"""
+
+import hashlib
+from array import array
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc.binary_io import open_values_file, write_values_file
+
+
+def test_raw_float64_round_trip(tmp_path: Path):
+    path = tmp_path / "series.f64"
+    info = write_values_file(path, array("d", [1.0, 2.5, -3.0]))
+
+    assert info["length"] == 3
+    assert info["dtype"] == "float64"
+    assert info["sha256"] == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert path.stat().st_size == 24
+
+    with open_values_file(path) as values_file:
+        assert isinstance(values_file.values, memoryview)
+        assert values_file.values.tolist() == [1.0, 2.5, -3.0]
+
+
+def test_raw_float32_needs_dtype(tmp_path: Path):
+    path = tmp_path / "series.f32"
+    write_values_file(path, array("f", [1.0, 2.0, 3.0, 4.0]))
+
+    with open_values_file(path, dtype="float32") as values_file:
+        assert values_file.values.tolist() == [1.0, 2.0, 3.0, 4.0]
+    with open_values_file(path, dtype="float64") as values_file:
+        assert len(values_file.values) == 2
+
+    with pytest.raises(ValueError):
+        open_values_file(path, dtype="int8")
+
+
+def test_npy_round_trip_and_numpy_compatibility(tmp_path: Path):
+    path = tmp_path / "series.npy"
+    info = write_values_file(path, array("f", [0.5, 1.5]))
+    assert info["dtype"] == "float32"
+    # .npy headers are padded so that the data starts on a 64 byte boundary.
+    assert (path.stat().st_size - 8) % 64 == 0
+
+    with open_values_file(path) as values_file:
+        assert values_file.dtype == "float32"
+        assert values_file.values.tolist() == [0.5, 1.5]
+
+    np = pytest.importorskip("numpy")
+    assert np.load(path).tolist() == [0.5, 1.5]
+    np.save(tmp_path / "from_numpy.npy", np.arange(5, dtype=np.float64))
+    with open_values_file(tmp_path / "from_numpy.npy") as values_file:
+        assert values_file.values.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_invalid_files_are_rejected(tmp_path: Path):
+    odd = tmp_path / "odd.f64"
+    odd.write_bytes(b"\x00" * 12)
+    with pytest.raises(ValueError, match="multiple"):
+        open_values_file(odd)
+
+    fake = tmp_path / "fake.npy"
+    fake.write_bytes(b"not numpy at all")
+    with pytest.raises(ValueError, match="Not a .npy file"):
+        open_values_file(fake)
+
+    empty = tmp_path / "empty.f64"
+    empty.write_bytes(b"")
+    with open_values_file(empty) as values_file:
+        assert len(values_file.values) == 0
@@ -4,12 +4,17 @@ Tests for the CLI layer of the KL Execution PoC.
 Covers:
 - running a text operation via the CLI main entry point
 - running a numeric smoothing operation via the CLI main entry point
+- rejecting --stream together with --output-file
+- closing the registry after run, also when arguments are rejected
 """
 
 from pathlib import Path
 import json
 
+import pytest
+
 from kl_exec_poc.cli import main
+from kl_exec_poc.registry import OperationRegistry
 
 
 def _project_root() -> Path:
@@ -93,3 +98,132 @@ def test_cli_signals_smooth(capsys):
     trace = bundle["execution"]["trace"]
     assert trace[0]["stage"] == "start"
     assert trace[-1]["stage"] == "end"
+
+
+def test_cli_llm_stub_stream(capsys):
+    """
+    CLI --stream should print chunk events followed by the final bundle.
+    """
+    root = _project_root()
+    cfg_path = root / "config" / "operations.json"
+
+    rc = main(
+        [
+            "run",
+            "--op",
+            "text.llm_stub",
+            "--input",
+            "Streamed LLM Text",
+            "--stream",
+            "--config",
+            str(cfg_path),
+        ]
+    )
+
+    assert rc == 0
+
+    lines = capsys.readouterr().out.strip().splitlines()
+    events = [json.loads(line) for line in lines]
+
+    chunks = [e["data"] for e in events if e["event"] == "chunk"]
+    assert "".join(chunks) == "streamed llm text"
+    assert len(chunks) > 1
+
+    final = events[-1]
+    assert final["event"] == "bundle"
+    assert final["bundle"]["execution"]["result"] == "streamed llm text"
+    assert final["bundle"]["execution"]["trace"][-1]["stage"] == "end"
+
+
+def test_cli_run_rejects_stream_with_output_file_and_closes_registry(
+    capsys, monkeypatch, tmp_path
+):
+    """
+    --stream cannot write --output-file, and run closes the registry.
+    """
+    cfg_path = _project_root() / "config" / "operations.json"
+    closed = []
+    original_close = OperationRegistry.close
+
+    def close(self) -> None:
+        closed.append(self)
+        original_close(self)
+
+    monkeypatch.setattr(OperationRegistry, "close", close)
+
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "run",
+                "--op",
+                "signals.smooth",
+                "--values",
+                "1",
+                "2",
+                "--stream",
+                "--output-file",
+                str(tmp_path / "out.npy"),
+                "--config",
+                str(cfg_path),
+            ]
+        )
+    assert "--stream or --output-file" in capsys.readouterr().err
+    assert not (tmp_path / "out.npy").exists()
+    assert len(closed) == 1
+
+    rc = main(["run", "--op", "text.simplify", "--input", "x", "--config", str(cfg_path)])
+    assert rc == 0
+    assert len(closed) == 2
+
+
+def test_cli_signals_smooth_values_file(capsys, tmp_path):
+    """
+    CLI should smooth a memory mapped binary file and optionally write
+    the result to a binary file referenced by path and checksum.
+    """
+    from array import array
+    import hashlib
+
+    root = _project_root()
+    cfg_path = root / "config" / "operations.json"
+
+    values_path = tmp_path / "series.f64"
+    values_path.write_bytes(array("d", [1.0, 2.0, 3.0, 4.0]).tobytes())
+
+    rc = main(
+        [
+            "run",
+            "--op",
+            "signals.smooth",
+            "--values-file",
+            str(values_path),
+            "--config",
+            str(cfg_path),
+        ]
+    )
+    assert rc == 0
+    bundle = json.loads(capsys.readouterr().out)
+    assert bundle["execution"]["result"] == [1.5, 2.0, 3.0, 3.5]
+
+    out_path = tmp_path / "smoothed.npy"
+    rc = main(
+        [
+            "run",
+            "--op",
+            "signals.smooth",
+            "--values-file",
+            str(values_path),
+            "--output-file",
+            str(out_path),
+            "--config",
+            str(cfg_path),
+        ]
+    )
+    assert rc == 0
+    bundle = json.loads(capsys.readouterr().out)
+
+    result = bundle["execution"]["result"]
+    assert result["path"] == str(out_path)
+    assert result["length"] == 4
+    assert result["dtype"] == "float64"
+    assert result["sha256"] == hashlib.sha256(out_path.read_bytes()).hexdigest()
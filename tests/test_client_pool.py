@@ -0,0 +1,171 @@
+"""
+Tests for pooled adapter clients.
+
+Covers:
+- one shared client per config, warmed up on creation
+- idle eviction that never drops leased clients
+- client creation outside the pool lock
+- per operation LLM stub settings from JSON config
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc import Orchestrator
+from kl_exec_poc.adapters import ClientPool, LLMStub
+from kl_exec_poc.adapters.llm_stub import LLMStubConfig, build_llm_stub_tasks
+from kl_exec_poc.config import load_config, build_registry_and_policies
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Client:
+    def __init__(self, config: str) -> None:
+        self.config = config
+        self.warm = False
+
+    def warmup(self) -> None:
+        self.warm = True
+
+
+def test_pool_reuses_one_client_per_config():
+    pool = ClientPool(factory=_Client)
+
+    with pool.lease("a") as first:
+        assert first.warm
+    with pool.lease("a") as again:
+        assert again is first
+    with pool.lease("b") as other:
+        assert other is not first
+
+    assert pool.created == 2
+    assert len(pool) == 2
+
+
+def test_slow_creation_does_not_block_other_configs():
+    release = threading.Event()
+    calls = []
+
+    def factory(config: str) -> _Client:
+        calls.append(config)
+        if config == "slow":
+            assert release.wait(timeout=5)
+        if config == "broken":
+            raise RuntimeError("cannot connect")
+        return _Client(config)
+
+    pool = ClientPool(factory=factory)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        slow = [executor.submit(pool.warmup, "slow") for _ in range(2)]
+        # Another config is served while "slow" is still being created.
+        fast = executor.submit(pool.warmup, "fast").result(timeout=5)
+        assert fast.config == "fast"
+        assert not any(future.done() for future in slow)
+
+        release.set()
+        first, second = (future.result(timeout=5) for future in slow)
+    assert first is second
+    assert calls.count("slow") == 1
+
+    with pytest.raises(RuntimeError, match="cannot connect"):
+        pool.warmup("broken")
+    with pytest.raises(RuntimeError):
+        pool.warmup("broken")
+    assert pool.created == 2
+
+
+def test_pool_evicts_idle_clients_but_not_leased_ones():
+    clock = _FakeClock()
+    pool = ClientPool(factory=_Client, idle_timeout_seconds=10, clock=clock)
+
+    pool.warmup("idle")
+    with pool.lease("busy"):
+        clock.now = 60
+        assert pool.evict_idle() == 1
+        assert len(pool) == 1
+
+    # Leased recently, so still kept.
+    assert pool.evict_idle() == 0
+    clock.now = 120
+    assert pool.evict_idle() == 1
+    assert pool.evicted == 2
+
+
+def test_llm_stub_tasks_share_pooled_instance():
+    pool: ClientPool[LLMStubConfig, LLMStub] = ClientPool(factory=LLMStub)
+
+    first = build_llm_stub_tasks({"mode": "upper"}, pool=pool)
+    second = build_llm_stub_tasks({"mode": "upper"}, pool=pool)
+
+    assert first.task(prompt="abc") == "ABC"
+    assert second.batch_task(prompts=["x", "y"]) == ["X", "Y"]
+    assert "".join(second.stream_task(prompt="a b")) == "A B"
+    assert pool.created == 1
+
+    with pytest.raises(ValueError, match="Unknown llm_stub mode"):
+        build_llm_stub_tasks({"mode": "shout"}, pool=pool)
+    with pytest.raises(ValueError, match="Unknown llm_stub adapter settings"):
+        build_llm_stub_tasks({"temperature": 0.2}, pool=pool)
+
+
+def test_adapter_mode_selected_per_operation(tmp_path: Path):
+    def op(key: str, mode: str) -> dict:
+        return {
+            "key": key,
+            "kind": "llm_stub",
+            "logical_binding": f"application.domain.text.{key}",
+            "adapter": {"mode": mode},
+        }
+
+    cfg_path = tmp_path / "operations.json"
+    cfg_path.write_text(
+        json.dumps({"operations": [op("llm.upper", "upper"), op("llm.echo", "echo")]}),
+        encoding="utf-8",
+    )
+
+    registry, policy_map = build_registry_and_policies(load_config(cfg_path))
+    orchestrator = Orchestrator(registry=registry)
+
+    outputs = {
+        key: orchestrator.execute_operation(
+            key=key,
+            user_id="test-user",
+            request_id=f"{key}-1",
+            policy=policy_map[key],
+            prompt="MiXeD",
+        )["execution"]["result"]
+        for key in ("llm.upper", "llm.echo")
+    }
+    assert outputs == {"llm.upper": "MIXED", "llm.echo": "MiXeD"}
+
+
+def test_adapter_block_rejected_for_plain_kind(tmp_path: Path):
+    cfg_path = tmp_path / "operations.json"
+    cfg_path.write_text(
+        json.dumps(
+            {
+                "operations": [
+                    {
+                        "key": "text.simplify",
+                        "kind": "text_simplify",
+                        "logical_binding": "application.domain.text",
+                        "adapter": {"mode": "upper"},
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="does not accept adapter settings"):
+        build_registry_and_policies(load_config(cfg_path))
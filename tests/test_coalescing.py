@@ -0,0 +1,201 @@
+"""
+Tests for request coalescing in the KL Execution PoC orchestrator.
+
+Covers:
+- concurrent identical calls share a single task invocation
+- each caller still receives its own trace identity
+- different kwargs are not coalesced
+- followers receive independent copies of results and errors
+- kwargs that only compare equal across types are not coalesced
+"""
+
+import threading
+import time
+
+from kl_kernel_logic import (
+    ExecutionPolicy,
+    PsiDefinition,
+    OperationType,
+    EffectClass,
+)
+
+from kl_exec_poc import OperationRegistry, OperationMetadata, Orchestrator
+from kl_exec_poc.coalescing import SingleFlight, build_flight_key
+
+
+def _policy() -> ExecutionPolicy:
+    return ExecutionPolicy(allow_network=False, allow_filesystem=False, timeout_seconds=5)
+
+
+def _build_orchestrator(task) -> Orchestrator:
+    registry = OperationRegistry()
+    psi = PsiDefinition(
+        operation_type=OperationType.TRANSFORM,
+        logical_binding="test.coalesce",
+        effect_class=EffectClass.NON_STATE_CHANGING,
+        constraints=None,
+    )
+    registry.register("test.slow", OperationMetadata(psi=psi, task=task))
+    return Orchestrator(registry=registry, coalesce=True)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.001)
+
+
+def test_concurrent_duplicates_share_one_call():
+    calls = []
+    release = threading.Event()
+
+    def slow_upper(prompt: str) -> str:
+        calls.append(prompt)
+        release.wait(5)
+        return prompt.upper()
+
+    orchestrator = _build_orchestrator(slow_upper)
+    results = {}
+
+    def worker(idx: int) -> None:
+        results[idx] = orchestrator.execute_operation(
+            key="test.slow",
+            user_id=f"user-{idx}",
+            request_id=f"req-{idx}",
+            policy=_policy(),
+            prompt="hello",
+        )
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    threads[0].start()
+    _wait_for(lambda: len(calls) == 1)
+    for t in threads[1:]:
+        t.start()
+    _wait_for(lambda: orchestrator.coalesced_count == 3)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert orchestrator.coalesced_count == 3
+
+    for idx, bundle in results.items():
+        assert bundle["execution"]["result"] == "HELLO"
+        trace = bundle["execution"]["trace"]
+        assert trace[0]["request_id"] == f"req-{idx}"
+        assert trace[-1]["user_id"] == f"user-{idx}"
+
+
+def test_different_kwargs_are_not_coalesced():
+    calls = []
+
+    def echo(prompt: str) -> str:
+        calls.append(prompt)
+        return prompt
+
+    orchestrator = _build_orchestrator(echo)
+    for prompt in ("a", "b", "a"):
+        orchestrator.execute_operation(
+            key="test.slow",
+            user_id="u",
+            request_id=f"req-{prompt}",
+            policy=_policy(),
+            prompt=prompt,
+        )
+
+    # Sequential calls never overlap, so nothing is shared.
+    assert calls == ["a", "b", "a"]
+    assert orchestrator.coalesced_count == 0
+
+
+def test_single_flight_propagates_errors_and_flight_key_handles_lists():
+    flight = SingleFlight()
+
+    def boom() -> None:
+        raise ValueError("boom")
+
+    try:
+        flight.do("k", boom)
+    except ValueError as exc:
+        assert str(exc) == "boom"
+    else:
+        raise AssertionError("expected ValueError")
+
+    assert build_flight_key("op", {"values": [1.0, 2.0]}) == build_flight_key(
+        "op", {"values": [1.0, 2.0]}
+    )
+    assert build_flight_key("op", {"values": [1.0]}) != build_flight_key(
+        "op", {"values": (1.0,)}
+    )
+    assert build_flight_key("op", {"values": bytearray(b"x")}) is None
+
+
+def test_followers_get_independent_results_and_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    leader_result = {}
+
+    def slow_list() -> list:
+        started.set()
+        release.wait(5)
+        return [1, 2]
+
+    leader = threading.Thread(
+        target=lambda: leader_result.setdefault("v", flight.do("k", slow_list))
+    )
+    leader.start()
+    started.wait(5)
+
+    follower_result = {}
+    follower = threading.Thread(
+        target=lambda: follower_result.setdefault("v", flight.do("k", slow_list))
+    )
+    follower.start()
+    _wait_for(lambda: flight.coalesced == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert leader_result["v"] == follower_result["v"] == [1, 2]
+    assert leader_result["v"] is not follower_result["v"]
+
+    original = ValueError("boom")
+    started.clear()
+    release.clear()
+
+    def slow_boom() -> None:
+        started.set()
+        release.wait(5)
+        raise original
+
+    errors = {}
+
+    def call(name: str) -> None:
+        try:
+            flight.do("e", slow_boom)
+        except ValueError as exc:
+            errors[name] = exc
+
+    first = threading.Thread(target=call, args=("leader",))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=call, args=("follower",))
+    second.start()
+    _wait_for(lambda: flight.coalesced == 2)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert errors["leader"] is original
+    assert errors["follower"] is not original
+    assert str(errors["follower"]) == "boom"
+    assert errors["follower"].__cause__ is original
+
+
+def test_flight_key_tags_scalars_with_their_type():
+    keys = {build_flight_key("op", {"x": value}) for value in (1, 1.0, True)}
+    assert len(keys) == 3
+    assert build_flight_key("op", {"x": {1: "a"}}) != build_flight_key("op", {"x": {"1": "a"}})
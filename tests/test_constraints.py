@@ -0,0 +1,118 @@
+"""
+Tests for machine readable constraints and size based routing.
+
+Covers:
+- type, length and range checks before dispatch
+- routing oversized smoothing input to the chunked variant
+- loading limits and routes from JSON config
+"""
+
+from array import array
+from pathlib import Path
+
+import pytest
+
+from kl_kernel_logic.examples_foundations import smooth_measurements
+
+from kl_exec_poc import Orchestrator
+from kl_exec_poc.config import load_config, build_registry_and_policies
+from kl_exec_poc.constraints import ArgumentConstraint, ConstraintViolation, check_arguments
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _orchestrator():
+    cfg_path = _project_root() / "config" / "operations.json"
+    registry, policy_map = build_registry_and_policies(load_config(cfg_path))
+    return Orchestrator(registry=registry), policy_map
+
+
+def test_check_arguments():
+    constraints = {
+        "values": ArgumentConstraint(type="series", required=True, max_length=3, min_value=0),
+        "scale": ArgumentConstraint(type="number", max_value=10),
+    }
+
+    check_arguments(constraints, {"values": [1.0, 2.0]})
+    check_arguments(constraints, {"values": array("d", [0.0]), "scale": 2})
+
+    with pytest.raises(ConstraintViolation, match="Missing required"):
+        check_arguments(constraints, {})
+    with pytest.raises(ConstraintViolation, match="type series"):
+        check_arguments(constraints, {"values": "1 2 3"})
+    with pytest.raises(ConstraintViolation, match="length 4"):
+        check_arguments(constraints, {"values": [1.0] * 4})
+    with pytest.raises(ConstraintViolation, match="below"):
+        check_arguments(constraints, {"values": [1.0, -1.0]})
+    with pytest.raises(ConstraintViolation, match="above"):
+        check_arguments(constraints, {"values": [1.0], "scale": 11})
+    with pytest.raises(ConstraintViolation, match="type number"):
+        check_arguments(constraints, {"values": [1.0], "scale": True})
+
+    with pytest.raises(ValueError, match="Unknown argument type"):
+        ArgumentConstraint(type="blob")
+
+
+def test_config_limits_are_loaded():
+    configs = {cfg.key: cfg for cfg in load_config(_project_root() / "config" / "operations.json")}
+
+    smooth = configs["signals.smooth"]
+    assert smooth.limits["values"].max_length == 10_000
+    assert smooth.routes[0].kind == "signals_smooth_chunked"
+
+
+def test_invalid_input_rejected_before_dispatch():
+    orchestrator, policy_map = _orchestrator()
+
+    with pytest.raises(ConstraintViolation):
+        orchestrator.execute_operation(
+            key="text.simplify",
+            user_id="test-user",
+            request_id="bad-1",
+            policy=policy_map["text.simplify"],
+            text=["not", "text"],
+        )
+
+
+def test_oversized_smoothing_is_routed():
+    orchestrator, policy_map = _orchestrator()
+    values = [float(i % 7) for i in range(25_000)]
+
+    bundle = orchestrator.execute_operation(
+        key="signals.smooth",
+        user_id="test-user",
+        request_id="big-1",
+        policy=policy_map["signals.smooth"],
+        values=values,
+    )
+
+    result = bundle["execution"]["result"]
+    assert len(result) == len(values)
+    # Away from the cut, a prefix smooths exactly like the full series.
+    assert result[:999] == pytest.approx(smooth_measurements(values[:1000])[:999])
+
+    trace = bundle["execution"]["trace"]
+    assert trace[0]["stage"] == "start"
+    assert trace[-1]["stage"] == "end"
+    route = [entry for entry in trace if entry["stage"] == "route"]
+    assert route == [
+        {
+            "stage": "route",
+            "user_id": "test-user",
+            "request_id": "big-1",
+            "kind": "signals_smooth_chunked",
+            "field": "values",
+            "length": 25_000,
+        }
+    ]
+
+    small = orchestrator.execute_operation(
+        key="signals.smooth",
+        user_id="test-user",
+        request_id="small-1",
+        policy=policy_map["signals.smooth"],
+        values=[1.0, 2.0, 3.0, 4.0],
+    )
+    assert all(entry["stage"] != "route" for entry in small["execution"]["trace"])
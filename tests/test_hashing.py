@@ -0,0 +1,152 @@
+"""
+Tests for canonical bundle hashing and journal verification.
+
+Covers:
+- digests ignore volatile trace fields and key order
+- backend decision fields are volatile only in the backend stage
+- compact series hash like the lists they serialise to
+- digest index round trip and truncated records, also when appending
+- verify against an unchanged and a changed config
+"""
+
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc.cli import main
+from kl_exec_poc.hashing import DigestIndexWriter, bundle_digest, iter_digest_index
+from kl_exec_poc.journal import journal_digests, verify_journal
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _bundle(result, timestamp: float = 1.0):
+    return {
+        "psi": {"operation_type": "transform", "logical_binding": "x"},
+        "execution": {
+            "result": result,
+            "trace": [
+                {"stage": "start", "request_id": "r1", "timestamp": timestamp},
+                {"stage": "end", "request_id": "r1", "timestamp": timestamp + 0.5},
+            ],
+        },
+    }
+
+
+def test_digest_is_canonical():
+    base = bundle_digest(_bundle([1.0, 2.0]))
+
+    assert bundle_digest(_bundle([1.0, 2.0], timestamp=99.0)) == base
+    assert bundle_digest(json.loads(json.dumps(_bundle([1.0, 2.0])))) == base
+    assert bundle_digest(_bundle(array("d", [1.0, 2.0]))) == base
+    assert bundle_digest(_bundle(memoryview(array("d", [1.0, 2.0])))) == base
+
+    reordered = _bundle([1.0, 2.0])
+    reordered["psi"] = {"logical_binding": "x", "operation_type": "transform"}
+    assert bundle_digest(reordered) == base
+
+    assert bundle_digest(_bundle([1.0, 2.5])) != base
+    assert bundle_digest(_bundle([1, 2])) != base
+    changed_trace = _bundle([1.0, 2.0])
+    changed_trace["execution"]["trace"][0]["stage"] = "begin"
+    assert bundle_digest(changed_trace) != base
+
+
+def test_backend_fields_are_volatile_only_for_backend_stage():
+    base = _bundle([1.0, 2.0])
+    base["execution"]["trace"].append(
+        {"stage": "backend", "backend": "python", "reason": "measured", "estimates_ms": {}}
+    )
+    other_backend = json.loads(json.dumps(base))
+    other_backend["execution"]["trace"][-1].update(backend="numpy", reason="explore")
+    assert bundle_digest(other_backend) == bundle_digest(base)
+
+    with_reason = _bundle([1.0, 2.0])
+    with_reason["execution"]["trace"][0]["reason"] = "a"
+    changed_reason = _bundle([1.0, 2.0])
+    changed_reason["execution"]["trace"][0]["reason"] = "b"
+    assert bundle_digest(with_reason) != bundle_digest(changed_reason)
+
+
+def test_digest_index_round_trip(tmp_path: Path):
+    path = tmp_path / "run.digests"
+    with DigestIndexWriter(path) as writer:
+        writer.append("r1", b"\x01" * 32)
+        writer.append("rä", b"\x02" * 32)
+
+    with path.open("ab") as fh:
+        fh.write(b"\x05\x00abc")  # torn record
+
+    assert list(iter_digest_index(path)) == [("r1", b"\x01" * 32), ("rä", b"\x02" * 32)]
+    # 10 byte header plus two records of 2 + id + 32 bytes.
+    assert path.stat().st_size - 5 == 10 + (2 + 2 + 32) + (2 + 3 + 32)
+
+    # Appending after the crash starts at the end of the last full record.
+    with DigestIndexWriter(path) as writer:
+        writer.append("r3", b"\x03" * 32)
+    with DigestIndexWriter(path) as writer:
+        writer.append("r4", b"\x04" * 32)
+    assert [request_id for request_id, _ in iter_digest_index(path)] == ["r1", "rä", "r3", "r4"]
+
+    torn_header = tmp_path / "torn.digests"
+    torn_header.write_bytes(b"KLDIG")
+    with DigestIndexWriter(torn_header) as writer:
+        writer.append("r1", b"\x01" * 32)
+    assert list(iter_digest_index(torn_header)) == [("r1", b"\x01" * 32)]
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"something else")
+    with pytest.raises(ValueError, match="Not a digest index"):
+        DigestIndexWriter(other)
+    assert other.read_bytes() == b"something else"
+
+
+def test_verify_matches_and_reports_mismatches(tmp_path: Path, capsys):
+    requests_path = tmp_path / "requests.jsonl"
+    lines = [
+        {"op": "text.simplify", "request_id": f"t{i}", "kwargs": {"text": f"  Doc {i}  "}}
+        for i in range(20)
+    ]
+    lines.append({"op": "signals.smooth", "request_id": "s1", "kwargs": {"values": [1.0, 2.0, 4.0]}})
+    requests_path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+
+    journal_path = tmp_path / "run.journal"
+    index_path = tmp_path / "run.digests"
+    cfg = str(_config_path())
+
+    rc = main(
+        [
+            "batch",
+            "--requests", str(requests_path),
+            "--journal", str(journal_path),
+            "--index", str(index_path),
+            "--config", cfg,
+        ]
+    )
+    assert rc == 0
+    capsys.readouterr()
+
+    assert dict(iter_digest_index(index_path)) == journal_digests(journal_path)
+
+    rc = main(["verify", "--journal", str(journal_path), "--index", str(index_path), "--config", cfg])
+    assert rc == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["checked"], report["matched"], report["unverified"]) == (21, 21, 0)
+
+    # Without an index the digests are computed from the journal.
+    report = verify_journal(journal_path, cfg, workers=2, chunk_size=3)
+    assert report["matched"] == 21
+
+    changed = json.loads(Path(cfg).read_text(encoding="utf-8"))
+    smooth = next(op for op in changed["operations"] if op["key"] == "signals.smooth")
+    smooth["logical_binding"] = "application.domain.signals.v2"
+    changed_path = tmp_path / "changed.json"
+    changed_path.write_text(json.dumps(changed), encoding="utf-8")
+
+    report = verify_journal(journal_path, changed_path, index_path=index_path, max_reported=5)
+    assert report["mismatched"] == 1
+    assert report["mismatches"] == ["s1"]
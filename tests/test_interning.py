@@ -0,0 +1,135 @@
+"""
+Tests for interned Psi definitions and policies.
+
+Covers:
+- equal settings share one immutable object
+- interned objects compare equal to plain ones
+- bundles share the precomputed psi description
+- retained memory per request, measured with tracemalloc
+"""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from kl_kernel_logic import EffectClass, ExecutionPolicy, OperationType, PsiDefinition
+from kl_kernel_logic.examples.text_simplify import simplify_text
+
+from kl_exec_poc import OperationMetadata, OperationRegistry, Orchestrator
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.hashing import bundle_digest
+from kl_exec_poc.interning import intern_policy, intern_psi
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def test_policies_are_interned_and_immutable():
+    registry, policies = build_registry_and_policies(load_config(_config_path()))
+
+    # All configured operations use the same policy settings.
+    assert len({id(policy) for policy in policies.values()}) == 1
+    policy = policies["text.simplify"]
+    assert policy is intern_policy(allow_network=False, allow_filesystem=False, timeout_seconds=5)
+    assert policy is KLBridge.build_policy(timeout_seconds=5)
+    assert isinstance(policy, ExecutionPolicy)
+
+    with pytest.raises(AttributeError):
+        policy.allow_network = True
+    assert policy.allow_network is False
+
+    psi = registry.get("text.simplify").psi
+    assert psi is intern_psi(psi.logical_binding, psi.constraints)
+    with pytest.raises(AttributeError):
+        psi.logical_binding = "changed"
+
+
+def test_interned_objects_equal_plain_instances():
+    psi = intern_psi("application.test.equality")
+    plain = PsiDefinition(
+        OperationType.TRANSFORM, "application.test.equality", EffectClass.NON_STATE_CHANGING, None
+    )
+    assert psi == plain and plain == psi
+    assert psi != PsiDefinition(
+        OperationType.TRANSFORM, "application.test.other", EffectClass.NON_STATE_CHANGING, None
+    )
+    assert psi != "application.test.equality"
+    assert len({psi, intern_psi("application.test.equality"), intern_psi("application.test.other")}) == 2
+
+    policy = intern_policy(timeout_seconds=7)
+    assert policy == ExecutionPolicy(allow_network=False, allow_filesystem=False, timeout_seconds=7)
+    assert ExecutionPolicy(timeout_seconds=7) == policy
+    assert policy != ExecutionPolicy(timeout_seconds=8)
+    assert hash(policy) == hash(intern_policy(timeout_seconds=7))
+
+
+def test_bundles_share_the_psi_description():
+    registry, policies = build_registry_and_policies(load_config(_config_path()))
+    orchestrator = Orchestrator(registry=registry)
+
+    bundles = [
+        orchestrator.execute_operation(
+            key="text.simplify",
+            user_id="u1",
+            request_id=f"r{i}",
+            policy=policies["text.simplify"],
+            text=f" Text {i} ",
+        )
+        for i in range(3)
+    ]
+
+    shared = registry.get("text.simplify").psi.describe()
+    assert all(bundle["psi"] is shared for bundle in bundles)
+    with pytest.raises(TypeError):
+        bundles[0]["psi"]["logical_binding"] = "changed"
+
+    # Serialisation and hashing are unchanged by sharing.
+    round_tripped = json.loads(json.dumps(bundles[0]))
+    assert round_tripped["psi"] == dict(shared)
+    assert bundle_digest(round_tripped) == bundle_digest(bundles[0])
+
+
+def _retained_bytes(psi: PsiDefinition, count: int) -> int:
+    registry = OperationRegistry()
+    registry.register("text.simplify", OperationMetadata(psi=psi, task=simplify_text))
+    orchestrator = Orchestrator(registry=registry)
+    policy = intern_policy(timeout_seconds=5)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        bundles = [
+            orchestrator.execute_operation(
+                key="text.simplify",
+                user_id="u1",
+                request_id="r",
+                policy=policy,
+                text="x",
+            )
+            for _ in range(count)
+        ]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(bundles) == count
+    return after - before
+
+
+def test_interned_psi_reduces_retained_memory_per_request():
+    count = 2_000
+    plain = PsiDefinition(
+        operation_type=OperationType.TRANSFORM,
+        logical_binding="application.domain.text.memory_test",
+        effect_class=EffectClass.NON_STATE_CHANGING,
+        constraints="Input is plain text.",
+    )
+    interned = intern_psi("application.domain.text.memory_test", "Input is plain text.")
+
+    plain_bytes = _retained_bytes(plain, count)
+    interned_bytes = _retained_bytes(interned, count)
+
+    # A psi dict with four entries is well above 100 bytes per bundle.
+    assert (plain_bytes - interned_bytes) / count > 100
@@ -0,0 +1,175 @@
+"""
+Tests for the durable request journal.
+
+Covers:
+- group commit and reading records back
+- recovery after a crash (torn last line, pending requests)
+- appending after a crash repairs the torn last line
+- batch runner skipping completed and replaying pending requests
+- replay against a changed config via the CLI
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc.cli import main
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.journal import (
+    JournalRequest,
+    JournaledBatchRunner,
+    RequestJournal,
+    read_journal,
+    recover_journal,
+)
+from kl_exec_poc.orchestrator import Orchestrator
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _runner(journal_path: Path) -> JournaledBatchRunner:
+    registry, policies = build_registry_and_policies(load_config(_config_path()))
+    return JournaledBatchRunner(Orchestrator(registry=registry), policies, journal_path, fsync=False)
+
+
+def _text_request(request_id: str, text: str) -> JournalRequest:
+    return JournalRequest(
+        key="text.simplify",
+        user_id="u1",
+        request_id=request_id,
+        kwargs={"text": text},
+    )
+
+
+def test_group_commit_writes_records_in_order(tmp_path: Path):
+    path = tmp_path / "run.journal"
+    with RequestJournal(path, group_size=4, group_interval_ms=1000.0) as journal:
+        for i in range(10):
+            journal.record_accepted(_text_request(f"r{i}", "x"))
+        journal.record_completed("r0", {"execution": {"result": "x"}}, wait=True)
+        assert journal.commits >= 1
+
+    records = list(read_journal(path))
+    assert [r["request_id"] for r in records[:10]] == [f"r{i}" for i in range(10)]
+    assert records[-1]["type"] == "completed"
+    # Ten accepted plus one completed record, written in far fewer commits.
+    assert len(records) == 11
+
+
+def test_recover_ignores_torn_last_line(tmp_path: Path):
+    path = tmp_path / "run.journal"
+    with RequestJournal(path) as journal:
+        journal.record_accepted(_text_request("r1", "A"))
+        journal.record_completed("r1", {"execution": {"result": "a"}})
+        journal.record_accepted(_text_request("r2", "B"))
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write('{"type": "completed", "request_id": "r2", "bun')
+
+    state = recover_journal(path)
+    assert state.finished == {"r1"}
+    assert [r.request_id for r in state.pending] == ["r2"]
+
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write("\n" + json.dumps({"type": "failed", "request_id": "r3", "error": "x"}) + "\n")
+    with pytest.raises(ValueError):
+        recover_journal(path)
+
+
+def test_append_after_crash_repairs_torn_line(tmp_path: Path):
+    path = tmp_path / "run.journal"
+    for restart in range(2):
+        with RequestJournal(path, fsync=False) as journal:
+            journal.record_accepted(_text_request(f"r{restart}", "A"), wait=True)
+        # Crash in the middle of the next write.
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write('{"type":"accepted","request_id":"lost')
+
+    with RequestJournal(path, fsync=False) as journal:
+        journal.record_accepted(_text_request("r2", "C"), wait=True)
+
+    state = recover_journal(path)
+    assert [r.request_id for r in state.pending] == ["r0", "r1", "r2"]
+    assert path.read_text(encoding="utf-8").count("lost") == 0
+
+    # A journal that is only a torn line becomes empty.
+    torn = tmp_path / "torn.journal"
+    torn.write_text('{"type":"acc', encoding="utf-8")
+    RequestJournal(torn, fsync=False).close()
+    assert torn.read_bytes() == b""
+
+
+def test_batch_runner_resumes_after_crash(tmp_path: Path):
+    path = tmp_path / "run.journal"
+    with RequestJournal(path) as journal:
+        journal.record_accepted(_text_request("r1", "  One  "))
+        journal.record_completed("r1", {"execution": {"result": "one"}})
+        # Accepted before the crash, never completed.
+        journal.record_accepted(_text_request("r2", "  Two  "))
+
+    runner = _runner(path)
+    requests = [_text_request(f"r{i}", f"  Item {i} ") for i in (1, 2, 3)]
+    results = list(runner.run(requests))
+
+    assert [(r.request.request_id, r.replayed) for r in results] == [("r2", True), ("r3", False)]
+    assert results[0].bundle["execution"]["result"] == "two"
+    assert results[1].bundle["execution"]["result"] == "item 3"
+    assert (runner.replayed, runner.executed, runner.skipped) == (1, 2, 2)
+
+    # Everything is finished now, a second run does nothing.
+    assert list(_runner(path).run(requests)) == []
+
+
+def test_batch_runner_records_failures(tmp_path: Path):
+    path = tmp_path / "run.journal"
+    runner = _runner(path)
+    bad = JournalRequest(key="text.simplify", user_id="u1", request_id="bad", kwargs={})
+
+    results = list(runner.run([bad]))
+    assert results[0].bundle is None
+    assert "ConstraintViolation" in results[0].error
+    assert runner.failed == 1
+    assert recover_journal(path).finished == {"bad"}
+
+
+def test_cli_batch_and_replay(tmp_path: Path, capsys):
+    requests_path = tmp_path / "requests.jsonl"
+    requests_path.write_text(
+        "\n".join(
+            [
+                json.dumps({"op": "text.simplify", "request_id": "t1", "kwargs": {"text": " A  B "}}),
+                json.dumps({"op": "signals.smooth", "kwargs": {"values": [1.0, 2.0, 3.0]}}),
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    journal_path = tmp_path / "run.journal"
+    cfg = str(_config_path())
+
+    rc = main(["batch", "--requests", str(requests_path), "--journal", str(journal_path), "--config", cfg])
+    assert rc == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["request_id"] for line in lines] == ["t1", "batch-2"]
+    assert lines[0]["bundle"]["execution"]["result"] == "a b"
+
+    rc = main(["replay", "--journal", str(journal_path), "--config", cfg])
+    assert rc == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report == {"checked": 2, "mismatches": [], "errors": []}
+
+    # A config where text.simplify maps to a different kind is a regression.
+    changed = json.loads(Path(cfg).read_text(encoding="utf-8"))
+    text_op = next(op for op in changed["operations"] if op["key"] == "text.simplify")
+    text_op["kind"] = "llm_stub"
+    text_op["limits"] = {}
+    changed_path = tmp_path / "changed.json"
+    changed_path.write_text(json.dumps(changed), encoding="utf-8")
+
+    rc = main(["replay", "--journal", str(journal_path), "--config", str(changed_path)])
+    assert rc == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["checked"] == 2
+    assert [m["request_id"] for m in report["mismatches"]] + [e["request_id"] for e in report["errors"]] == ["t1"]
@@ -0,0 +1,208 @@
+"""
+Tests for operation kinds and plugin resolution.
+
+Covers:
+- capabilities of the built-in kinds
+- lazy, cached "module:attr" references in config
+- entry point plugins
+- list conversion for kinds that are not vectorized
+- async kinds on the sync and async execution paths
+"""
+
+import asyncio
+import json
+import sys
+import textwrap
+import threading
+from array import array
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc import Orchestrator
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.kinds import KindSpec, clear_kind_cache, resolve_kind
+
+
+@pytest.fixture(autouse=True)
+def _fresh_kinds():
+    clear_kind_cache()
+    yield
+    clear_kind_cache()
+
+
+def _write_module(tmp_path: Path, name: str, source: str) -> None:
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(source), encoding="utf-8")
+
+
+def _write_config(tmp_path: Path, *operations: dict) -> Path:
+    path = tmp_path / "operations.json"
+    path.write_text(json.dumps({"operations": list(operations)}), encoding="utf-8")
+    return path
+
+
+def _operation(key: str, kind: str, **extra) -> dict:
+    return {
+        "key": key,
+        "kind": kind,
+        "logical_binding": f"application.test.{key}",
+        "policy": {"timeout_seconds": 5},
+        **extra,
+    }
+
+
+def _run(config_path: Path, key: str, **kwargs):
+    registry, policies = build_registry_and_policies(load_config(config_path))
+    orchestrator = Orchestrator(registry=registry)
+    return orchestrator.execute_operation(key=key, user_id="u1", request_id="r1", policy=policies[key], **kwargs)
+
+
+def test_builtin_kind_capabilities():
+    assert resolve_kind("llm_stub").capabilities == {"batch", "streaming", "adapter"}
+    assert resolve_kind("signals_smooth").capabilities == {"vectorized"}
+    assert resolve_kind("text_simplify").capabilities == frozenset()
+
+
+def test_module_reference_is_imported_lazily_and_cached(tmp_path, monkeypatch):
+    _write_module(
+        tmp_path,
+        "kl_test_plugin_lazy",
+        """
+        def shout(text):
+            return text.upper() + "!"
+
+        def unused(text):
+            return text
+        """,
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = _write_config(tmp_path, _operation("test.shout", "kl_test_plugin_lazy:shout"))
+
+    configs = load_config(path)
+    assert "kl_test_plugin_lazy" not in sys.modules
+
+    registry, _ = build_registry_and_policies(configs)
+    assert "kl_test_plugin_lazy" in sys.modules
+    assert resolve_kind("kl_test_plugin_lazy:shout") is resolve_kind("kl_test_plugin_lazy:shout")
+
+    bundle = _run(path, "test.shout", text="hi")
+    assert bundle["execution"]["result"] == "HI!"
+
+
+def test_entry_point_plugin_with_capabilities(tmp_path, monkeypatch):
+    _write_module(
+        tmp_path,
+        "kl_test_plugin_ep",
+        """
+        from kl_exec_poc.kinds import KindSpec
+
+        def total(values):
+            return sum(values)
+
+        def total_batch(values_list):
+            return [sum(values) for values in values_list]
+
+        SPEC = KindSpec(task=total, batch_task=total_batch, batch_param="values", vectorized=True)
+        """,
+    )
+    dist_info = tmp_path / "kl_test_plugin_ep-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: kl-test-plugin-ep\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[kl_exec_poc.operation_kinds]\nfast_total = kl_test_plugin_ep:SPEC\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    kind = resolve_kind("fast_total")
+    assert kind.capabilities == {"batch", "vectorized"}
+
+    path = _write_config(
+        tmp_path,
+        _operation("test.total", "fast_total", batching={"max_batch_size": 4, "max_wait_ms": 1}),
+    )
+    values = memoryview(array("d", [1.0, 2.0, 3.0]))
+    assert _run(path, "test.total", values=values)["execution"]["result"] == 6.0
+
+
+def test_unknown_kinds_are_rejected(tmp_path):
+    with pytest.raises(KeyError, match="Unknown operation kind"):
+        resolve_kind("does_not_exist")
+    with pytest.raises(KeyError, match="Cannot load operation kind"):
+        resolve_kind("kl_no_such_module:task")
+
+    path = _write_config(tmp_path, _operation("test.bad", "kl_exec_poc.ops.text:no_such_task"))
+    with pytest.raises(KeyError, match="Unknown operation kind in config"):
+        build_registry_and_policies(load_config(path))
+
+
+def test_buffers_are_lists_unless_the_kind_is_vectorized(tmp_path, monkeypatch):
+    _write_module(
+        tmp_path,
+        "kl_test_plugin_types",
+        """
+        from kl_exec_poc.kinds import KindSpec
+
+        def type_name(values):
+            return type(values).__name__
+
+        VECTORIZED = KindSpec(task=type_name, vectorized=True)
+        """,
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = _write_config(
+        tmp_path,
+        _operation("test.plain", "kl_test_plugin_types:type_name"),
+        _operation("test.vectorized", "kl_test_plugin_types:VECTORIZED"),
+    )
+    values = memoryview(array("d", [1.0, 2.0]))
+
+    assert _run(path, "test.plain", values=values)["execution"]["result"] == "list"
+    assert _run(path, "test.vectorized", values=values)["execution"]["result"] == "memoryview"
+
+
+def test_async_kind_runs_on_the_callers_loop(tmp_path, monkeypatch):
+    _write_module(
+        tmp_path,
+        "kl_test_plugin_async",
+        """
+        import asyncio
+        import threading
+
+        async def fetch(text):
+            await asyncio.sleep(0.01)
+            return [text, threading.get_ident()]
+        """,
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = _write_config(tmp_path, _operation("test.fetch", "kl_test_plugin_async:fetch"))
+    registry, policies = build_registry_and_policies(load_config(path))
+    orchestrator = Orchestrator(registry=registry)
+    assert resolve_kind("kl_test_plugin_async:fetch").capabilities == {"async"}
+
+    # Synchronous path: the coroutine is run to completion.
+    bundle = orchestrator.execute_operation(
+        key="test.fetch", user_id="u1", request_id="r1", policy=policies["test.fetch"], text="a"
+    )
+    assert bundle["execution"]["result"][0] == "a"
+
+    async def main():
+        bundles = await asyncio.gather(
+            *(
+                orchestrator.execute_operation_async(
+                    key="test.fetch", user_id="u1", request_id=f"r{i}", policy=policies["test.fetch"], text=str(i)
+                )
+                for i in range(5)
+            )
+        )
+        return bundles, threading.get_ident()
+
+    bundles, loop_thread = asyncio.run(main())
+    assert [b["execution"]["result"][0] for b in bundles] == ["0", "1", "2", "3", "4"]
+    assert all(b["execution"]["result"][1] == loop_thread for b in bundles)
+
+
+def test_kind_spec_validation():
+    with pytest.raises(ValueError):
+        KindSpec()
+    with pytest.raises(ValueError):
+        KindSpec(task=len, batch_task=len)
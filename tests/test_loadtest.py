@@ -0,0 +1,214 @@
+"""
+Tests for the load generator and the no-op bridge.
+
+Covers:
+- NullBridge bundles through the orchestrator
+- synthetic mixes: weights, sizes and user skew
+- recorded workloads from batch files and journals
+- open loop stages, percentiles and saturation detection
+- the loadtest CLI command
+"""
+
+import json
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from kl_kernel_logic import EffectClass, OperationType, PsiDefinition
+
+from kl_exec_poc import OperationMetadata, OperationRegistry, Orchestrator
+from kl_exec_poc.adapters import KLBridge, NullBridge
+from kl_exec_poc.cli import main
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.journal import JournalRequest, RequestJournal
+from kl_exec_poc.loadtest import (
+    OperationMix,
+    OrchestratorTarget,
+    RecordedWorkload,
+    SyntheticWorkload,
+    latency_summary,
+    run_load_test,
+)
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _mix_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "loadtest_mix.json"
+
+
+def test_null_bridge_produces_kernel_shaped_bundles():
+    registry, policies = build_registry_and_policies(load_config(_config_path()))
+    orchestrator = Orchestrator(registry=registry, bridge=NullBridge())
+
+    bundle = orchestrator.execute_operation(
+        key="text.simplify", user_id="u1", request_id="r1", policy=policies["text.simplify"], text="  A   B  "
+    )
+    assert bundle["execution"]["result"] == "a b"
+    trace = bundle["execution"]["trace"]
+    assert [trace[0]["stage"], trace[-1]["stage"]] == ["start", "end"]
+    assert trace[0]["request_id"] == "r1"
+    assert datetime.fromisoformat(trace[0]["timestamp"]) <= datetime.fromisoformat(trace[-1]["timestamp"])
+    assert bundle["psi"]["logical_binding"] == registry.get("text.simplify").psi.logical_binding
+
+    skipped = Orchestrator(registry=registry, bridge=NullBridge(run_task=False)).execute_operation(
+        key="text.simplify", user_id="u1", request_id="r2", policy=policies["text.simplify"], text="x"
+    )
+    assert skipped["execution"]["result"] is None
+
+
+def test_synthetic_workload_follows_the_mix():
+    workload = SyntheticWorkload(
+        [
+            OperationMix("text.simplify", weight=3, text_length=(10, 100)),
+            OperationMix("signals.smooth", weight=1, series_length=(5, 50)),
+        ],
+        users=50,
+        user_skew=1.2,
+        variants=16,
+        seed=3,
+    )
+    requests = [workload.request(i) for i in range(4_000)]
+
+    ops = Counter(request.key for request in requests)
+    assert 0.70 < ops["text.simplify"] / len(requests) < 0.80
+    assert all(10 <= len(r.kwargs["text"]) <= 100 for r in requests if r.key == "text.simplify")
+    assert all(5 <= len(r.kwargs["values"]) <= 50 for r in requests if r.key == "signals.smooth")
+
+    users = Counter(request.user_id for request in requests)
+    assert users.most_common(1)[0][0] == "user-1"
+    assert len(users) > 20
+    assert len({request.request_id for request in requests}) == len(requests)
+
+    again = SyntheticWorkload.from_dict(
+        {
+            "operations": [
+                {"op": "text.simplify", "weight": 3, "text_length": [10, 100]},
+                {"op": "signals.smooth", "series_length": [5, 50]},
+            ],
+            "users": 50,
+            "user_skew": 1.2,
+            "variants": 16,
+            "seed": 3,
+        }
+    )
+    assert [again.request(i) for i in range(100)] == requests[:100]
+
+    with pytest.raises(ValueError):
+        SyntheticWorkload.from_dict({"operations": [{"weight": 1}]})
+
+
+def test_recorded_workload_from_batch_file_and_journal(tmp_path):
+    batch = tmp_path / "requests.jsonl"
+    batch.write_text(
+        json.dumps({"op": "text.simplify", "request_id": "a", "kwargs": {"text": " X "}})
+        + "\n"
+        + json.dumps({"op": "signals.smooth", "request_id": "b", "kwargs": {"values": [1.0, 2.0]}})
+        + "\n"
+    )
+    workload = RecordedWorkload.from_file(batch)
+    replayed = [workload.request(i) for i in range(4)]
+    assert [r.key for r in replayed] == ["text.simplify", "signals.smooth"] * 2
+    assert replayed[2].kwargs == {"text": " X "}
+    assert replayed[0].request_id != replayed[2].request_id
+
+    journal_path = tmp_path / "run.journal"
+    with RequestJournal(journal_path, fsync=False) as journal:
+        journal.record_accepted(
+            JournalRequest(key="text.simplify", user_id="u7", request_id="j1", kwargs={"text": "Y"}), wait=True
+        )
+    recorded = RecordedWorkload.from_file(journal_path).request(0)
+    assert (recorded.key, recorded.user_id, recorded.kwargs) == ("text.simplify", "u7", {"text": "Y"})
+
+
+def test_latency_summary_percentiles():
+    summary = latency_summary([float(i) for i in range(1, 1001)])
+    assert summary["p50"] == 500.0
+    assert summary["p99"] == 990.0
+    assert summary["p999"] == 999.0
+    assert summary["max"] == 1000.0
+    assert latency_summary([])["p99"] is None
+
+
+def _sleeping_target(sleep_ms: float) -> OrchestratorTarget:
+    def task(text: str) -> str:
+        time.sleep(sleep_ms / 1000.0)
+        return text
+
+    registry = OperationRegistry()
+    psi = PsiDefinition(
+        operation_type=OperationType.TRANSFORM,
+        logical_binding="application.test.sleep",
+        effect_class=EffectClass.NON_STATE_CHANGING,
+    )
+    registry.register("test.sleep", OperationMetadata(psi=psi, task=task))
+    orchestrator = Orchestrator(registry=registry, bridge=NullBridge())
+    return OrchestratorTarget(orchestrator, {"test.sleep": KLBridge.build_policy()}, concurrency=1)
+
+
+def test_open_loop_stages_detect_saturation():
+    # One thread with 10 ms per request serves at most about 100 requests/s.
+    target = _sleeping_target(10.0)
+    workload = SyntheticWorkload([OperationMix("test.sleep", text_length=(1, 5))])
+    try:
+        report = run_load_test(target, workload, rates=[20, 400, 800], duration_s=0.5, max_in_flight=50)
+    finally:
+        target.close()
+
+    first, second = report["stages"]
+    assert not first["saturated"]
+    assert first["errors"] == 0 and first["completed"] == first["sent"]
+    assert first["latency_ms"]["p50"] >= 10.0
+    assert first["throughput_rps"] == pytest.approx(first["offered_rps"], rel=0.2)
+
+    assert second["saturated"]
+    assert second["dropped"] > 0
+    assert second["max_in_flight"] == 50
+    # Queueing delay is part of the latency in an open loop test.
+    assert second["latency_ms"]["p99"] > 100.0
+
+    saturation = report["saturation"]
+    assert saturation["saturated"] and saturation["rate"] == 400
+    assert saturation["max_sustained_rps"] == first["throughput_rps"]
+
+
+def test_loadtest_cli_writes_a_report(tmp_path, monkeypatch):
+    bridges = []
+
+    class RecordingBridge(NullBridge):
+        def __init__(self, run_task: bool = True) -> None:
+            super().__init__(run_task=run_task)
+            bridges.append(self)
+
+    monkeypatch.setattr("kl_exec_poc.cli.NullBridge", RecordingBridge)
+    output = tmp_path / "report.json"
+    args = [
+        "loadtest",
+        "--config",
+        str(_config_path()),
+        "--mix",
+        str(_mix_path()),
+        "--target",
+        "null",
+        "--rates",
+        "50",
+        "--duration",
+        "0.3",
+        "--output",
+        str(output),
+    ]
+    assert main(args) == 0
+    assert main(args + ["--run-tasks"]) == 0
+    # The null target skips the tasks unless asked to run them.
+    assert [bridge.run_task for bridge in bridges] == [False, True]
+
+    report = json.loads(output.read_text())
+    assert report["target"] == "null"
+    (stage,) = report["stages"]
+    assert stage["errors"] == 0
+    assert stage["completed"] == stage["sent"] > 0
+    assert set(stage["latency_ms"]) == {"mean", "p50", "p90", "p99", "p999", "max"}
@@ -0,0 +1,109 @@
+"""
+Tests for compact numeric payloads in smoothing operations.
+
+Covers:
+- array.array, memoryview and NumPy input through the buffer protocol
+- results returned in the same compact form as the input
+- shared memory transport to worker processes
+"""
+
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from kl_kernel_logic.examples_foundations import smooth_measurements
+
+from kl_exec_poc import Orchestrator
+from kl_exec_poc.config import load_config, build_registry_and_policies
+from kl_exec_poc.ops.signals import smooth_series
+from kl_exec_poc.shared_buffers import SharedSeriesBuffer, attach_series, smooth_in_process
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def test_smooth_series_keeps_compact_form():
+    values = [1.0, 2.0, 3.0, 4.0]
+
+    assert smooth_series(values) == [1.5, 2.0, 3.0, 3.5]
+
+    as_array = smooth_series(array("d", values))
+    assert isinstance(as_array, array)
+    assert as_array.typecode == "d"
+    assert as_array.tolist() == [1.5, 2.0, 3.0, 3.5]
+
+    as_f32 = smooth_series(array("f", values))
+    assert as_f32.typecode == "f"
+
+    as_view = smooth_series(memoryview(array("d", values)))
+    assert isinstance(as_view, memoryview)
+    assert as_view.tolist() == [1.5, 2.0, 3.0, 3.5]
+
+    assert smooth_series(array("d")).tolist() == []
+    assert smooth_series(array("d", [7.0])).tolist() == [7.0]
+
+
+def test_buffer_path_matches_reference():
+    rng = random.Random(42)
+    values = [rng.uniform(-100, 100) for _ in range(1_000)]
+
+    compact = smooth_series(array("d", values)).tolist()
+    assert compact == pytest.approx(smooth_measurements(values), rel=1e-12)
+
+
+def test_buffer_path_rejects_non_float_and_oversized_input():
+    with pytest.raises(TypeError):
+        smooth_series(array("i", [1, 2, 3]))
+    with pytest.raises(ValueError):
+        smooth_series(array("d", bytes(8 * 10_001)))
+
+
+def test_numpy_input_returns_numpy():
+    np = pytest.importorskip("numpy")
+
+    values = np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32)
+    result = smooth_series(values)
+
+    assert isinstance(result, np.ndarray)
+    assert result.dtype == np.float32
+    assert result.tolist() == [1.5, 2.0, 3.0, 3.5]
+
+
+def test_shared_memory_round_trip_and_worker_process():
+    with SharedSeriesBuffer.from_values(array("d", [1.0, 2.0])) as buffer:
+        with attach_series(buffer.handle) as view:
+            assert view.tolist() == [1.0, 2.0]
+            view[0] = 5.0
+        assert buffer.to_array().tolist() == [5.0, 2.0]
+
+    values = array("d", [float(i) for i in range(20_000)])
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        result = smooth_in_process(executor, values)
+
+    assert isinstance(result, array)
+    assert len(result) == len(values)
+    assert result[0] == 0.5
+    assert result[1] == 1.0
+    assert result[-1] == 19_998.5
+
+
+def test_orchestrator_accepts_array_payload():
+    cfg_path = _project_root() / "config" / "operations.json"
+    registry, policy_map = build_registry_and_policies(load_config(cfg_path))
+    orchestrator = Orchestrator(registry=registry)
+
+    bundle = orchestrator.execute_operation(
+        key="signals.smooth",
+        user_id="test-user",
+        request_id="smooth-array-1",
+        policy=policy_map["signals.smooth"],
+        values=array("d", [1.0, 2.0, 3.0, 4.0]),
+    )
+
+    result = bundle["execution"]["result"]
+    assert isinstance(result, array)
+    assert result.tolist() == [1.5, 2.0, 3.0, 3.5]
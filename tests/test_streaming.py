@@ -0,0 +1,92 @@
+"""
+Tests for streaming LLM-style operations.
+
+Covers:
+- chunked output from LLMStub.generate_stream
+- chunks reaching the caller while the operation is still running
+- the final bundle and trace emitted at the end of the stream
+"""
+
+import threading
+
+import pytest
+
+from kl_kernel_logic import ExecutionPolicy
+
+from kl_exec_poc import OperationRegistry, OperationMetadata, Orchestrator
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.adapters.llm_stub import LLMStub, LLMStubConfig
+
+
+def _policy() -> ExecutionPolicy:
+    return ExecutionPolicy(allow_network=False, allow_filesystem=False, timeout_seconds=5)
+
+
+def test_generate_stream_chunks_join_to_full_output():
+    stub = LLMStub(LLMStubConfig(mode="upper", stream_chunk_tokens=2))
+    prompt = "  one two   three four five "
+
+    chunks = list(stub.generate_stream(prompt))
+
+    assert chunks == ["  ONE TWO   ", "THREE FOUR ", "FIVE "]
+    assert "".join(chunks) == stub.generate(prompt)["output"]
+    assert list(stub.generate_stream("")) == []
+
+
+def test_stream_chunks_arrive_before_completion():
+    release = threading.Event()
+
+    def gated_stream(prompt: str):
+        yield "first "
+        # The second chunk is only produced after the consumer has seen
+        # the first one, which proves chunks are delivered while running.
+        release.wait(5)
+        yield prompt
+
+    registry = OperationRegistry()
+    registry.register(
+        "test.stream",
+        OperationMetadata(
+            psi=KLBridge.build_transform_psi("test.stream"),
+            task=lambda prompt: "first " + prompt,
+            stream_task=gated_stream,
+        ),
+    )
+    orchestrator = Orchestrator(registry=registry)
+
+    stream = orchestrator.execute_operation_stream(
+        key="test.stream",
+        user_id="stream-user",
+        request_id="stream-1",
+        policy=_policy(),
+        prompt="second",
+    )
+    chunks = iter(stream)
+
+    assert next(chunks) == "first "
+    release.set()
+    assert list(chunks) == ["second"]
+
+    bundle = stream.bundle
+    assert bundle["execution"]["result"] == "first second"
+    trace = bundle["execution"]["trace"]
+    assert trace[0]["stage"] == "start"
+    assert trace[-1]["stage"] == "end"
+    assert trace[-1]["request_id"] == "stream-1"
+
+
+def test_stream_rejected_for_non_streaming_operation():
+    registry = OperationRegistry()
+    registry.register(
+        "test.plain",
+        OperationMetadata(psi=KLBridge.build_transform_psi("test.plain"), task=str.upper),
+    )
+    orchestrator = Orchestrator(registry=registry)
+
+    with pytest.raises(ValueError, match="does not support streaming"):
+        orchestrator.execute_operation_stream(
+            key="test.plain",
+            user_id="u",
+            request_id="r",
+            policy=_policy(),
+        )
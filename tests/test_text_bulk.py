@@ -0,0 +1,108 @@
+"""
+Tests for the bulk text simplification kind.
+
+Covers:
+- output identical to simplify_text from the KL foundations
+- list, iterator, JSONL and line delimited inputs
+- incremental chunk emission through a streaming execution
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kl_kernel_logic.examples.text_simplify import simplify_text
+
+from kl_exec_poc import Orchestrator
+from kl_exec_poc.config import load_config, build_registry_and_policies
+from kl_exec_poc.ops.text import simplify_bulk, simplify_bulk_chunks, simplify_documents
+
+DOCS = [
+    "  Hello   WORLD  ",
+    "tabs\tand\nnewlines\r\nMIXED",
+    "",
+    "   ",
+    "non breaking spaces　ÄÖÜ",
+    "ΟΔΟΣ ΣΟΦΟΣ",
+]
+
+
+def _bulk_orchestrator(tmp_path: Path):
+    cfg_path = tmp_path / "operations.json"
+    cfg_path.write_text(
+        json.dumps(
+            {
+                "operations": [
+                    {
+                        "key": "text.simplify_bulk",
+                        "kind": "text_simplify_bulk",
+                        "logical_binding": "application.domain.text.bulk",
+                        "policy": {"allow_filesystem": True, "timeout_seconds": 60},
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    registry, policy_map = build_registry_and_policies(load_config(cfg_path))
+    return Orchestrator(registry=registry), policy_map["text.simplify_bulk"]
+
+
+def test_bulk_output_matches_simplify_text():
+    assert simplify_documents(DOCS) == [simplify_text(doc) for doc in DOCS]
+    assert simplify_bulk(documents=iter(DOCS)) == [simplify_text(doc) for doc in DOCS]
+
+
+def test_bulk_reads_jsonl_and_line_files(tmp_path: Path):
+    jsonl = tmp_path / "docs.jsonl"
+    jsonl.write_text(
+        "\n".join([json.dumps("  A  B "), json.dumps({"text": "C\tD"}), ""]),
+        encoding="utf-8",
+    )
+    assert simplify_bulk(path=str(jsonl)) == ["a b", "c d"]
+
+    lines = tmp_path / "docs.txt"
+    lines.write_text("  One  \nTWO  three\n", encoding="utf-8")
+    assert simplify_bulk(path=str(lines)) == ["one", "two three"]
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text(json.dumps({"body": "x"}), encoding="utf-8")
+    with pytest.raises(ValueError, match="bad.jsonl:1"):
+        simplify_bulk(path=str(bad))
+
+    with pytest.raises(ValueError):
+        simplify_bulk()
+    with pytest.raises(TypeError):
+        simplify_bulk(documents="single string")
+
+
+def test_bulk_chunks_are_emitted_incrementally(tmp_path: Path):
+    chunks = list(simplify_bulk_chunks(documents=DOCS, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+
+    orchestrator, policy = _bulk_orchestrator(tmp_path)
+    docs = [f"  Doc   {i} " for i in range(25)]
+
+    stream = orchestrator.execute_operation_stream(
+        key="text.simplify_bulk",
+        user_id="corpus-user",
+        request_id="bulk-1",
+        policy=policy,
+        documents=docs,
+        chunk_size=10,
+    )
+    streamed = list(stream)
+
+    assert [len(chunk) for chunk in streamed] == [10, 10, 5]
+    expected = [simplify_text(doc) for doc in docs]
+    assert stream.bundle["execution"]["result"] == expected
+
+    bundle = orchestrator.execute_operation(
+        key="text.simplify_bulk",
+        user_id="corpus-user",
+        request_id="bulk-2",
+        policy=policy,
+        documents=docs,
+    )
+    assert bundle["execution"]["result"] == expected
@@ -0,0 +1,183 @@
+"""
+Tests for trace sampling and tiered trace retention.
+
+Covers:
+- deterministic head sampling by request id
+- summary and none levels
+- tail based retention of slow and failed executions
+- per operation tracing config applied by the orchestrator
+- full traces of tasks that raise
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kl_kernel_logic import EffectClass, OperationType, PsiDefinition
+
+from kl_exec_poc import OperationMetadata, OperationRegistry
+from kl_exec_poc.adapters import KLBridge
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.orchestrator import Orchestrator
+from kl_exec_poc.trace_store import TraceStore
+from kl_exec_poc.tracing import TracePolicy, apply_trace_policy, is_sampled
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _bundle(error: bool = False):
+    execution = {
+        "result": "x",
+        "trace": [
+            {"stage": "start", "user_id": "u1", "request_id": "r1", "timestamp": 1.0},
+            {"stage": "route", "user_id": "u1", "request_id": "r1", "kind": "k"},
+            {"stage": "end", "user_id": "u1", "request_id": "r1", "timestamp": 2.0},
+        ],
+    }
+    if error:
+        execution["error"] = "boom"
+    return {"psi": {}, "execution": execution}
+
+
+def test_head_sampling_is_deterministic_and_proportional():
+    ids = [f"req-{i}" for i in range(20_000)]
+    sampled = [request_id for request_id in ids if is_sampled(request_id, 0.1)]
+
+    assert 1_700 < len(sampled) < 2_300
+    assert sampled == [request_id for request_id in ids if is_sampled(request_id, 0.1)]
+    assert all(is_sampled(request_id, 1.0) for request_id in ids[:10])
+    assert not any(is_sampled(request_id, 0.0) for request_id in ids[:10])
+
+
+def test_summary_and_none_levels():
+    bundle = _bundle()
+    assert apply_trace_policy(bundle, TracePolicy(level="summary"), "r1", 12.3456) == "summary"
+    assert bundle["execution"]["trace"] == [
+        {"stage": "start", "user_id": "u1", "request_id": "r1", "timestamp": 1.0},
+        {
+            "stage": "end",
+            "user_id": "u1",
+            "request_id": "r1",
+            "timestamp": 2.0,
+            "duration_ms": 12.346,
+            "level": "summary",
+        },
+    ]
+
+    bundle = _bundle()
+    policy = TracePolicy(sample_rate=0.0, unsampled_level="none")
+    assert apply_trace_policy(bundle, policy, "r1", 1.0) == "none"
+    assert bundle["execution"]["trace"] == []
+
+
+def test_tail_based_retention_keeps_slow_and_failed_executions():
+    policy = TracePolicy(sample_rate=0.0, keep_if_slower_than_ms=100.0)
+
+    assert apply_trace_policy(_bundle(), policy, "r1", 50.0) == "summary"
+    slow = _bundle()
+    assert apply_trace_policy(slow, policy, "r1", 150.0) == "full"
+    assert len(slow["execution"]["trace"]) == 3
+
+    assert apply_trace_policy(_bundle(error=True), policy, "r1", 1.0) == "full"
+    no_errors = TracePolicy(sample_rate=0.0, keep_errors=False)
+    assert apply_trace_policy(_bundle(error=True), no_errors, "r1", 1.0) == "summary"
+
+
+def test_invalid_policy_settings():
+    with pytest.raises(ValueError):
+        TracePolicy(level="none")
+    with pytest.raises(ValueError):
+        TracePolicy(sample_rate=1.5)
+
+
+def test_orchestrator_applies_configured_tracing(tmp_path: Path):
+    raw = json.loads(_config_path().read_text(encoding="utf-8"))
+    for op in raw["operations"]:
+        if op["key"] == "signals.smooth":
+            op["tracing"] = {"level": "summary", "keep_if_slower_than_ms": 60_000}
+        if op["key"] == "text.llm_stub":
+            op["tracing"] = {"sample_rate": 0.1, "keep_if_slower_than_ms": 200}
+    cfg_path = tmp_path / "operations.json"
+    cfg_path.write_text(json.dumps(raw), encoding="utf-8")
+
+    configs = load_config(cfg_path)
+    assert next(cfg for cfg in configs if cfg.key == "text.llm_stub").tracing.sample_rate == 0.1
+
+    registry, policies = build_registry_and_policies(configs)
+    orchestrator = Orchestrator(registry=registry)
+
+    # Routed execution: the route stage is dropped at summary level.
+    bundle = orchestrator.execute_operation(
+        key="signals.smooth",
+        user_id="u1",
+        request_id="r1",
+        policy=policies["signals.smooth"],
+        values=[1.0] * 10_001,
+    )
+    trace = bundle["execution"]["trace"]
+    assert [entry["stage"] for entry in trace] == ["start", "end"]
+    assert trace[-1]["level"] == "summary"
+    assert trace[-1]["duration_ms"] >= 0
+
+    # Operations without a tracing block keep the full trace.
+    bundle = orchestrator.execute_operation(
+        key="text.simplify",
+        user_id="u1",
+        request_id="r2",
+        policy=policies["text.simplify"],
+        text="A",
+    )
+    assert "level" not in bundle["execution"]["trace"][-1]
+
+    bad = dict(raw)
+    bad["operations"] = [dict(raw["operations"][0], tracing={"rate": 0.5})]
+    cfg_path.write_text(json.dumps(bad), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_config(cfg_path)
+
+
+def test_raising_task_keeps_its_full_trace(tmp_path: Path):
+    def task(values):
+        if not values:
+            raise ValueError("empty series")
+        return len(values)
+
+    psi = PsiDefinition(
+        operation_type=OperationType.TRANSFORM,
+        logical_binding="application.test.count",
+        effect_class=EffectClass.NON_STATE_CHANGING,
+    )
+    registry = OperationRegistry()
+    registry.register(
+        "test.count",
+        OperationMetadata(
+            psi=psi, task=task, tracing=TracePolicy(sample_rate=0.0, unsampled_level="none", keep_errors=True)
+        ),
+    )
+
+    with TraceStore(tmp_path / "traces.db") as store:
+        orchestrator = Orchestrator(registry=registry, trace_store=store)
+        policy = KLBridge.build_policy()
+
+        bundle = orchestrator.execute_operation(
+            key="test.count", user_id="u1", request_id="ok", policy=policy, values=[1.0]
+        )
+        assert bundle["execution"]["trace"] == []
+
+        with pytest.raises(ValueError, match="empty series"):
+            orchestrator.execute_operation(key="test.count", user_id="u1", request_id="bad", policy=policy, values=[])
+
+        (failed,) = store.query(request_id="bad")
+        assert failed["stages"] == ["start", "error", "end"]
+        assert failed["user_id"] == "u1"
+        assert store.query(request_id="ok")[0]["stages"] == []
+
+    registry.get("test.count").tracing = TracePolicy(sample_rate=0.0, unsampled_level="none", keep_errors=False)
+    with TraceStore(tmp_path / "traces.db") as store:
+        orchestrator = Orchestrator(registry=registry, trace_store=store)
+        with pytest.raises(ValueError):
+            orchestrator.execute_operation(key="test.count", user_id="u1", request_id="bad2", policy=policy, values=[])
+        assert store.query(request_id="bad2")[0]["stages"] == []
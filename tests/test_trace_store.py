@@ -0,0 +1,159 @@
+"""
+Tests for the SQLite trace store.
+
+Covers:
+- buffered ingestion and persistence across reopen
+- filtering by key, user, stage, time range and duration
+- ISO timestamps with a "Z" suffix or without an offset are UTC
+- several stores writing to one database
+- orchestrator integration and the traces query CLI
+"""
+
+import json
+from pathlib import Path
+
+from kl_exec_poc.cli import main
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.orchestrator import Orchestrator
+from kl_exec_poc.trace_store import TraceStore
+from kl_exec_poc.tracing import TracePolicy
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def _bundle(user_id: str, request_id: str, start: float, seconds: float, stages=("start", "end")):
+    trace = [
+        {"stage": stage, "user_id": user_id, "request_id": request_id, "timestamp": start}
+        for stage in stages
+    ]
+    trace[-1]["timestamp"] = start + seconds
+    return {"psi": {}, "execution": {"result": None, "trace": trace}}
+
+
+def test_buffered_ingestion_and_reopen(tmp_path: Path):
+    path = tmp_path / "traces.db"
+    store = TraceStore(path, batch_size=3)
+    for i in range(5):
+        store.record("text.simplify", _bundle("u1", f"r{i}", 1000.0 + i, 0.01))
+    # Three executions were written in one batch, two are still buffered.
+    assert store.count() == 5
+    store.close()
+
+    with TraceStore(path) as reopened:
+        assert reopened.count() == 5
+        reopened.record("text.simplify", _bundle("u1", "r5", 2000.0, 0.01))
+        rows = reopened.query(key="text.simplify", limit=2)
+        assert [row["request_id"] for row in rows] == ["r5", "r4"]
+
+
+def test_query_filters(tmp_path: Path):
+    with TraceStore(tmp_path / "traces.db") as store:
+        store.record("signals.smooth", _bundle("alice", "a1", 1000.0, 0.050))
+        store.record("signals.smooth", _bundle("alice", "a2", 1100.0, 0.250, ("start", "route", "end")))
+        store.record("signals.smooth", _bundle("bob", "b1", 1200.0, 0.300))
+        store.record("text.simplify", _bundle("alice", "a3", 1300.0, 0.400))
+        store.record("signals.smooth", _bundle("alice", "a4", 5000.0, 0.500), duration_ms=900.0)
+
+        slow = store.query(key="signals.smooth", user_id="alice", min_duration_ms=200, since=1050.0, until=4000.0)
+        assert [row["request_id"] for row in slow] == ["a2"]
+        assert abs(slow[0]["duration_ms"] - 250.0) < 1e-6
+        assert slow[0]["stages"] == ["start", "route", "end"]
+
+        assert [row["request_id"] for row in store.query(stage="route")] == ["a2"]
+        assert [row["request_id"] for row in store.query(user_id="alice")] == ["a4", "a3", "a2", "a1"]
+        assert store.query(request_id="a4")[0]["duration_ms"] == 900.0
+
+
+def test_iso_timestamps_are_read_as_utc(tmp_path: Path):
+    zulu = _bundle("u1", "z", 0.0, 0.0)
+    zulu["execution"]["trace"][0]["timestamp"] = "2024-01-01T00:00:00Z"
+    zulu["execution"]["trace"][1]["timestamp"] = "2024-01-01T00:00:00.250Z"
+    naive = _bundle("u1", "n", 0.0, 0.0)
+    naive["execution"]["trace"][0]["timestamp"] = "2024-01-01T00:00:01"
+    naive["execution"]["trace"][1]["timestamp"] = "2024-01-01T00:00:01.500"
+
+    with TraceStore(tmp_path / "traces.db") as store:
+        store.record("text.simplify", zulu)
+        store.record("text.simplify", naive)
+
+        (row,) = store.query(request_id="z")
+        assert abs(row["duration_ms"] - 250.0) < 1e-6
+        epoch = 1704067200.0  # 2024-01-01T00:00:00 UTC
+        assert [r["request_id"] for r in store.query(since=epoch, until=epoch + 0.5)] == ["z"]
+        assert [r["request_id"] for r in store.query(since=epoch + 0.5, until=epoch + 2)] == ["n"]
+
+
+def test_two_writers_share_a_database(tmp_path: Path):
+    path = tmp_path / "traces.db"
+    first = TraceStore(path, batch_size=2)
+    second = TraceStore(path, batch_size=2)
+    for i in range(4):
+        first.record("text.simplify", _bundle("u1", f"a{i}", 1000.0 + i, 0.01))
+        second.record("text.simplify", _bundle("u2", f"b{i}", 1000.5 + i, 0.01, ("start", "route", "end")))
+    first.close()
+    second.close()
+
+    with TraceStore(path) as store:
+        assert store.count() == 8
+        rows = store.query(limit=10)
+        assert len(rows) == 8
+        assert all(row["stages"] == ["start", "route", "end"] for row in rows if row["user_id"] == "u2")
+        assert all(row["stages"] == ["start", "end"] for row in rows if row["user_id"] == "u1")
+
+
+def test_dropped_traces_keep_their_ids(tmp_path: Path):
+    registry, policies = build_registry_and_policies(load_config(_config_path()))
+    registry.get("text.simplify").tracing = TracePolicy(sample_rate=0.0, unsampled_level="none")
+
+    with TraceStore(tmp_path / "traces.db") as store:
+        orchestrator = Orchestrator(registry=registry, trace_store=store)
+        bundle = orchestrator.execute_operation(
+            key="text.simplify", user_id="u9", request_id="dropped", policy=policies["text.simplify"], text="A"
+        )
+        assert bundle["execution"]["trace"] == []
+
+        (row,) = store.query(request_id="dropped")
+        assert (row["key"], row["user_id"], row["stages"]) == ("text.simplify", "u9", [])
+        assert row["duration_ms"] > 0
+
+
+def test_orchestrator_writes_traces_and_cli_queries(tmp_path: Path, capsys):
+    db_path = tmp_path / "traces.db"
+    registry, policies = build_registry_and_policies(load_config(_config_path()))
+
+    with TraceStore(db_path) as store:
+        orchestrator = Orchestrator(registry=registry, trace_store=store)
+        orchestrator.execute_operation(
+            key="signals.smooth",
+            user_id="u1",
+            request_id="big",
+            policy=policies["signals.smooth"],
+            values=[1.0] * 10_001,
+        )
+        orchestrator.execute_operation(
+            key="text.simplify",
+            user_id="u2",
+            request_id="txt",
+            policy=policies["text.simplify"],
+            text=" A ",
+        )
+
+    rc = main(
+        ["run", "--op", "text.simplify", "--input", "x", "--config", str(_config_path()), "--trace-db", str(db_path)]
+    )
+    assert rc == 0
+    capsys.readouterr()
+
+    rc = main(["traces", "query", "--db", str(db_path), "--stage", "route", "--last", "1h"])
+    assert rc == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["request_id"] for row in rows] == ["big"]
+    assert rows[0]["key"] == "signals.smooth"
+    assert rows[0]["duration_ms"] > 0
+
+    rc = main(["traces", "query", "--db", str(db_path), "--op", "text.simplify"])
+    assert rc == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(row["user_id"] for row in rows) == ["cli-user", "u2"]
@@ -0,0 +1,118 @@
+"""
+Tests for the warm worker process pool.
+
+Covers:
+- workers warm up every configured operation before serving
+- results and errors are passed back from the worker processes
+- recycling after N requests and above a memory threshold
+- float series passed through shared memory
+- requests before start and after close fail instead of blocking
+"""
+
+import os
+from array import array
+from pathlib import Path
+
+import pytest
+
+from kl_exec_poc.config import build_registry_and_policies, load_config
+from kl_exec_poc.constraints import ConstraintViolation
+from kl_exec_poc.ops.signals import smooth_series
+from kl_exec_poc.orchestrator import Orchestrator
+from kl_exec_poc.worker_pool import WorkerPool, warm_up_operations
+
+
+def _config_path() -> Path:
+    return Path(__file__).resolve().parents[1] / "config" / "operations.json"
+
+
+def test_warm_up_operations_runs_configured_inputs():
+    configs = load_config(_config_path())
+    registry, policies = build_registry_and_policies(configs)
+
+    timings = warm_up_operations(Orchestrator(registry=registry), policies, configs)
+    assert sorted(timings) == ["signals.smooth", "text.llm_stub", "text.simplify"]
+
+
+def test_pool_executes_and_recycles_workers():
+    with WorkerPool(_config_path(), workers=2, max_requests=3) as pool:
+        assert pool.started == 2
+        assert sorted(pool.warmup_ms) == ["signals.smooth", "text.llm_stub", "text.simplify"]
+
+        futures = [
+            pool.submit("text.simplify", "u1", f"r{i}", text=f"  Item {i}  ")
+            for i in range(10)
+        ]
+        results = [future.result()["execution"]["result"] for future in futures]
+        assert results == [f"item {i}" for i in range(10)]
+
+        smoothed = pool.execute("signals.smooth", "u1", "s1", values=memoryview(array("d", [1.0, 2.0, 3.0])))
+        assert list(smoothed["execution"]["result"]) == [1.5, 2.0, 2.5]
+
+        with pytest.raises(ConstraintViolation):
+            pool.execute("text.simplify", "u1", "bad")
+        with pytest.raises(KeyError):
+            pool.execute("text.unknown", "u1", "bad")
+
+    # 13 requests with at most 3 per worker.
+    assert pool.recycled >= 4
+    assert pool.started == 2 + pool.recycled
+
+
+def test_pool_recycles_above_memory_threshold():
+    with WorkerPool(_config_path(), workers=1, max_memory_mb=1.0) as pool:
+        for i in range(2):
+            assert pool.execute("text.simplify", "u1", f"r{i}", text="A")["execution"]["result"] == "a"
+    assert pool.recycled == 2
+
+
+def _shared_blocks() -> set:
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def test_pool_passes_float_series_through_shared_memory():
+    values = array("d", [float(i % 7) for i in range(5_000)])
+    expected = list(smooth_series(values))
+    before = _shared_blocks()
+
+    with WorkerPool(_config_path(), workers=1, share_min_bytes=1_024) as pool:
+        for payload in (values, memoryview(values)):
+            result = pool.execute("signals.smooth", "u1", "shared", values=payload)["execution"]["result"]
+            assert isinstance(result, array)
+            assert list(result) == expected
+
+        # Small series are pickled as before.
+        small = pool.execute("signals.smooth", "u1", "small", values=array("d", [1.0, 2.0, 3.0]))
+        assert list(small["execution"]["result"]) == [1.5, 2.0, 2.5]
+
+        routed = pool.execute("signals.smooth", "u1", "large", values=array("d", [1.0]) * 20_000)
+        assert len(routed["execution"]["result"]) == 20_000
+        assert "route" in [entry["stage"] for entry in routed["execution"]["trace"]]
+
+    # Every block was unlinked once its reply arrived.
+    assert _shared_blocks() <= before
+
+
+def test_pool_passes_numpy_series_through_shared_memory():
+    np = pytest.importorskip("numpy")
+    values = np.arange(5_000, dtype=np.float64) % 7
+
+    with WorkerPool(_config_path(), workers=1, share_min_bytes=1_024) as pool:
+        result = pool.execute("signals.smooth", "u1", "np", values=values)["execution"]["result"]
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == smooth_series(values).tolist()
+
+
+def test_pool_rejects_requests_before_start_and_after_close():
+    pool = WorkerPool(_config_path(), workers=1)
+    with pytest.raises(RuntimeError, match="not started"):
+        pool.execute("text.simplify", "u1", "r1", text="A")
+    with pytest.raises(RuntimeError, match="not started"):
+        pool.submit("text.simplify", "u1", "r1", text="A")
+
+    with pool:
+        assert pool.execute("text.simplify", "u1", "r2", text="A")["execution"]["result"] == "a"
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.execute("text.simplify", "u1", "r3", text="A")
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.submit("text.simplify", "u1", "r3", text="A")